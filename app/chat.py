@@ -1,4 +1,5 @@
 import uuid
+import json
 import time
 
 from collections.abc import Generator
@@ -7,7 +8,7 @@ import requests
 import streamlit as st
 
 from app.config import settings
-from app.utils import create_safe_markdown
+from app.utils import create_safe_markdown, sanitize_markdown
 
 class SanaChat:
     def __init__(self) -> None:
@@ -21,12 +22,16 @@ class SanaChat:
             st.session_state['pending_assistant'] = True
 
         with st.chat_message('assistant'):
+            # Tool status renders on its own, so tool updates never re-render the response text
+            tools_placeholder = st.empty()
             placeholder = st.empty()
 
             placeholder.markdown("*...*")
 
             chunk_count: int = 0
             response: str = ''
+            tools: dict[str, dict] = {}
+            timings: dict = {}
 
             payload: dict = {
                 'prompt': message,
@@ -38,25 +43,48 @@ class SanaChat:
                 }
             }
 
-            for chunk in self.invoke_endpoint(
+            for event in self.invoke_endpoint(
                 payload=payload,
                 session_id=st.session_state['session_id'],
                 bearer_token=tokens.get('access_token')
             ):
-                chunk = str(chunk)
-                if not chunk:
-                    continue
-
-                chunk_count += 1
-                response += chunk
-                if chunk_count % 3 == 0:
-                    response += ''
-
-                create_safe_markdown(response, placeholder)
-                time.sleep(0.06)  # Small delay to make streaming more natural
+                match event.get('t'):
+                    case 'text':
+                        if not (chunk := event.get('d', '')):
+                            continue
+
+                        chunk_count += 1
+                        response += chunk
+                        if chunk_count % 3 == 0:
+                            response += ''
+
+                        create_safe_markdown(response, placeholder)
+                        time.sleep(0.06)  # Small delay to make streaming more natural
+                    case 'tool_start':
+                        tools[event['id']] = {'message': event['m']}
+                        self._render_tools(tools, tools_placeholder)
+                    case 'tool_end':
+                        tools.setdefault(event['id'], {'message': event['n']}).update(status=event['s'], ms=event['ms'])
+                        self._render_tools(tools, tools_placeholder)
+                    case 'error':
+                        response += f'\n\nerror: {event["m"]}'
+                        create_safe_markdown(response, placeholder)
+                    case 'usage':
+                        timings['usage'] = {key: event[key] for key in ('i', 'o', 'cr', 'cw')}
+                    case 'done':
+                        timings.update(server_ms=event['ms'], ttft_ms=event.get('ttft'))
 
             st.session_state['pending_assistant'] = False
-            st.session_state['messages'].append({'role': 'assistant', 'content': response})
+            st.session_state['messages'].append({
+                'role': 'assistant',
+                'content': response,
+                'safe_content': sanitize_markdown(response),
+                'tools': list(tools.values()),
+                'timings': timings
+            })
+
+            if settings.ENVIRONMENT == 'local' and timings:
+                st.caption(self._format_timings(timings))
 
     def display_conversation(self) -> None:
         messages = st.session_state.messages[:]
@@ -68,12 +96,65 @@ class SanaChat:
         ):
             messages = messages[:-1]
 
-        for message in messages:
-            with st.chat_message(message['role']):
-                if message['role'] == 'assistant':
-                    create_safe_markdown(message["content"], st)
-                else:
-                    st.markdown(message["content"])
+        # Only the last turns are rendered in full, older ones stay collapsed
+        window_start: int = self._window_start(messages)
+
+        if (earlier_messages := messages[:window_start]):
+            with st.expander(f'Earlier messages ({len(earlier_messages)})'):
+                if st.toggle('Show earlier messages', key='show_earlier_messages'):
+                    for message in earlier_messages:
+                        self._display_message(message)
+
+        for message in messages[window_start:]:
+            self._display_message(message)
+
+    def _display_message(self, message: dict) -> None:
+        with st.chat_message(message['role']):
+            if message['role'] == 'assistant':
+                # Memoize the sanitized content on the message itself
+                if 'safe_content' not in message:
+                    message['safe_content'] = sanitize_markdown(message['content'])
+
+                if message.get('tools'):
+                    self._render_tools(message['tools'], st)
+                st.markdown(message['safe_content'])
+            else:
+                st.markdown(message['content'])
+
+    def _render_tools(self, tools: dict[str, dict] | list[dict], placeholder) -> None:
+        lines: list[str] = []
+        for tool in (tools.values() if isinstance(tools, dict) else tools):
+            match tool.get('status'):
+                case None:
+                    lines.append(f'> {tool["message"]}')
+                case 'success':
+                    lines.append(f'> {tool["message"]} done in {tool["ms"] / 1000:.1f}s')
+                case status:
+                    lines.append(f'> {tool["message"]} {status} after {tool["ms"] / 1000:.1f}s')
+
+        placeholder.markdown('\n\n'.join(lines))
+
+    def _format_timings(self, timings: dict) -> str:
+        parts: list[str] = []
+        if timings.get('ttft_ms') is not None:
+            parts.append(f'first token {timings["ttft_ms"] / 1000:.2f}s')
+        if timings.get('server_ms') is not None:
+            parts.append(f'server {timings["server_ms"] / 1000:.2f}s')
+        if usage := timings.get('usage'):
+            parts.append(f'{usage["i"]} input / {usage["o"]} output tokens ({usage["cr"]} cached)')
+        return ' · '.join(parts)
+
+    def _window_start(self, messages: list[dict]) -> int:
+        user_turns: int = 0
+        for index in range(len(messages) - 1, -1, -1):
+            if messages[index]['role'] != 'user':
+                continue
+
+            user_turns += 1
+            if user_turns >= settings.CHAT_WINDOW_TURNS:
+                return index
+
+        return 0
 
     def invoke_endpoint(
         self,
@@ -81,7 +162,7 @@ class SanaChat:
         session_id: str,
         bearer_token: str,
         endpoint_version: str = 'DEFAULT'
-    ) -> Generator[str, None, None]:
+    ) -> Generator[dict, None, None]:
         params: dict = {'qualifier': endpoint_version}
 
         headers: dict = {
@@ -101,21 +182,29 @@ class SanaChat:
             )
 
             for line in response.iter_lines(chunk_size=1):
-                if not line:
-                    continue
-
-                line = line.decode('utf-8')
-                if line.startswith('data: '):
-                    line = line[len('data: '):]
-                    line = line.replace('"', '')
-                    yield line
-                elif line:
-                    line = line.replace('"', '')
-                    yield line
+                if line and (event := self._decode_event(line.decode('utf-8'))):
+                    yield event
 
         except requests.exceptions.RequestException as e:
             raise e
 
+    def _decode_event(self, line: str) -> dict | None:
+        # Each server-sent event carries one compact JSON event, see sana.core.events in the runtime
+        try:
+            event = json.loads(line.removeprefix('data: '))
+        except json.JSONDecodeError:
+            return None
+
+        # Plain strings come from runtimes that predate the event protocol
+        if isinstance(event, str):
+            return {'t': 'text', 'd': event}
+
+        # Errors raised by the runtime itself, outside the agent stream
+        if isinstance(event, dict) and 't' not in event and 'error' in event:
+            return {'t': 'error', 'm': event['error']}
+
+        return event if isinstance(event, dict) else None
+
     def _init_session_state(self) -> None:
         if 'session_id' not in st.session_state:
             st.session_state['session_id'] = str(uuid.uuid4())
@@ -16,6 +16,9 @@ class Settings(BaseSettings):
 
         ## AWS Bedrock AgentCore
     AWS_AGENTCORE_RUNTIME_URL: str = 'http://localhost:8080/invocations'
+
+    # Chat
+    CHAT_WINDOW_TURNS: int = 10
     
     # Load .env file
     model_config = SettingsConfigDict(
@@ -0,0 +1,116 @@
+"""
+Token benchmark for conversation history compaction.
+
+Replays recorded long sessions turn by turn and estimates the input tokens replayed on each
+turn, once with the full history and once with the history compacted after every turn as the
+agent does. Reports per-turn and total input tokens, the token reduction, the compaction
+ratios and the time spent compacting. Runs fully offline.
+
+Usage:
+    uv run --package sana-agent python -m benchmarks.compaction --token-budget 6000 --output results.json
+"""
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from time import perf_counter
+import copy
+import json
+import os
+
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+
+from sana.agent.conversation import CompactingConversationManager, estimate_tokens, is_turn_start
+from sana.core.config import settings
+
+from benchmarks.stats import percentiles
+
+SESSIONS_PATH: Path = Path(__file__).parent / 'data' / 'conversation_sessions.json'
+
+class History:
+    """Stand-in for the agent, the conversation manager only touches its messages."""
+
+    def __init__(self) -> None:
+        self.messages: list = []
+
+def split_turns(messages: list) -> list[list]:
+    turns: list[list] = []
+    for message in messages:
+        if is_turn_start(message) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+def replay(session: dict, args: Namespace) -> dict:
+    manager = CompactingConversationManager(
+        token_budget=args.token_budget,
+        recent_turns=args.recent_turns,
+        excerpt_chars=args.excerpt_chars
+    )
+
+    full: list = []
+    compacted = History()
+    full_tokens: list[int] = []
+    compacted_tokens: list[int] = []
+    ratios: list[float] = []
+    durations: list[float] = []
+
+    for turn in split_turns(session['messages']):
+        # Every model call of the turn replays the history up to that call
+        for index, message in enumerate(turn):
+            if message['role'] == 'user':
+                full_tokens.append(estimate_tokens(full + turn[:index + 1]))
+                compacted_tokens.append(estimate_tokens(compacted.messages + turn[:index + 1]))
+
+        full.extend(turn)
+        compacted.messages.extend(copy.deepcopy(turn))
+
+        before: int = estimate_tokens(compacted.messages)
+        start: float = perf_counter()
+        manager.apply_management(compacted)
+        durations.append(perf_counter() - start)
+
+        if (after := estimate_tokens(compacted.messages)) != before:
+            ratios.append(after / before)
+
+    return {
+        'turns': len(split_turns(session['messages'])),
+        'model_calls': len(full_tokens),
+        'input_tokens': {
+            'full': sum(full_tokens),
+            'compacted': sum(compacted_tokens),
+            'reduction': 1 - sum(compacted_tokens) / sum(full_tokens)
+        },
+        'last_call_tokens': {'full': full_tokens[-1], 'compacted': compacted_tokens[-1]},
+        'per_call_tokens': {'full': full_tokens, 'compacted': compacted_tokens},
+        'compactions': len(ratios),
+        'compaction_ratios': ratios,
+        'removed_messages': manager.removed_message_count,
+        'compaction_duration': percentiles(durations)
+    }
+
+def main(args: Namespace) -> dict:
+    sessions: list[dict] = json.loads(args.sessions.read_text())
+
+    return {
+        'token_budget': args.token_budget,
+        'recent_turns': args.recent_turns,
+        'excerpt_chars': args.excerpt_chars,
+        'sessions': {session['name']: replay(session, args) for session in sessions}
+    }
+
+def parse_args() -> Namespace:
+    parser = ArgumentParser(description='Measure the input tokens saved by conversation history compaction')
+    parser.add_argument('--sessions', type=Path, default=SESSIONS_PATH, help='JSON file of recorded sessions to replay')
+    parser.add_argument('--token-budget', type=int, default=settings.CONVERSATION_TOKEN_BUDGET, help='Estimated token budget of the history')
+    parser.add_argument('--recent-turns', type=int, default=settings.CONVERSATION_RECENT_TURNS, help='Number of recent turns kept verbatim')
+    parser.add_argument('--excerpt-chars', type=int, default=settings.CONVERSATION_EXCERPT_CHARS, help='Length of the excerpt kept from compacted messages')
+    parser.add_argument('--output', type=Path, default=None, help='Write the JSON results to this file')
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+    report: dict = main(args)
+
+    output: str = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    print(output)
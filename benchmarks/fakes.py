@@ -0,0 +1,124 @@
+from typing import Any
+from collections.abc import AsyncGenerator
+import asyncio
+import time
+
+from strands import Agent
+from strands.models import Model
+from strands.session import SessionManager
+from strands.tools import tool
+from strands.types.content import Message, Messages
+
+class FakeStreamingModel(Model):
+    """Stand-in for BedrockModel that streams tokens at a fixed rate."""
+
+    def __init__(
+        self,
+        time_to_first_token: float = 0.5,
+        tokens_per_second: float = 50.0,
+        response_tokens: int = 100,
+        tool_names: list[str] | None = None,
+        **config: Any
+    ) -> None:
+        self.time_to_first_token = time_to_first_token
+        self.tokens_per_second = tokens_per_second
+        self.response_tokens = response_tokens
+        self.tool_names = tool_names or []
+        self.config: dict = config
+        self._tool_calls: int = 0
+
+    def update_config(self, **model_config: Any) -> None:
+        self.config.update(model_config)
+
+    def get_config(self) -> Any:
+        return self.config
+
+    async def structured_output(self, output_model: Any, prompt: Messages, system_prompt: str | None = None, **kwargs: Any) -> AsyncGenerator[dict, None]:
+        raise NotImplementedError('FakeStreamingModel does not support structured output')
+        yield {}
+
+    async def stream(
+        self,
+        messages: Messages,
+        tool_specs: list | None = None,
+        system_prompt: str | None = None,
+        **kwargs: Any
+    ) -> AsyncGenerator[dict, None]:
+        await asyncio.sleep(self.time_to_first_token)
+        yield {'messageStart': {'role': 'assistant'}}
+
+        # Request one tool call per user message, then answer with text
+        last_content: list = messages[-1]['content'] if messages else []
+        if self.tool_names and not any('toolResult' in content for content in last_content):
+            tool_name: str = self.tool_names[self._tool_calls % len(self.tool_names)]
+            self._tool_calls += 1
+
+            yield {'contentBlockStart': {'start': {'toolUse': {'toolUseId': f'tool-{self._tool_calls}', 'name': tool_name}}}}
+            yield {'contentBlockDelta': {'delta': {'toolUse': {'input': '{"query": "benchmark"}'}}}}
+            yield {'contentBlockStop': {}}
+            yield {'messageStop': {'stopReason': 'tool_use'}}
+            yield self._metadata(messages, output_tokens=10)
+            return
+
+        for index in range(self.response_tokens):
+            if index:
+                await asyncio.sleep(1 / self.tokens_per_second)
+            yield {'contentBlockDelta': {'delta': {'text': f'token{index} '}}}
+
+        yield {'contentBlockStop': {}}
+        yield {'messageStop': {'stopReason': 'end_turn'}}
+        yield self._metadata(messages, output_tokens=self.response_tokens)
+
+    def _metadata(self, messages: Messages, output_tokens: int) -> dict:
+        input_tokens: int = sum(len(str(message)) // 4 for message in messages)
+        return {
+            'metadata': {
+                'usage': {'inputTokens': input_tokens, 'outputTokens': output_tokens, 'totalTokens': input_tokens + output_tokens},
+                'metrics': {'latencyMs': 0}
+            }
+        }
+
+class FakeMemorySessionManager(SessionManager):
+    """Stand-in for AgentCoreMemorySessionManager, persisting messages synchronously with a fixed latency."""
+
+    def __init__(self, latency: float = 0.05) -> None:
+        self.latency = latency
+        self.messages: list[Message] = []
+
+    def initialize(self, agent: Agent, **kwargs: Any) -> None:
+        time.sleep(self.latency)
+
+    def append_message(self, message: Message, agent: Agent, **kwargs: Any) -> None:
+        time.sleep(self.latency)
+        self.messages.append(message)
+
+    def redact_latest_message(self, redact_message: Message, agent: Agent, **kwargs: Any) -> None:
+        self.messages[-1] = redact_message
+
+    def sync_agent(self, agent: Agent, **kwargs: Any) -> None:
+        pass
+
+def create_fake_tools(mcp_latency: float = 0.3, browser_latency: float = 2.0) -> list:
+    @tool(name='resource-function___search-resources')
+    async def search_resources(query: str) -> dict:
+        """
+        Stand-in for the AgentCore Gateway resource search MCP tool.
+
+        Args:
+            query (str): Search query.
+        """
+        await asyncio.sleep(mcp_latency)
+        return {'resources': [{'url': 'https://example.com/resource'}]}
+
+    @tool
+    def search_therapists(query: str) -> list:
+        """
+        Stand-in for the Nova Act browser therapist search, blocking like the real browser session.
+
+        Args:
+            query (str): Search query.
+        """
+        time.sleep(browser_latency)
+        return [{'name': 'Dr. Jane Doe', 'url': 'https://example.com/jane-doe'}]
+
+    return [search_resources, search_therapists]
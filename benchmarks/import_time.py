@@ -0,0 +1,114 @@
+"""
+Import-time budget for the Sana agent container.
+
+Runs `python -X importtime -c 'import sana.main'` in a fresh interpreter, with every optional
+integration disabled, and fails when the cumulative import time of sana.main exceeds the budget
+or when a module that should only be loaded lazily is imported.
+
+Usage:
+    uv run --package sana-agent python -m benchmarks.import_time --budget-ms 400
+"""
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+import json
+import os
+import subprocess
+import sys
+
+# Loaded on demand by the request path or the startup warm-up
+LAZY_MODULES: list[str] = [
+    'strands',
+    'nova_act',
+    'googleapiclient',
+    'playwright',
+    'mcp',
+    'bedrock_agentcore.identity'
+]
+
+# Settings that enable optional integrations, cleared for the measurement
+OPTIONAL_SETTINGS: list[str] = [
+    'AWS_NOVA_ACT_API_KEY',
+    'GOOGLE_OAUTH_PROVIDER_NAME',
+    'AWS_BEDROCK_AGENTCORE_MEMORY_ID',
+    'AWS_BEDROCK_AGENTCORE_GATEWAY_URL',
+    'OTEL_ENABLED'
+]
+
+def measure(module: str) -> list[dict]:
+    env: dict = {**os.environ, 'AWS_REGION': os.environ.get('AWS_REGION', 'us-east-1')}
+    for setting in OPTIONAL_SETTINGS:
+        env[setting] = ''
+    env['OTEL_ENABLED'] = 'false'
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        env=env,
+        capture_output=True,
+        text=True
+    )
+
+    if result.returncode != 0:
+        raise RuntimeError(f'failed to import {module}:\n{result.stderr}')
+
+    imports: list[dict] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        imports.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000
+        })
+
+    return imports
+
+def main(args: Namespace) -> dict:
+    imports: list[dict] = measure(args.module)
+
+    if not (root := next((i for i in imports if i['module'] == args.module), None)):
+        raise RuntimeError(f'{args.module} not found in the import time report')
+
+    loaded: set[str] = {i['module'] for i in imports}
+    lazy_violations: list[str] = sorted(
+        module for module in LAZY_MODULES
+        if module in loaded
+    )
+
+    return {
+        'module': args.module,
+        'budget_ms': args.budget_ms,
+        'total_ms': root['cumulative_ms'],
+        'within_budget': root['cumulative_ms'] <= args.budget_ms,
+        'lazy_violations': lazy_violations,
+        'slowest': sorted(
+            (i for i in imports if i['depth'] <= args.depth),
+            key=lambda i: i['cumulative_ms'],
+            reverse=True
+        )[:args.top]
+    }
+
+def parse_args() -> Namespace:
+    parser = ArgumentParser(description='Check the import time of the agent entrypoint against a budget')
+    parser.add_argument('--module', default='sana.main', help='Module to import')
+    parser.add_argument('--budget-ms', type=float, default=400.0, help='Maximum cumulative import time in milliseconds')
+    parser.add_argument('--top', type=int, default=15, help='Number of slowest imports to report')
+    parser.add_argument('--depth', type=int, default=2, help='Maximum nesting depth of the reported imports')
+    parser.add_argument('--output', type=Path, default=None, help='Write the JSON results to this file')
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+    report: dict = main(args)
+
+    output: str = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    print(output)
+
+    if not report['within_budget']:
+        sys.exit(f'{args.module} took {report["total_ms"]:.1f}ms to import, over the {args.budget_ms:.1f}ms budget')
+    if report['lazy_violations']:
+        sys.exit(f'{args.module} eagerly imports {", ".join(report["lazy_violations"])}')
@@ -0,0 +1,181 @@
+"""
+Load test for the Sana AgentCore entrypoint.
+
+Boots sana.main locally with Bedrock, the AgentCore Gateway (MCP), AgentCore Memory and
+the Nova Act browser replaced by fakes with configurable latencies, then drives concurrent
+sessions over HTTP and reports latency, throughput, memory and event-loop lag as JSON.
+
+The server and the load generator share one event loop, so the reported event-loop lag
+is the lag that every in-flight session experiences.
+
+Usage:
+    uv run --package sana-agent python -m benchmarks.load_test --sessions 20 --turns 3 --output results.json
+"""
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from time import perf_counter
+import asyncio
+import json
+import os
+import resource
+import uuid
+
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+
+import httpx
+import uvicorn
+
+from benchmarks.fakes import FakeMemorySessionManager, FakeStreamingModel, create_fake_tools
+from benchmarks.stats import percentiles
+
+SESSION_HEADER: str = 'X-Amzn-Bedrock-AgentCore-Runtime-Session-Id'
+
+def current_rss_mb() -> float | None:
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except OSError:
+        return None
+
+def install_fakes(args: Namespace) -> None:
+    import sana.agent.agent as agent_module
+    import sana.main as main_module
+
+    tools: list = create_fake_tools(mcp_latency=args.mcp_latency, browser_latency=args.browser_latency)
+
+    def load_tools(self) -> None:
+        self.tools.extend(tools)
+
+    def load_memory(self) -> None:
+        self.session_manager = FakeMemorySessionManager(latency=args.memory_latency)
+
+    def create_model(**config) -> FakeStreamingModel:
+        return FakeStreamingModel(
+            time_to_first_token=args.model_ttft,
+            tokens_per_second=args.tokens_per_second,
+            response_tokens=args.response_tokens,
+            tool_names=[t.tool_name for t in tools] if args.tool_calls else [],
+            **config
+        )
+
+    agent_module.Sana._load_tools = load_tools
+    agent_module.Sana._load_memory = load_memory
+    agent_module.SanaBedrockModel = create_model
+    main_module.get_gateway_token = lambda: 'benchmark-token'
+
+async def run_session(client: httpx.AsyncClient, url: str, turns: int, results: dict) -> None:
+    session_id: str = str(uuid.uuid4())
+    payload: dict = {
+        'prompt': 'I have been feeling anxious lately.',
+        'actor': {'id': session_id, 'country': 'US', 'zip_code': '90011', 'timezone': 'America/Los_Angeles'}
+    }
+
+    for _ in range(turns):
+        start: float = perf_counter()
+        first_token_at: float | None = None
+        tokens: int = 0
+
+        try:
+            async with client.stream('POST', url, json=payload, headers={SESSION_HEADER: session_id}) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith('data: '):
+                        continue
+
+                    event: dict = json.loads(line[len('data: '):])
+                    # Tool status and timing events are not model tokens
+                    if event.get('t') != 'text':
+                        continue
+
+                    if first_token_at is None:
+                        first_token_at = perf_counter()
+                    tokens += 1
+        except httpx.HTTPError as e:
+            results['errors'].append(str(e))
+            continue
+
+        if first_token_at is not None:
+            results['ttft'].append(first_token_at - start)
+        results['turn_duration'].append(perf_counter() - start)
+        results['tokens'] += tokens
+
+async def sample_loop_lag(interval: float, samples: list[float], stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start: float = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - start - interval))
+
+async def main(args: Namespace) -> dict:
+    install_fakes(args)
+
+    from sana.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=args.port, log_level='warning'))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    results: dict = {'ttft': [], 'turn_duration': [], 'tokens': 0, 'errors': []}
+    lag_samples: list[float] = []
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(sample_loop_lag(args.lag_interval, lag_samples, stop))
+
+    url: str = f'http://127.0.0.1:{args.port}/invocations'
+    limits = httpx.Limits(max_connections=args.sessions, max_keepalive_connections=args.sessions)
+
+    start: float = perf_counter()
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        await asyncio.gather(*(
+            run_session(client, url, args.turns, results)
+            for _ in range(args.sessions)
+        ))
+    wall_time: float = perf_counter() - start
+
+    stop.set()
+    await lag_task
+    server.should_exit = True
+    await server_task
+
+    return {
+        'config': {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+        'sessions': args.sessions,
+        'turns': args.sessions * args.turns,
+        'errors': len(results['errors']),
+        'wall_time': wall_time,
+        'tokens': results['tokens'],
+        'throughput_tokens_per_second': results['tokens'] / wall_time if wall_time else None,
+        'ttft': percentiles(results['ttft']),
+        'turn_duration': percentiles(results['turn_duration']),
+        'rss_mb': {
+            'peak': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            'final': current_rss_mb()
+        },
+        'event_loop_lag': percentiles(lag_samples)
+    }
+
+def parse_args() -> Namespace:
+    parser = ArgumentParser(description='Load test the Sana entrypoint with stubbed AWS services')
+    parser.add_argument('--sessions', type=int, default=10, help='Number of concurrent sessions')
+    parser.add_argument('--turns', type=int, default=3, help='Number of turns per session')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--timeout', type=float, default=300.0, help='HTTP timeout in seconds')
+    parser.add_argument('--model-ttft', type=float, default=0.5, help='Fake model time to first token in seconds')
+    parser.add_argument('--tokens-per-second', type=float, default=50.0, help='Fake model token rate')
+    parser.add_argument('--response-tokens', type=int, default=100, help='Tokens per fake model response')
+    parser.add_argument('--tool-calls', action='store_true', help='Make the fake model call one fake tool per turn')
+    parser.add_argument('--mcp-latency', type=float, default=0.3, help='Fake MCP tool latency in seconds')
+    parser.add_argument('--browser-latency', type=float, default=2.0, help='Fake browser tool latency in seconds')
+    parser.add_argument('--memory-latency', type=float, default=0.05, help='Fake memory write latency in seconds')
+    parser.add_argument('--lag-interval', type=float, default=0.05, help='Event-loop lag sampling interval in seconds')
+    parser.add_argument('--output', type=Path, default=None, help='Write the JSON results to this file')
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+    report: dict = asyncio.run(main(args))
+
+    output: str = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    print(output)
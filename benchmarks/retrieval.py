@@ -0,0 +1,118 @@
+"""
+Relevance and latency benchmark for the resource search Lambda.
+
+Runs a fixed query set with known relevant documents against each retrieval mode and reports
+hit rate, recall and MRR at k together with latency percentiles. The lexical mode runs fully
+offline; the vector and hybrid modes call the Bedrock knowledge base given with
+--knowledge-base-id and are skipped without one.
+
+When the S3 vector index is also given, queries are embedded by the benchmark itself through the
+query embedding cache, and the cache hit rate and embedding time saved across --repeat passes
+over the query set are reported.
+
+Usage:
+    uv run --package sana-infra python -m benchmarks.retrieval --knowledge-base-id <id> --output results.json
+"""
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from time import perf_counter
+import importlib
+import json
+import os
+import sys
+
+from benchmarks.stats import percentiles
+
+QUERIES_PATH: Path = Path(__file__).parent / 'data' / 'retrieval_queries.json'
+KNOWLEDGE_BASE_PATH: Path = Path(__file__).parent.parent / 'infra' / 'resources' / 'knowledge-base'
+RESOURCES_TARGET_PATH: Path = Path(__file__).parent.parent / 'infra' / 'resources' / 'gateway' / 'resources-target'
+
+def load_urls() -> dict[str, str]:
+    urls: dict[str, str] = {}
+    for metadata_path in KNOWLEDGE_BASE_PATH.glob('**/*.metadata.json'):
+        metadata: dict = json.loads(metadata_path.read_text())
+        document: str = metadata_path.relative_to(KNOWLEDGE_BASE_PATH).as_posix().removesuffix('.metadata.json')
+        urls[document] = metadata['metadataAttributes']['x-amz-bedrock-kb-source-uri']['value']['stringValue']
+    return urls
+
+def load_lambda_module(args: Namespace):
+    # The Lambda module reads its configuration at import time
+    os.environ['AWS_BEDROCK_KNOWLEDGE_BASE_ID'] = args.knowledge_base_id or 'offline'
+    os.environ.setdefault('AWS_DEFAULT_REGION', os.environ.get('AWS_REGION', 'us-east-1'))
+
+    if args.knowledge_base_id and args.vector_bucket_name and args.vector_index_name:
+        os.environ['AWS_S3_VECTOR_BUCKET_NAME'] = args.vector_bucket_name
+        os.environ['AWS_S3_VECTOR_INDEX_NAME'] = args.vector_index_name
+
+    sys.path.insert(0, str(RESOURCES_TARGET_PATH))
+    return importlib.import_module('index')
+
+def evaluate(search_resources, mode: str, queries: list[dict], urls: dict[str, str], k: int, repeat: int) -> dict:
+    hits: list[float] = []
+    recalls: list[float] = []
+    reciprocal_ranks: list[float] = []
+    latencies: list[float] = []
+    misses: list[str] = []
+
+    for query in queries * repeat:
+        relevant: set[str] = {urls[document] for document in query['relevant']}
+
+        start: float = perf_counter()
+        results: list[dict] = search_resources(query['query'], limit=k, mode=mode)['resources']
+        latencies.append(perf_counter() - start)
+
+        retrieved: list[str] = [r['url'] for r in results]
+        rank: int | None = next((i for i, url in enumerate(retrieved, start=1) if url in relevant), None)
+
+        hits.append(1.0 if rank else 0.0)
+        recalls.append(len(relevant.intersection(retrieved)) / min(len(relevant), k))
+        reciprocal_ranks.append(1 / rank if rank else 0.0)
+        if not rank:
+            misses.append(query['query'])
+
+    return {
+        f'hit_rate@{k}': sum(hits) / len(hits),
+        f'recall@{k}': sum(recalls) / len(recalls),
+        f'mrr@{k}': sum(reciprocal_ranks) / len(reciprocal_ranks),
+        'latency': percentiles(latencies),
+        'misses': sorted(set(misses))
+    }
+
+def main(args: Namespace) -> dict:
+    queries: list[dict] = json.loads(QUERIES_PATH.read_text())
+    urls: dict[str, str] = load_urls()
+
+    load_start: float = perf_counter()
+    module = load_lambda_module(args)
+    load_duration: float = perf_counter() - load_start
+
+    modes: list[str] = ['lexical', 'vector', 'hybrid'] if args.knowledge_base_id else ['lexical']
+
+    return {
+        'queries': len(queries),
+        'repeat': args.repeat,
+        'k': args.k,
+        'load_duration': load_duration,
+        'modes': {mode: evaluate(module.search_resources, mode, queries, urls, args.k, args.repeat) for mode in modes},
+        'skipped': [] if args.knowledge_base_id else ['vector', 'hybrid'],
+        'embedding_cache': module.embedding_cache.stats() if module.s3_vectors else None
+    }
+
+def parse_args() -> Namespace:
+    parser = ArgumentParser(description='Compare the relevance and latency of the resource retrieval modes')
+    parser.add_argument('--knowledge-base-id', default=None, help='Bedrock knowledge base for the vector and hybrid modes')
+    parser.add_argument('--vector-bucket-name', default=None, help='S3 vector bucket of the knowledge base, to query it with cached embeddings')
+    parser.add_argument('--vector-index-name', default=None, help='S3 vector index of the knowledge base')
+    parser.add_argument('--k', type=int, default=3, help='Number of resources retrieved per query')
+    parser.add_argument('--repeat', type=int, default=1, help='Number of passes over the query set')
+    parser.add_argument('--output', type=Path, default=None, help='Write the JSON results to this file')
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+    report: dict = main(args)
+
+    output: str = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    print(output)
@@ -0,0 +1,9 @@
+def percentiles(values: list[float]) -> dict:
+    if not values:
+        return {'p50': None, 'p95': None, 'p99': None, 'max': None}
+
+    ordered: list[float] = sorted(values)
+    def rank(p: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))]
+
+    return {'p50': rank(50), 'p95': rank(95), 'p99': rank(99), 'max': ordered[-1]}
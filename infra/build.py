@@ -0,0 +1,62 @@
+"""
+Reproducible Lambda package builds.
+
+Only the Python sources and compressed data files of a function are packaged; boto3 and
+botocore are provided by the Lambda Python runtime. Entries are sorted and carry a fixed
+timestamp and permissions, so the same sources always produce the same archive and the same
+CodeSha256.
+
+Usage:
+    uv run python infra/build.py
+"""
+from pathlib import Path
+import hashlib
+import base64
+import io
+import zipfile
+
+BUILD_DIR: Path = Path(__file__).parent / 'build'
+LAMBDA_SOURCES: dict[str, Path] = {
+    'resources-target': Path(__file__).parent / 'resources' / 'gateway' / 'resources-target'
+}
+
+PACKAGE_PATTERNS: tuple[str, ...] = ('*.py', '*.json.gz')
+
+# 1980-01-01, the earliest timestamp a zip entry can hold
+ZIP_TIMESTAMP: tuple = (1980, 1, 1, 0, 0, 0)
+ZIP_PERMISSIONS: int = 0o644 << 16
+
+def build_lambda_package(source_dir: Path) -> bytes:
+    sources: list[Path] = sorted(
+        path for pattern in PACKAGE_PATTERNS for path in source_dir.rglob(pattern)
+        if '__pycache__' not in path.parts
+    )
+
+    if not any(path.suffix == '.py' for path in sources):
+        raise FileNotFoundError(f'No Python sources found in {source_dir}')
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=9) as package:
+        for path in sources:
+            info = zipfile.ZipInfo(path.relative_to(source_dir).as_posix(), date_time=ZIP_TIMESTAMP)
+            info.external_attr = ZIP_PERMISSIONS
+            info.compress_type = zipfile.ZIP_DEFLATED
+            package.writestr(info, path.read_bytes())
+
+    return buffer.getvalue()
+
+def code_sha256(package: bytes) -> str:
+    # Same encoding as the CodeSha256 returned by the Lambda API
+    return base64.b64encode(hashlib.sha256(package).digest()).decode('utf-8')
+
+def main() -> None:
+    BUILD_DIR.mkdir(exist_ok=True)
+
+    for name, source_dir in LAMBDA_SOURCES.items():
+        package: bytes = build_lambda_package(source_dir)
+        output: Path = BUILD_DIR / f'{name}.zip'
+        output.write_bytes(package)
+        print(f'Built {output} ({len(package)} bytes, CodeSha256 {code_sha256(package)})')
+
+if __name__ == '__main__':
+    main()
@@ -10,6 +10,8 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 import boto3
 from botocore.exceptions import ClientError
 
+from build import LAMBDA_SOURCES, build_lambda_package, code_sha256
+
 # Settings
 class Settings(BaseSettings):
     # General
@@ -256,7 +258,10 @@ def main() -> None:
             'nonFilterableMetadataKeys': [
                 'S3VECTORS-EMBED-SRC-CONTENT',
                 'AMAZON_BEDROCK_TEXT',
-                'AMAZON_BEDROCK_METADATA'
+                'AMAZON_BEDROCK_METADATA',
+                # Resource metadata from infra/ingest.py, only returned with results
+                'title',
+                'summary'
             ]
         }
     )
@@ -494,6 +499,21 @@ def main() -> None:
                         'bedrock:Retrieve'
                     ],
                     'Resource': knowledge_base_arn
+                },
+                {
+                    'Effect': 'Allow',
+                    'Action': [
+                        'bedrock:InvokeModel'
+                    ],
+                    'Resource': titan_v2_arn
+                },
+                {
+                    'Effect': 'Allow',
+                    'Action': [
+                        's3vectors:QueryVectors',
+                        's3vectors:GetVectors'
+                    ],
+                    'Resource': vector_index_arn
                 }
             ]
         })
@@ -512,8 +532,8 @@ def main() -> None:
     print(f'Attached resource Lambda policy to role {resource_lambda_role_name}. Waiting for IAM role propagation...')
     sleep(10)
 
-    with open(Path(__file__).parent / 'resources' / 'gateway' / 'resources-target' / 'package.zip', 'rb') as f:
-        resource_lambda_code: bytes = f.read()
+    resource_lambda_code: bytes = build_lambda_package(LAMBDA_SOURCES['resources-target'])
+    print(f'Built resource Lambda package ({len(resource_lambda_code)} bytes, CodeSha256 {code_sha256(resource_lambda_code)})')
 
     resource_lambda_function_name: str = f'{prefix}-resource-function'
     resource_lambda = _lambda.create_function(
@@ -524,11 +544,15 @@ def main() -> None:
         Handler='index.handler',
         Architectures=['arm64'],
         Timeout=30,
-        MemorySize=128,
+        # More memory also means more CPU, which shortens the boto3 client setup on cold starts
+        MemorySize=512,
         Code={'ZipFile': resource_lambda_code},
         Environment={
             'Variables': {
-                'AWS_BEDROCK_KNOWLEDGE_BASE_ID': knowledge_base_id
+                'AWS_BEDROCK_KNOWLEDGE_BASE_ID': knowledge_base_id,
+                'AWS_S3_VECTOR_BUCKET_NAME': vector_bucket_name,
+                'AWS_S3_VECTOR_INDEX_NAME': vector_index_name,
+                'SEARCH_MODE': 'hybrid'
             }
         }
     )
@@ -0,0 +1,191 @@
+"""
+Knowledge base ingestion.
+
+Extracts a title, publisher and short summary from every PDF in resources/knowledge-base and
+stores them as metadata attributes next to the source URI, so that the resource search tool can
+return them without another inference pass. Existing values are kept unless --force is given,
+which allows fixing any extraction by hand.
+
+It also builds the BM25 index over the chunked document text that the resource search Lambda
+fuses with the vector search results.
+
+Usage:
+    uv run --package sana-infra python infra/ingest.py
+"""
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from urllib import parse
+import gzip
+import json
+import re
+import sys
+
+from pypdf import PdfReader
+
+KNOWLEDGE_BASE_PATH: Path = Path(__file__).parent / 'resources' / 'knowledge-base'
+RESOURCES_TARGET_PATH: Path = Path(__file__).parent / 'resources' / 'gateway' / 'resources-target'
+
+# The index is built with the same tokenizer the Lambda uses at query time
+sys.path.insert(0, str(RESOURCES_TARGET_PATH))
+from lexical import INDEX_PATH, LexicalIndex
+
+PUBLISHERS: dict[str, str] = {
+    'nhs': 'NHS',
+    'nimh': 'NIMH',
+    'who': 'WHO'
+}
+
+# Kept short since it is returned with every search result
+MAX_SUMMARY_LENGTH: int = 300
+MAX_PAGES: int = 3
+
+CHUNK_WORDS: int = 200
+CHUNK_OVERLAP: int = 50
+
+BOILERPLATE: re.Pattern = re.compile(
+    r'cookie|website|government|funding|operating status|clinical center|javascript|sign up|subscribe|http|www\.|©|copyright|page last reviewed',
+    re.IGNORECASE
+)
+SENTENCE_END: re.Pattern = re.compile(r'(?<=[.!?])\s+(?=[A-Z])')
+TITLE_PREFIX: re.Pattern = re.compile(r'^(Overview|About)\s+[-–]?\s*', re.IGNORECASE)
+TITLE_SUFFIX: re.Pattern = re.compile(r'\s+[-–|]\s+[^-–|]+$')
+STOPWORDS: set[str] = {'understanding', 'frequently', 'asked', 'questions', 'about', 'what', 'the'}
+
+def extract_text(pdf_path: Path, max_pages: int | None = MAX_PAGES) -> tuple[str | None, str]:
+    reader = PdfReader(pdf_path)
+    metadata_title: str | None = reader.metadata.title if reader.metadata else None
+
+    pages: list[str] = [page.extract_text() or '' for page in reader.pages[:max_pages]]
+    return metadata_title, '\n'.join(pages)
+
+def chunk_text(text: str) -> list[str]:
+    words: list[str] = text.split()
+    step: int = CHUNK_WORDS - CHUNK_OVERLAP
+    return [' '.join(words[i:i + CHUNK_WORDS]) for i in range(0, max(len(words) - CHUNK_OVERLAP, 1), step)]
+
+def clean_title(title: str) -> str:
+    return TITLE_PREFIX.sub('', TITLE_SUFFIX.sub('', title.strip())).strip()
+
+def title_stem(title: str) -> str:
+    # Used to find the sentences that are about the document topic
+    words: list[str] = [w for w in re.findall(r'[a-z]+', title.lower()) if len(w) > 3 and w not in STOPWORDS]
+    return words[0][:6] if words else ''
+
+def title_from_url(url: str) -> str:
+    segments: list[str] = [s for s in parse.urlparse(url).path.split('/') if s and s != 'overview']
+    return segments[-1].replace('-', ' ').capitalize() if segments else url
+
+def trim_sentence(sentence: str, stem: str) -> str:
+    # Headings and navigation are glued to the first sentence, so start at the last capitalized mention of the topic
+    starts: list[int] = [
+        match.start() for match in re.finditer(rf'\b{re.escape(stem)}', sentence, re.IGNORECASE)
+        if sentence[match.start()].isupper()
+    ]
+    return sentence[starts[-1]:] if starts else sentence
+
+def extract_summary(text: str, title: str) -> str:
+    # Table of contents entries end in wide spaces and page numbers stand on their own line
+    lines: list[str] = [
+        line.strip() for line in text.splitlines()
+        if line.strip() and '　' not in line and not line.strip().isdigit()
+    ]
+    prose: str = re.sub(r'\s+', ' ', ' '.join(lines))
+    stem: str = title_stem(title)
+
+    summary: str = ''
+    for sentence in SENTENCE_END.split(prose):
+        if not summary:
+            if stem.lower() not in sentence.lower():
+                continue
+            sentence = trim_sentence(sentence, stem)
+
+        if (
+            not 40 <= len(sentence) <= MAX_SUMMARY_LENGTH
+            or not sentence.endswith('.')
+            or BOILERPLATE.search(sentence)
+            or not re.search(r'\b(is|are|can|may|affects?|causes?)\b', sentence)
+        ):
+            if summary:
+                break
+            continue
+
+        if len(summary) + len(sentence) + 1 > MAX_SUMMARY_LENGTH:
+            break
+        summary = f'{summary} {sentence}'.strip()
+
+    return summary
+
+def publisher_for(pdf_path: Path, metadata_title: str | None, url: str) -> str:
+    if (publisher := PUBLISHERS.get(pdf_path.parent.name)):
+        return publisher
+
+    if metadata_title and (suffix := TITLE_SUFFIX.search(metadata_title)):
+        return suffix.group(0).strip(' -|')
+
+    return parse.urlparse(url).netloc.removeprefix('www.')
+
+def string_attribute(value: str) -> dict:
+    return {'value': {'type': 'STRING', 'stringValue': value}}
+
+def ingest(pdf_path: Path, force: bool = False) -> dict:
+    metadata_path: Path = pdf_path.with_name(f'{pdf_path.name}.metadata.json')
+    metadata: dict = json.loads(metadata_path.read_text())
+    attributes: dict = metadata['metadataAttributes']
+
+    url: str = attributes['x-amz-bedrock-kb-source-uri']['value']['stringValue']
+    metadata_title, text = extract_text(pdf_path)
+
+    title: str = clean_title(metadata_title) if metadata_title else title_from_url(url)
+    extracted: dict[str, str] = {
+        'title': title,
+        'publisher': publisher_for(pdf_path, metadata_title, url),
+        'summary': extract_summary(text, title)
+    }
+
+    for key, value in extracted.items():
+        if force or key not in attributes:
+            attributes[key] = string_attribute(value)
+
+    metadata_path.write_text(json.dumps(metadata, indent=4, ensure_ascii=False))
+    return {'url': url, **{key: attributes[key]['value']['stringValue'] for key in extracted}}
+
+def build_lexical_index(pdf_paths: list[Path], documents: list[dict]) -> dict:
+    chunks: list[tuple[int, str]] = []
+
+    for document_id, (pdf_path, document) in enumerate(zip(pdf_paths, documents)):
+        # File names carry the exact clinical terms, e.g. bdd.pdf or post-partum-psychosis.pdf
+        chunks.append((document_id, f'{document["title"]} {pdf_path.stem}'))
+
+        _, text = extract_text(pdf_path, max_pages=None)
+        chunks.extend((document_id, chunk) for chunk in chunk_text(text))
+
+    return LexicalIndex.build(documents, chunks)
+
+def write_lexical_index(index: dict) -> None:
+    # A fixed mtime keeps the archive reproducible
+    with open(INDEX_PATH, 'wb') as f:
+        with gzip.GzipFile(filename='', mode='wb', fileobj=f, mtime=0) as archive:
+            archive.write(json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+def parse_args() -> Namespace:
+    parser = ArgumentParser(description='Extract resource metadata from the knowledge base documents')
+    parser.add_argument('--force', action='store_true', help='Overwrite existing title, publisher and summary values')
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+
+    pdf_paths: list[Path] = sorted(KNOWLEDGE_BASE_PATH.glob('**/*.pdf'))
+    documents: list[dict] = []
+
+    for pdf_path in pdf_paths:
+        result: dict = ingest(pdf_path, force=args.force)
+        print(f'{pdf_path.relative_to(KNOWLEDGE_BASE_PATH)}: {result["title"]} ({result["publisher"]})')
+        if not result['summary']:
+            print('  warning: no summary could be extracted')
+
+        documents.append(result)
+
+    index: dict = build_lexical_index(pdf_paths, documents)
+    write_lexical_index(index)
+    print(f'Built lexical index with {len(index["chunk_lengths"])} chunks and {len(index["postings"])} terms ({INDEX_PATH.stat().st_size} bytes)')
@@ -0,0 +1,85 @@
+from collections import OrderedDict
+from pathlib import Path
+from time import perf_counter
+import json
+import re
+
+PUNCTUATION: re.Pattern = re.compile(r'[^\w\s-]')
+WHITESPACE: re.Pattern = re.compile(r'\s+')
+
+def normalize_query(query: str) -> str:
+    return WHITESPACE.sub(' ', PUNCTUATION.sub(' ', query.lower())).strip()
+
+class EmbeddingCache:
+    """
+    Bounded LRU of normalized query text to embedding vector, optionally persisted to a JSON
+    file so that a warm container, or the next one on the same path, skips repeated embeddings.
+    """
+    def __init__(self, max_size: int = 512, path: Path | None = None, save_interval: int = 16) -> None:
+        self.max_size = max_size
+        self.path = path
+        self.save_interval = save_interval
+
+        self._vectors: OrderedDict[str, list[float]] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.embedding_time: float = 0.0
+
+        if self.path and self.path.exists():
+            try:
+                self._vectors.update(json.loads(self.path.read_text()))
+            except (OSError, ValueError):
+                pass
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    @property
+    def hit_rate(self) -> float:
+        total: int = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def time_saved(self) -> float:
+        # Every hit skips an embedding that would have taken the average miss time
+        return self.hits * self.embedding_time / self.misses if self.misses else 0.0
+
+    def get_or_embed(self, query: str, embed) -> list[float]:
+        key: str = normalize_query(query)
+
+        if (vector := self._vectors.get(key)) is not None:
+            self._vectors.move_to_end(key)
+            self.hits += 1
+            return vector
+
+        start: float = perf_counter()
+        vector = embed(key)
+        self.embedding_time += perf_counter() - start
+        self.misses += 1
+
+        self._vectors[key] = vector
+        while len(self._vectors) > self.max_size:
+            self._vectors.popitem(last=False)
+
+        if self.misses % self.save_interval == 0:
+            self.save()
+
+        return vector
+
+    def save(self) -> None:
+        if not self.path:
+            return
+
+        try:
+            self.path.write_text(json.dumps(self._vectors))
+        except OSError:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            'size': len(self),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'time_saved': self.time_saved
+        }
@@ -1,26 +1,181 @@
-from typing import TypedDict
+from functools import cache
+from pathlib import Path
+from time import perf_counter, time
+from typing import Literal, TypedDict, get_args
+import json
 import os
 
+_init_start: float = perf_counter()
+
 import boto3
+from botocore.config import Config
+from botocore.exceptions import UnknownServiceError
+
+client_config = Config(
+    connect_timeout=2,
+    read_timeout=10,
+    max_pool_connections=10,
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 3}
+)
+
+bedrock = boto3.client('bedrock-agent-runtime', config=client_config)
 
-bedrock = boto3.client('bedrock-agent-runtime')
+from embeddings import EmbeddingCache
+from lexical import LexicalIndex, reciprocal_rank_fusion
 
 try:
     AWS_BEDROCK_KNOWLEDGE_BASE_ID = os.environ['AWS_BEDROCK_KNOWLEDGE_BASE_ID']
 except KeyError as e:
     raise RuntimeError(f'Missing environment variable: {e}')
 
+# Querying the vector index directly allows embedding queries once and reusing the vectors
+AWS_S3_VECTOR_BUCKET_NAME: str | None = os.environ.get('AWS_S3_VECTOR_BUCKET_NAME')
+AWS_S3_VECTOR_INDEX_NAME: str | None = os.environ.get('AWS_S3_VECTOR_INDEX_NAME')
+EMBEDDING_MODEL_ID: str = os.environ.get('EMBEDDING_MODEL_ID', 'amazon.titan-embed-text-v2:0')
+EMBEDDING_DIMENSIONS: int = int(os.environ.get('EMBEDDING_DIMENSIONS', '1024'))
+EMBEDDING_CACHE_SIZE: int = int(os.environ.get('EMBEDDING_CACHE_SIZE', '512'))
+EMBEDDING_CACHE_PATH: str | None = os.environ.get('EMBEDDING_CACHE_PATH')
+
+bedrock_runtime = None
+s3_vectors = None
+if AWS_S3_VECTOR_BUCKET_NAME and AWS_S3_VECTOR_INDEX_NAME:
+    try:
+        # boto3 is not bundled, and older runtime versions do not know S3 Vectors
+        s3_vectors = boto3.client('s3vectors', config=client_config)
+        bedrock_runtime = boto3.client('bedrock-runtime', config=client_config)
+    except UnknownServiceError:
+        print(f'boto3 {boto3.__version__} does not support S3 Vectors, falling back to the knowledge base Retrieve API')
+
+embedding_cache = EmbeddingCache(
+    max_size=EMBEDDING_CACHE_SIZE,
+    path=Path(EMBEDDING_CACHE_PATH) if EMBEDDING_CACHE_PATH else None
+)
+
+# Chunks fetched per requested document when querying the vector index directly
+CHUNKS_PER_RESULT: int = 5
+MAX_TOP_K: int = 30
+
+SearchMode = Literal['vector', 'lexical', 'hybrid']
+SEARCH_MODES: tuple[str, ...] = get_args(SearchMode)
+
+SEARCH_MODE: SearchMode = os.environ.get('SEARCH_MODE', 'hybrid')
+if SEARCH_MODE not in SEARCH_MODES:
+    raise RuntimeError(f'Invalid SEARCH_MODE {SEARCH_MODE!r}, expected one of: {", ".join(SEARCH_MODES)}')
+
+# Number of candidates each retriever contributes to the fusion, per requested result
+CANDIDATES_PER_RESULT: int = 2
+
+@cache
+def get_lexical_index() -> LexicalIndex:
+    return LexicalIndex.load()
+
+# Loaded during init unless only vector search is used, a call asking for another mode loads it then
+if SEARCH_MODE != 'vector':
+    get_lexical_index()
+
+init_duration: float = perf_counter() - _init_start
+cold_start: bool = True
+
+def report_metrics(tool_name: str, duration: float) -> None:
+    global cold_start
+
+    # CloudWatch embedded metric format, extracted from the function logs
+    metrics: list[dict] = [{'Name': 'Duration', 'Unit': 'Milliseconds'}]
+    record: dict = {
+        'ToolName': tool_name,
+        'ColdStart': str(cold_start).lower(),
+        'Duration': duration * 1000
+    }
+
+    if s3_vectors:
+        metrics.append({'Name': 'EmbeddingCacheHitRate', 'Unit': 'None'})
+        metrics.append({'Name': 'EmbeddingTimeSaved', 'Unit': 'Milliseconds'})
+        record['EmbeddingCacheHitRate'] = embedding_cache.hit_rate
+        record['EmbeddingTimeSaved'] = embedding_cache.time_saved * 1000
+
+    if cold_start:
+        metrics.append({'Name': 'InitDuration', 'Unit': 'Milliseconds'})
+        record['InitDuration'] = init_duration * 1000
+        cold_start = False
+
+    print(json.dumps({
+        '_aws': {
+            'Timestamp': int(time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': 'Sana/Resources',
+                'Dimensions': [['ToolName', 'ColdStart']],
+                'Metrics': metrics
+            }]
+        },
+        **record
+    }))
+
 class Resource(TypedDict):
     url: str
+    title: str | None
+    publisher: str | None
+    summary: str | None
+    score: float | None
 
 class ResourceList(TypedDict):
     resources: list[Resource]
 
-def search_resources(
+def embed(text: str) -> list[float]:
+    response = bedrock_runtime.invoke_model(
+        modelId=EMBEDDING_MODEL_ID,
+        body=json.dumps({'inputText': text, 'dimensions': EMBEDDING_DIMENSIONS, 'normalize': True})
+    )
+    return json.loads(response['body'].read())['embedding']
+
+def index_search(
+    vector: list[float],
+    limit: int
+) -> list[Resource]:
+    response = s3_vectors.query_vectors(
+        vectorBucketName=AWS_S3_VECTOR_BUCKET_NAME,
+        indexName=AWS_S3_VECTOR_INDEX_NAME,
+        queryVector={'float32': vector},
+        topK=min(limit * CHUNKS_PER_RESULT, MAX_TOP_K),
+        returnMetadata=True,
+        returnDistance=True
+    )
+
+    # Results come sorted by distance, so the first chunk seen for a document is its best one
+    resources: dict[str, Resource] = {}
+    for match in response['vectors']:
+        metadata: dict = match.get('metadata', {})
+        if isinstance(bedrock_metadata := metadata.get('AMAZON_BEDROCK_METADATA'), str):
+            metadata = {**json.loads(bedrock_metadata), **metadata}
+
+        if not (url := metadata.get('x-amz-bedrock-kb-source-uri')) or url in resources:
+            continue
+
+        resources[url] = Resource(
+            url=url,
+            title=metadata.get('title'),
+            publisher=metadata.get('publisher'),
+            summary=metadata.get('summary'),
+            # The index uses euclidean distance, so map it to a score where higher is better
+            score=1 / (1 + match['distance'])
+        )
+
+        if len(resources) >= limit:
+            break
+
+    return list(resources.values())
+
+def vector_search(
     query: str,
-    limit: int = 3
-) -> ResourceList:
-    url_set: set[str] = set()
+    limit: int,
+    vector: list[float] | None = None
+) -> list[Resource]:
+    if s3_vectors:
+        return index_search(vector or embedding_cache.get_or_embed(query, embed), limit)
+
+    # The Retrieve API only takes text, a precomputed vector is ignored and the query embedded again
+    # Results come sorted by score, so the first chunk seen for a document is its best one
+    resources: dict[str, Resource] = {}
 
     for _ in range(limit):
         params: dict = {
@@ -33,32 +188,96 @@ def search_resources(
             }
         }
 
-        if url_set:
+        if resources:
             params['retrievalConfiguration']['vectorSearchConfiguration']['filter'] = {
                 'notIn': {
                     'key': 'x-amz-bedrock-kb-source-uri',
-                    'value': list(url_set)
+                    'value': list(resources)
                 }
             }
 
         response = bedrock.retrieve(**params)
+        if not response['retrievalResults']:
+            break
 
         for document in response['retrievalResults']:
-            url_set.add(document['metadata']['x-amz-bedrock-kb-source-uri'])
-            if len(url_set) >= limit:
+            metadata: dict = document['metadata']
+            url: str = metadata['x-amz-bedrock-kb-source-uri']
+
+            if url not in resources:
+                resources[url] = Resource(
+                    url=url,
+                    title=metadata.get('title'),
+                    publisher=metadata.get('publisher'),
+                    summary=metadata.get('summary'),
+                    score=document.get('score')
+                )
+
+            if len(resources) >= limit:
                 break
         else:
             continue
         break
 
-    return ResourceList(resources=[Resource(url=url) for url in list(url_set)])
-        
+    return list(resources.values())
+
+def lexical_search(
+    query: str,
+    limit: int
+) -> list[Resource]:
+    return [
+        Resource(
+            url=document['url'],
+            title=document['title'],
+            publisher=document['publisher'],
+            summary=document['summary'],
+            score=score
+        )
+        for document, score in get_lexical_index().search(query, limit)
+    ]
+
+def search_resources(
+    query: str,
+    limit: int = 3,
+    mode: SearchMode | None = None,
+    vector: list[float] | None = None
+) -> ResourceList:
+    if (mode := mode or SEARCH_MODE) not in SEARCH_MODES:
+        raise ValueError(f'Invalid search mode {mode!r}, expected one of: {", ".join(SEARCH_MODES)}')
+
+    match mode:
+        case 'vector':
+            return ResourceList(resources=vector_search(query, limit, vector))
+        case 'lexical':
+            return ResourceList(resources=lexical_search(query, limit))
+
+    # Exact clinical terms are found lexically, paraphrases semantically, so fuse both rankings
+    candidates: int = limit * CANDIDATES_PER_RESULT
+    vector_results: list[Resource] = vector_search(query, candidates, vector)
+    lexical_results: list[Resource] = lexical_search(query, candidates)
+
+    # The lexical index always carries the ingested metadata
+    resources: dict[str, Resource] = {r['url']: r for r in vector_results} | {r['url']: r for r in lexical_results}
+    fused: dict[str, float] = reciprocal_rank_fusion([
+        [r['url'] for r in vector_results],
+        [r['url'] for r in lexical_results]
+    ])
+
+    return ResourceList(resources=[
+        Resource(**{**resources[url], 'score': score})
+        for url, score in list(fused.items())[:limit]
+    ])
+
 def handler(event: dict, context: dict):
     full_tool_name: str = context.client_context.custom['bedrockAgentCoreToolName']
     tool_name: str = full_tool_name.split('___')[-1]
     
-    match tool_name:
-        case 'search-resources':
-            return search_resources(**event)
-        case _:
-            return {'error': f'Unknown tool: {tool_name}'}
\ No newline at end of file
+    start: float = perf_counter()
+    try:
+        match tool_name:
+            case 'search-resources':
+                return search_resources(**event)
+            case _:
+                return {'error': f'Unknown tool: {tool_name}'}
+    finally:
+        report_metrics(tool_name, perf_counter() - start)
\ No newline at end of file
@@ -0,0 +1,114 @@
+from collections import Counter
+from pathlib import Path
+import gzip
+import json
+import math
+import re
+
+INDEX_PATH: Path = Path(__file__).parent / 'lexical_index.json.gz'
+
+STOPWORDS: frozenset[str] = frozenset((
+    'a', 'about', 'after', 'all', 'also', 'am', 'an', 'and', 'any', 'are', 'as', 'at', 'be', 'because',
+    'been', 'being', 'but', 'by', 'can', 'could', 'do', 'does', 'for', 'from', 'had', 'has', 'have',
+    'how', 'i', 'if', 'in', 'into', 'is', 'it', 'its', 'may', 'me', 'more', 'most', 'my', 'no', 'not',
+    'of', 'on', 'or', 'other', 'our', 'out', 'so', 'some', 'such', 'than', 'that', 'the', 'their',
+    'them', 'then', 'there', 'these', 'they', 'this', 'to', 'up', 'was', 'we', 'were', 'what', 'when',
+    'which', 'who', 'will', 'with', 'would', 'you', 'your'
+))
+
+WORD: re.Pattern = re.compile(r'[a-z0-9]+(?:-[a-z0-9]+)*')
+
+def stem(token: str) -> str:
+    # Plural folding is enough for condition names, heavier stemming hurts acronyms
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 3 and token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        return token[:-1]
+    return token
+
+def tokenize(text: str) -> list[str]:
+    tokens: list[str] = []
+
+    for word in WORD.findall(text.lower()):
+        # Hyphenated terms match both their parts and their joined form, e.g. post-partum and postpartum
+        parts: list[str] = word.split('-')
+        if len(parts) > 1:
+            parts.append(''.join(parts))
+
+        tokens.extend(stem(part) for part in parts if part not in STOPWORDS)
+
+    return tokens
+
+def reciprocal_rank_fusion(rankings: list[list[str]], k: int = 60) -> dict[str, float]:
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + 1 / (k + rank)
+    return dict(sorted(scores.items(), key=lambda item: item[1], reverse=True))
+
+class LexicalIndex:
+    """
+    BM25 over document chunks, ranking each document by its best chunk.
+    """
+    def __init__(self, index: dict) -> None:
+        self.k1: float = index['k1']
+        self.b: float = index['b']
+        self.documents: list[dict] = index['documents']
+        self.chunk_documents: list[int] = index['chunk_documents']
+        self.chunk_lengths: list[int] = index['chunk_lengths']
+        self.postings: dict[str, list[list[int]]] = index['postings']
+
+        self.average_length: float = sum(self.chunk_lengths) / len(self.chunk_lengths)
+        self.idf: dict[str, float] = {
+            term: math.log(1 + (len(self.chunk_lengths) - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items()
+        }
+
+    @classmethod
+    def load(cls, path: Path = INDEX_PATH) -> 'LexicalIndex':
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    @staticmethod
+    def build(documents: list[dict], chunks: list[tuple[int, str]], k1: float = 1.2, b: float = 0.75) -> dict:
+        postings: dict[str, list[list[int]]] = {}
+        chunk_documents: list[int] = []
+        chunk_lengths: list[int] = []
+
+        for chunk_id, (document_id, text) in enumerate(chunks):
+            tokens: list[str] = tokenize(text)
+            chunk_documents.append(document_id)
+            chunk_lengths.append(len(tokens))
+
+            for term, frequency in Counter(tokens).items():
+                postings.setdefault(term, []).append([chunk_id, frequency])
+
+        return {
+            'k1': k1,
+            'b': b,
+            'documents': documents,
+            'chunk_documents': chunk_documents,
+            'chunk_lengths': chunk_lengths,
+            'postings': dict(sorted(postings.items()))
+        }
+
+    def search(self, query: str, limit: int = 10) -> list[tuple[dict, float]]:
+        chunk_scores: dict[int, float] = {}
+
+        for term in set(tokenize(query)):
+            if not (postings := self.postings.get(term)):
+                continue
+
+            idf: float = self.idf[term]
+            for chunk_id, frequency in postings:
+                length_norm: float = 1 - self.b + self.b * self.chunk_lengths[chunk_id] / self.average_length
+                score: float = idf * frequency * (self.k1 + 1) / (frequency + self.k1 * length_norm)
+                chunk_scores[chunk_id] = chunk_scores.get(chunk_id, 0.0) + score
+
+        document_scores: dict[int, float] = {}
+        for chunk_id, score in chunk_scores.items():
+            document_id: int = self.chunk_documents[chunk_id]
+            document_scores[document_id] = max(score, document_scores.get(document_id, 0.0))
+
+        ranked: list[tuple[int, float]] = sorted(document_scores.items(), key=lambda item: item[1], reverse=True)
+        return [(self.documents[document_id], score) for document_id, score in ranked[:limit]]
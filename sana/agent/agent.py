@@ -1,29 +1,77 @@
 from pathlib import Path
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
+from functools import cache
+from time import perf_counter
+import asyncio
 import hashlib
 import logging
 
 import yaml
 
 from strands import Agent
-from strands.tools.mcp import MCPClient
+from strands.hooks import MessageAddedEvent
 from strands.session import SessionManager
-from strands.models import BedrockModel
+from strands.types.content import Message
 
 from bedrock_agentcore.memory.integrations.strands.session_manager import AgentCoreMemorySessionManager
-from bedrock_agentcore.memory.integrations.strands.config import AgentCoreMemoryConfig, RetrievalConfig
-
-from mcp.client.streamable_http import streamablehttp_client
+from bedrock_agentcore.memory.integrations.strands.config import AgentCoreMemoryConfig
 
 from opentelemetry import baggage, context
+from opentelemetry.trace import Span
 
 from sana.core.config import settings
+from sana.core.events import Done, Error, StreamEvent, TextDelta, ToolEnd, ToolStart, Usage
 from sana.core.models import Actor
-
-from sana.agent.tools import tool_map
+from sana.core.telemetry import (
+    crisis_fast_path,
+    init_duration,
+    inter_token_gap,
+    stream_cancellations,
+    stream_duration,
+    time_to_first_token,
+    timed,
+    tracer,
+    turn_tokens
+)
+
+from sana.agent.conversation import CompactingConversationManager
+from sana.agent.executor import TOOL_END, BoundedToolExecutor
+from sana.agent.hooks import ToolTelemetryHooks
+from sana.agent.model import RoutedModel, SanaBedrockModel
+from sana.agent.tools import tool_map, tool_timeouts
+from sana.agent.tools.crisis import crisis_table, detect_risk
 
 logger = logging.getLogger(__name__)
 
+INTERRUPTED_TOOL: str = 'The tool was cancelled because the user disconnected.'
+INTERRUPTED_RESPONSE: str = 'My previous response was interrupted because the user disconnected.'
+
+@cache
+def load_prompt(prompt_name: str) -> tuple[dict, str]:
+    # Load dotprompt file
+    prompt_path = Path(__file__).parent / 'prompts' / f'{prompt_name}.prompt'
+
+    if not prompt_path.exists():
+        logger.error(f'Prompt file not found: {prompt_path}')
+        raise FileNotFoundError(f'Prompt file not found: {prompt_path}')
+    
+    with open(prompt_path, 'r') as file:
+        content = file.read()
+
+    parts = content.split('---')
+    if len(parts) < 3:
+        return {}, content.strip()
+    
+    # Load prompt metadata from YAML section
+    prompt = parts[-1].strip()
+    try:
+        metadata = yaml.safe_load(parts[1])
+    except yaml.YAMLError as e:
+        logger.error(f'Error parsing YAML metadata: {e}')
+        return {}, prompt
+    
+    return metadata if isinstance(metadata, dict) else {}, prompt
+
 class Sana:
     def __init__(
         self, *,
@@ -31,6 +79,40 @@ class Sana:
         gateway_token: str,
         actor: Actor,
     ) -> None:
+        self._setup(session_id=session_id, gateway_token=gateway_token, actor=actor)
+
+        with timed('sana.init', init_duration, phase='total'):
+            self._run_phase('tools', self._load_tools)
+            self._run_phase('memory', self._load_memory)
+            self._run_phase('model', self._load_model)
+            self._load_agent()
+
+    @classmethod
+    async def create(
+        cls, *,
+        session_id: str,
+        gateway_token: str,
+        actor: Actor,
+    ) -> 'Sana':
+        """
+        Builds the agent without blocking the event loop, running the independent
+        initialization phases concurrently in the default thread pool.
+        """
+        self = cls.__new__(cls)
+        self._setup(session_id=session_id, gateway_token=gateway_token, actor=actor)
+
+        with timed('sana.init', init_duration, phase='total'):
+            await asyncio.gather(
+                asyncio.to_thread(self._run_phase, 'tools', self._load_tools),
+                asyncio.to_thread(self._run_phase, 'memory', self._load_memory),
+                asyncio.to_thread(self._run_phase, 'model', self._load_model)
+            )
+            # Restoring the session history calls the memory API
+            await asyncio.to_thread(self._run_phase, 'agent', self._load_agent)
+
+        return self
+
+    def _setup(self, *, session_id: str, gateway_token: str, actor: Actor) -> None:
         self.session_id = session_id 
         self.gateway_token = gateway_token
         self.actor = actor
@@ -38,28 +120,68 @@ class Sana:
         self.actor_id_hash: str = hashlib.md5(self.actor.id.encode('utf-8')).hexdigest()
 
         self.tools: list = []
-        self._load_tools()
-
         self.session_manager: SessionManager | None = None
-        self._load_memory()
+        self.memory_context: str | None = None
+
+    def _run_phase(self, phase: str, loader: Callable[[], None]) -> None:
+        with timed(f'sana.init.{phase}', init_duration, phase=phase):
+            loader()
 
-        prompt_metadata, self.prompt = self._load_prompt('system')
+    def _load_model(self) -> None:
+        with timed('sana.init.prompt', init_duration, phase='prompt'):
+            prompt_metadata, self.prompt = load_prompt('system')
+            _, self.user_context = load_prompt('user')
 
         self.model_id = prompt_metadata.get('model', settings.AWS_BEDROCK_MODEL_ID)
         self.temperature = prompt_metadata.get('temperature', settings.AWS_BEDROCK_TEMPERATURE)
         self.max_tokens = prompt_metadata.get('max_tokens', settings.AWS_BEDROCK_MAX_TOKENS)
-        
-        self.model = BedrockModel(
-            model_id=self.model_id,
+
+        self._load_user_context()
+
+        # Cache points after the tool specs and the static system prompt, the user context follows them
+        cache_point: str | None = 'default' if settings.AWS_BEDROCK_PROMPT_CACHE_ENABLED else None
+
+        model_config: dict = dict(
             temperature=self.temperature,
             max_tokens=self.max_tokens,
             guardrail_id=settings.AWS_BEDROCK_GUARDRAILS_ID,
             guardrail_version=settings.AWS_BEDROCK_GUARDRAILS_VERSION,
+            cache_prompt=cache_point,
+            cache_tools=cache_point,
+            user_context=self.user_context,
             region_name=settings.AWS_REGION,
             streaming=True
         )
 
-        self._load_user_context()
+        # Lightweight turns go to the fast model, sharing the conversation history with the primary one
+        fast_model: SanaBedrockModel | None = None
+        if settings.AWS_BEDROCK_ROUTING_ENABLED:
+            fast_model = SanaBedrockModel(model_id=settings.AWS_BEDROCK_FAST_MODEL_ID, **model_config)
+
+        self.model = RoutedModel(
+            primary=SanaBedrockModel(model_id=self.model_id, **model_config),
+            fast=fast_model,
+            max_fast_chars=settings.AWS_BEDROCK_FAST_MAX_CHARS
+        )
+
+    def _load_agent(self) -> None:
+        # Memory and model load concurrently, so the memory context joins the user context here
+        if self.memory_context:
+            self.model.set_user_context(f'{self.user_context}\n\n{self.memory_context}')
+
+        # Persist memory events in the background instead of inside the streamed turn
+        if self.session_manager and settings.AWS_BEDROCK_AGENTCORE_MEMORY_WRITE_BEHIND:
+            from sana.agent.memory import WriteBehindSessionManager
+            self.session_manager = WriteBehindSessionManager(
+                self.session_manager,
+                session_id=self.session_id,
+                batch_size=settings.AWS_BEDROCK_AGENTCORE_MEMORY_BATCH_SIZE,
+                retries=settings.AWS_BEDROCK_AGENTCORE_MEMORY_WRITE_RETRIES
+            )
+
+        if settings.SEMANTIC_CACHE_ENABLED:
+            from sana.agent.cache import wrap_cacheable_tools
+            self.tools = wrap_cacheable_tools(self.tools, self.actor)
 
         self.agent = Agent(
             name='Sana',
@@ -68,6 +190,17 @@ class Sana:
             tools=self.tools,
             system_prompt=self.prompt,
             session_manager=self.session_manager,
+            conversation_manager=CompactingConversationManager(
+                token_budget=settings.CONVERSATION_TOKEN_BUDGET,
+                recent_turns=settings.CONVERSATION_RECENT_TURNS,
+                excerpt_chars=settings.CONVERSATION_EXCERPT_CHARS
+            ),
+            tool_executor=BoundedToolExecutor(
+                max_concurrency=settings.TOOL_MAX_CONCURRENCY,
+                timeouts=tool_timeouts,
+                default_timeout=settings.TOOL_TIMEOUT
+            ),
+            hooks=[ToolTelemetryHooks()],
             callback_handler=None
         )
 
@@ -86,7 +219,7 @@ class Sana:
         # Calendar management tool
         if settings.GOOGLE_OAUTH_PROVIDER_NAME:
             from sana.agent.tools.calendar import GoogleCalendarTools
-            calendar = GoogleCalendarTools()
+            calendar = GoogleCalendarTools(session_id=self.session_id, timezone=self.actor.timezone)
             self.tools.extend(calendar.tools)
         else:
             logger.warning('No Google OAuth provider configured, skipping calendar tool setup...')
@@ -96,42 +229,33 @@ class Sana:
             logger.warning('No AgentCore Gateway URL configured, skipping MCP tool setup...')
             return
         
-        try:
-            mcp_client = MCPClient(
-                lambda: streamablehttp_client(
-                    settings.AWS_BEDROCK_AGENTCORE_GATEWAY_URL,
-                    headers={'Authorization': self.gateway_token}
-                )
-            )
+        from sana.agent.tools.gateway import get_gateway_tools
+        gateway_tools: list = get_gateway_tools(self.gateway_token)
 
-            mcp_client.start()
-        except Exception as e:
-            raise RuntimeError(f'failed to initialize MCPClient: {e}')
-        
-        self.tools.extend(mcp_client.list_tools_sync())
+        # Helplines are searched in a single call, with the catalogues served from a process cache
+        from sana.agent.tools.helplines import THROUGHLINE_TOOLS, get_helpline_catalogues, search_helplines
+        if any(t.tool_name in THROUGHLINE_TOOLS for t in gateway_tools):
+            gateway_tools = [t for t in gateway_tools if t.tool_name not in THROUGHLINE_TOOLS]
+            gateway_tools.extend([search_helplines, get_helpline_catalogues])
+
+        self.tools.extend(gateway_tools)
     
-    def _load_observability(self) -> None:
+    def _load_observability(self) -> object | None:
         if not settings.OTEL_ENABLED:
-            logger.warning('OpenTelemetry is not enabled, skipping observability setup...')
-            return
+            return None
 
         baggage_context = baggage.set_baggage('actor.id', self.actor_id_hash)
         baggage_context = baggage.set_baggage('session.id', self.session_id, context=baggage_context)
-        context.attach(baggage_context)
+        return context.attach(baggage_context)
 
     def _load_memory(self) -> None:
         if not settings.AWS_BEDROCK_AGENTCORE_MEMORY_ID:
             logger.warning('No AgentCore Memory ID configured, skipping memory setup...')
             return
         
-        # Long-term memory configuration
-        namespace_config: dict = {
-            '/summary/{actorId}/{sessionId}': RetrievalConfig(top_k=3)
-        }
-
+        # Long-term memory is retrieved once per session below, not on every message
         memory_config = AgentCoreMemoryConfig(
             memory_id=settings.AWS_BEDROCK_AGENTCORE_MEMORY_ID,
-            retrieval_config=namespace_config,
             session_id=self.session_id,
             actor_id=self.actor_id_hash,
         )
@@ -141,54 +265,140 @@ class Sana:
             agentcore_memory_config=memory_config
         )
 
-    def _load_prompt(self, prompt_name: str) -> tuple[dict, str]:
-        # Load dotprompt file
-        prompt_path = Path(__file__).parent / 'prompts' / f'{prompt_name}.prompt'
-
-        if not prompt_path.exists():
-            logger.error(f'Prompt file not found: {prompt_path}')
-            raise FileNotFoundError(f'Prompt file not found: {prompt_path}')
-        
-        with open(prompt_path, 'r') as file:
-            content = file.read()
-
-        parts = content.split('---')
-        if len(parts) < 3:
-            return {}, content.strip()
-        
-        # Load prompt metadata from YAML section
-        prompt = parts[-1].strip()
+        from sana.agent.memory import retrieve_memory_context
         try:
-            metadata = yaml.safe_load(parts[1])
-        except yaml.YAMLError as e:
-            logger.error(f'Error parsing YAML metadata: {e}')
-            return {}, prompt
-        
-        return metadata if isinstance(metadata, dict) else {}, prompt
+            self.memory_context = retrieve_memory_context(self.actor_id_hash, self.session_id)
+        except Exception as e:
+            logger.error(f'Failed to retrieve long-term memory: {e}')
 
     def _load_user_context(self) -> None:
-        self.prompt = self.prompt.replace('{{country}}', self.actor.country)
-        self.prompt = self.prompt.replace('{{zip_code}}', self.actor.zip_code)
-        self.prompt = self.prompt.replace('{{timezone}}', self.actor.timezone)
+        self.user_context = self.user_context.replace('{{country}}', self.actor.country)
+        self.user_context = self.user_context.replace('{{zip_code}}', self.actor.zip_code)
+        self.user_context = self.user_context.replace('{{timezone}}', self.actor.timezone)
 
-    async def stream(self, message: str) -> AsyncGenerator[str, None]:
-        using_tool: bool = False
-        current_tool_name: str | None = None
+    def _close_interrupted_turn(self) -> None:
+        # The next turn replays the history, which needs every tool use answered and alternating roles
+        if not (messages := self.agent.messages):
+            return
+        closed_from: int = len(messages)
+
+        if messages[-1]['role'] == 'assistant' and (tool_uses := [block['toolUse'] for block in messages[-1]['content'] if 'toolUse' in block]):
+            self._add_message({
+                'role': 'user',
+                'content': [
+                    {'toolResult': {'toolUseId': tool_use['toolUseId'], 'status': 'error', 'content': [{'text': INTERRUPTED_TOOL}]}}
+                    for tool_use in tool_uses
+                ]
+            })
+
+        if self.agent.messages[-1]['role'] == 'user':
+            self._add_message({'role': 'assistant', 'content': [{'text': INTERRUPTED_RESPONSE}]})
+
+        # The agent already managed the history and synced the session as the cancellation went through it
+        if len(self.agent.messages) > closed_from:
+            self.agent.conversation_manager.apply_management(self.agent)
+            if self.session_manager:
+                self.session_manager.sync_agent(self.agent)
+
+    def _add_message(self, message: Message) -> None:
+        # Added the way the agent adds its own messages, so the session manager persists it
+        self.agent.messages.append(message)
+        self.agent.hooks.invoke_callbacks(MessageAddedEvent(agent=self.agent, message=message))
+
+    def _crisis_contacts(self, trigger: str, span: Span) -> TextDelta:
+        crisis_fast_path.add(1, {'crisis.trigger': trigger})
+        span.add_event('crisis_contacts', {'crisis.trigger': trigger})
+        return TextDelta(f'{crisis_table.get(self.actor.country).to_markdown()}\n\n')
+
+    def _record_usage(self, usage: dict[str, int], span: Span) -> None:
+        for token_type, key in (
+            ('input', 'inputTokens'),
+            ('output', 'outputTokens'),
+            ('cache_read', 'cacheReadInputTokens'),
+            ('cache_write', 'cacheWriteInputTokens')
+        ):
+            turn_tokens.record(usage.get(key, 0), {'token.type': token_type})
+            span.set_attribute(f'sana.usage.{token_type}_tokens', usage.get(key, 0))
+
+        logger.info(
+            f'Turn usage for session {self.session_id}: {usage.get("inputTokens", 0)} input, '
+            f'{usage.get("outputTokens", 0)} output, {usage.get("cacheReadInputTokens", 0)} cache read, '
+            f'{usage.get("cacheWriteInputTokens", 0)} cache write tokens'
+        )
+
+    async def stream(self, message: str) -> AsyncGenerator[StreamEvent, None]:
+        announced_tools: set[str] = set()
+
+        baggage_token = self._load_observability()
+        span = tracer.start_span('sana.stream', attributes={'session.id': self.session_id})
+
+        start: float = perf_counter()
+        first_token_at: float | None = None
+        last_token_at: float | None = None
+        usage: dict[str, int] = {}
+        crisis_shown: bool = False
 
         try:
+            # Crisis contacts go out before the model is even called
+            if settings.CRISIS_FAST_PATH_ENABLED and detect_risk(message):
+                crisis_shown = True
+                yield self._crisis_contacts('risk_signal', span)
+
             async for event in self.agent.stream_async(message):
                 if 'data' in event:
-                    if using_tool:
-                        using_tool = False
-                        
-                    yield event["data"]
+                    now: float = perf_counter()
+                    if last_token_at is None:
+                        first_token_at = now
+                        time_to_first_token.record(now - start)
+                        span.add_event('first_token')
+                    else:
+                        inter_token_gap.record(now - last_token_at)
+                    last_token_at = now
+
+                    yield TextDelta(event['data'])
                 elif 'current_tool_use' in event:
-                    if not using_tool or current_tool_name != event['current_tool_use']['name']:
-                        using_tool = True
-                        current_tool_name = event['current_tool_use']['name']
-                        tool_message: str = tool_map.get(current_tool_name, 'Performing tool action...')
-
-                        yield f'\n\n>{tool_message}\n\n'
+                    # Tools of the same response run concurrently, so each one gets its own progress message
+                    tool_use: dict = event['current_tool_use']
+                    if tool_use.get('toolUseId') not in announced_tools:
+                        announced_tools.add(tool_use.get('toolUseId'))
+                        tool_message: str = tool_map.get(tool_use['name'], 'Performing tool action...')
+
+                        yield ToolStart(tool_use['toolUseId'], tool_use['name'], tool_message)
+                elif 'tool_stream_event' in event and isinstance(data := event['tool_stream_event']['data'], dict) and TOOL_END in data:
+                    finished: dict = event['tool_stream_event']['tool_use']
+                    yield ToolEnd(finished['toolUseId'], finished['name'], data[TOOL_END]['status'], data[TOOL_END]['duration'])
+                elif 'event' in event and 'metadata' in event['event']:
+                    # One metadata chunk per model call, a turn with tool use makes several
+                    for key, value in event['event']['metadata'].get('usage', {}).items():
+                        usage[key] = usage.get(key, 0) + value
+                elif 'event' in event and not crisis_shown and settings.CRISIS_FAST_PATH_ENABLED and (
+                    'redactContent' in event['event']
+                    or event['event'].get('messageStop', {}).get('stopReason') == 'guardrail_intervened'
+                ):
+                    crisis_shown = True
+                    yield self._crisis_contacts('guardrail', span)
+
+            if usage:
+                yield Usage(
+                    input_tokens=usage.get('inputTokens', 0),
+                    output_tokens=usage.get('outputTokens', 0),
+                    cache_read_tokens=usage.get('cacheReadInputTokens', 0),
+                    cache_write_tokens=usage.get('cacheWriteInputTokens', 0)
+                )
+            yield Done(perf_counter() - start, first_token_at - start if first_token_at else None)
 
+        except asyncio.CancelledError:
+            stream_cancellations.add(1)
+            span.add_event('cancelled')
+            self._close_interrupted_turn()
+            raise
         except Exception as e:
-            yield f'error: {e}'
\ No newline at end of file
+            span.record_exception(e)
+            yield Error(str(e))
+        finally:
+            stream_duration.record(perf_counter() - start)
+            if usage:
+                self._record_usage(usage, span)
+            span.end()
+            if baggage_token:
+                context.detach(baggage_token)
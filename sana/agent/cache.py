@@ -0,0 +1,227 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import cache
+from time import monotonic, perf_counter
+from typing import Any
+import asyncio
+import json
+import logging
+import math
+import re
+import threading
+
+from strands.types.tools import AgentTool, ToolGenerator, ToolSpec, ToolUse
+from strands.types._events import ToolResultEvent
+
+from sana.agent.conversation import estimate_tokens
+from sana.core.config import settings
+from sana.core.models import Actor
+from sana.core.telemetry import cache_latency_saved, cache_requests, cache_tokens_saved
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class CachePolicy:
+    # Input field matched by embedding similarity, every other field must match exactly
+    semantic_field: str | None = None
+
+# Only tools whose results are the same for every actor are cached. Helplines depend on the
+# actor's location, and therapists and calendar tools handle personal data. The ThroughLine
+# country and topic catalogues are not agent tools, the helpline search keeps them in its own cache.
+CACHEABLE_TOOLS: dict[str, CachePolicy] = {
+    'resource-function___search-resources': CachePolicy(semantic_field='query')
+}
+
+PERSONAL_DATA: tuple[re.Pattern, ...] = (
+    re.compile(r'[\w.+-]+@[\w-]+\.[\w.-]+'),  # Email addresses
+    re.compile(r'\+?\d[\d\s().-]{6,}\d'),  # Phone numbers
+    re.compile(r'\d{3,}')  # Zip codes, dates of birth and other identifiers
+)
+
+def mentions_actor(text: str, actor: Actor) -> bool:
+    return bool(actor.zip_code and actor.zip_code in text) or (actor.id != 'anonymous' and actor.id in text)
+
+def contains_personal_data(text: str, actor: Actor) -> bool:
+    return mentions_actor(text, actor) or any(pattern.search(text) for pattern in PERSONAL_DATA)
+
+def normalize(text: str) -> str:
+    return ' '.join(re.sub(r'[^\w\s-]', ' ', text.lower()).split())
+
+@cache
+def _bedrock_runtime() -> Any:
+    import boto3
+    return boto3.client('bedrock-runtime', region_name=settings.AWS_REGION)
+
+def embed(text: str) -> list[float]:
+    response: dict = _bedrock_runtime().invoke_model(
+        modelId=settings.SEMANTIC_CACHE_EMBEDDING_MODEL_ID,
+        body=json.dumps({'inputText': text, 'normalize': True})
+    )
+    return json.loads(response['body'].read())['embedding']
+
+def cosine_similarity(a: list[float], b: list[float]) -> float:
+    dot: float = sum(x * y for x, y in zip(a, b))
+    norm: float = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+@dataclass
+class CacheEntry:
+    text: str | None
+    vector: list[float] | None
+    content: list
+    latency: float
+    created_at: float = field(default_factory=monotonic)
+
+class SemanticCache:
+    """
+    Bounded LRU of tool results shared by every agent in the process. Entries are grouped by
+    tool and exact-match input, and within a group matched on the normalized text of the
+    semantic field first and on embedding similarity above the threshold otherwise.
+    """
+    def __init__(self, threshold: float, max_size: int, ttl: float, embed=embed) -> None:
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl = ttl
+        self.embed = embed
+
+        self._entries: OrderedDict[tuple[str, str, str | None], CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _group(self, tool_name: str, exact_key: str) -> list[tuple[tuple, CacheEntry]]:
+        now: float = monotonic()
+        for key in [key for key, entry in self._entries.items() if now - entry.created_at > self.ttl]:
+            del self._entries[key]
+
+        return [(key, entry) for key, entry in self._entries.items() if key[:2] == (tool_name, exact_key)]
+
+    def lookup(self, tool_name: str, exact_key: str, text: str | None) -> tuple[CacheEntry | None, list[float] | None]:
+        """
+        Returns the matching entry, if any, and the embedding computed for the lookup so that a
+        miss can be stored without embedding the text twice.
+        """
+        with self._lock:
+            group: list[tuple[tuple, CacheEntry]] = self._group(tool_name, exact_key)
+            if entry := self._entries.get((tool_name, exact_key, text)):
+                self._entries.move_to_end((tool_name, exact_key, text))
+                return entry, None
+
+        if text is None or not group:
+            return None, None
+
+        vector: list[float] = self.embed(text)
+        key, entry, similarity = max(
+            ((key, entry, cosine_similarity(vector, entry.vector)) for key, entry in group if entry.vector),
+            key=lambda match: match[2],
+            default=(None, None, 0.0)
+        )
+
+        if similarity < self.threshold:
+            return None, vector
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return entry, vector
+
+    def store(self, tool_name: str, exact_key: str, text: str | None, vector: list[float] | None, content: list, latency: float) -> None:
+        if text is not None and vector is None:
+            vector = self.embed(text)
+
+        with self._lock:
+            self._entries[(tool_name, exact_key, text)] = CacheEntry(text=text, vector=vector, content=content, latency=latency)
+            self._entries.move_to_end((tool_name, exact_key, text))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+semantic_cache = SemanticCache(
+    threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+    max_size=settings.SEMANTIC_CACHE_SIZE,
+    ttl=settings.SEMANTIC_CACHE_TTL
+)
+
+class CachedTool(AgentTool):
+    """
+    Wraps an agent tool to serve its results from the semantic cache. Calls whose input or
+    result may hold personal data bypass the cache entirely.
+    """
+    def __init__(self, tool: AgentTool, policy: CachePolicy, actor: Actor, cache: SemanticCache = semantic_cache) -> None:
+        super().__init__()
+        self.tool = tool
+        self.policy = policy
+        self.actor = actor
+        self.cache = cache
+
+    @property
+    def tool_name(self) -> str:
+        return self.tool.tool_name
+
+    @property
+    def tool_spec(self) -> ToolSpec:
+        return self.tool.tool_spec
+
+    @property
+    def tool_type(self) -> str:
+        return self.tool.tool_type
+
+    def _keys(self, tool_input: dict) -> tuple[str, str | None]:
+        exact: dict = {k: v for k, v in tool_input.items() if k != self.policy.semantic_field}
+        exact_key: str = json.dumps(exact, sort_keys=True, default=str)
+
+        if not self.policy.semantic_field:
+            return exact_key, None
+        return exact_key, normalize(str(tool_input.get(self.policy.semantic_field, '')))
+
+    async def stream(self, tool_use: ToolUse, invocation_state: dict[str, Any], **kwargs: Any) -> ToolGenerator:
+        tool_input: dict = tool_use.get('input') or {}
+        attributes: dict = {'tool.name': self.tool_name}
+
+        if contains_personal_data(json.dumps(tool_input, default=str), self.actor):
+            cache_requests.add(1, {**attributes, 'cache.result': 'bypass'})
+            async for event in self.tool.stream(tool_use, invocation_state, **kwargs):
+                yield event
+            return
+
+        exact_key, text = self._keys(tool_input)
+        vector: list[float] | None = None
+        try:
+            # Embedding the lookup text is a blocking Bedrock call
+            entry, vector = await asyncio.to_thread(self.cache.lookup, self.tool_name, exact_key, text)
+        except Exception as e:
+            logger.warning(f'Semantic cache lookup failed for {self.tool_name}: {e}')
+            entry = None
+
+        if entry:
+            cache_requests.add(1, {**attributes, 'cache.result': 'hit'})
+            cache_latency_saved.record(entry.latency, attributes)
+            cache_tokens_saved.record(estimate_tokens(entry.content), attributes)
+            yield ToolResultEvent({'toolUseId': tool_use['toolUseId'], 'status': 'success', 'content': entry.content})
+            return
+
+        cache_requests.add(1, {**attributes, 'cache.result': 'miss'})
+
+        start: float = perf_counter()
+        result: dict | None = None
+        async for event in self.tool.stream(tool_use, invocation_state, **kwargs):
+            if isinstance(event, ToolResultEvent):
+                result = event.tool_result
+            yield event
+
+        if not result or result.get('status') != 'success':
+            return
+        # Results hold URLs and identifiers of their own, so only the actor's details are checked
+        if mentions_actor(json.dumps(result.get('content', []), default=str), self.actor):
+            return
+
+        try:
+            await asyncio.to_thread(self.cache.store, self.tool_name, exact_key, text, vector, result['content'], perf_counter() - start)
+        except Exception as e:
+            logger.warning(f'Semantic cache store failed for {self.tool_name}: {e}')
+
+def wrap_cacheable_tools(tools: list, actor: Actor) -> list:
+    return [
+        CachedTool(tool, policy, actor) if isinstance(tool, AgentTool) and (policy := CACHEABLE_TOOLS.get(tool.tool_name)) else tool
+        for tool in tools
+    ]
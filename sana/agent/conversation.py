@@ -0,0 +1,87 @@
+from typing import Any
+import json
+import logging
+
+from strands import Agent
+from strands.agent.conversation_manager import SlidingWindowConversationManager
+from strands.types.content import Message, Messages
+
+from sana.core.telemetry import compaction_ratio
+
+logger = logging.getLogger(__name__)
+
+ELIDED_PREFIX: str = '[Elided tool output]'
+
+def estimate_tokens(messages: Messages) -> int:
+    # Claude tokenizers average about four characters per token on English text and JSON
+    return len(json.dumps(messages, default=str)) // 4
+
+def is_turn_start(message: Message) -> bool:
+    return message['role'] == 'user' and any('text' in block for block in message['content'])
+
+class CompactingConversationManager(SlidingWindowConversationManager):
+    """
+    Keeps the history replayed on every turn within a token budget. Once over budget, tool
+    results and long assistant messages outside the most recent turns are cut down to a short
+    excerpt, and if that is not enough the oldest turns are dropped. Context overflows fall
+    back to the sliding window.
+    """
+    def __init__(
+        self,
+        token_budget: int = 6000,
+        recent_turns: int = 3,
+        excerpt_chars: int = 300,
+        window_size: int = 40
+    ) -> None:
+        super().__init__(window_size=window_size, should_truncate_results=True)
+        self.token_budget = token_budget
+        self.recent_turns = recent_turns
+        self.excerpt_chars = excerpt_chars
+
+    def restore_from_session(self, state: dict[str, Any]) -> list[Message] | None:
+        # Sessions started before compaction was enabled were managed by the sliding window
+        if state.get('__name__') == SlidingWindowConversationManager.__name__:
+            state = {**state, '__name__': self.__class__.__name__}
+        return super().restore_from_session(state)
+
+    def apply_management(self, agent: Agent, **kwargs: Any) -> None:
+        messages: Messages = agent.messages
+        if (before := estimate_tokens(messages)) <= self.token_budget:
+            return
+
+        boundary: int = self._recent_boundary(messages)
+        self._elide(messages[:boundary])
+
+        while boundary > 0 and estimate_tokens(messages) > self.token_budget:
+            # Drop whole turns so that tool uses keep their results
+            if not (trim_index := next((i for i in range(1, boundary + 1) if is_turn_start(messages[i])), 0)):
+                break
+
+            messages[:] = messages[trim_index:]
+            self.removed_message_count += trim_index
+            boundary -= trim_index
+
+        after: int = estimate_tokens(messages)
+        compaction_ratio.record(after / before)
+        logger.info(f'Compacted conversation history from ~{before} to ~{after} tokens')
+
+    def _recent_boundary(self, messages: Messages) -> int:
+        turn_starts: list[int] = [i for i, message in enumerate(messages) if is_turn_start(message)]
+        return turn_starts[-self.recent_turns] if len(turn_starts) >= self.recent_turns else 0
+
+    def _excerpt(self, text: str) -> str:
+        return text if len(text) <= self.excerpt_chars else f'{text[:self.excerpt_chars]}...'
+
+    def _elide(self, messages: Messages) -> None:
+        for message in messages:
+            for block in message['content']:
+                if 'toolResult' in block:
+                    content: list = block['toolResult']['content']
+                    text: str = ' '.join(
+                        item['text'] if 'text' in item else json.dumps(item.get('json', ''), default=str)
+                        for item in content if 'text' in item or 'json' in item
+                    )
+                    if not text.startswith(ELIDED_PREFIX):
+                        block['toolResult']['content'] = [{'text': f'{ELIDED_PREFIX} {self._excerpt(text)}'}]
+                elif 'text' in block and message['role'] == 'assistant':
+                    block['text'] = self._excerpt(block['text'])
@@ -0,0 +1,136 @@
+from time import perf_counter
+from collections.abc import AsyncGenerator
+from typing import Any
+import asyncio
+import logging
+
+from strands import Agent
+from strands.hooks import AfterToolCallEvent
+from strands.telemetry.metrics import Trace
+from strands.tools.executors import ConcurrentToolExecutor
+from strands.tools.executors._executor import ToolExecutor
+from strands.types._events import ToolResultEvent, ToolStreamEvent, TypedEvent
+from strands.types.tools import ToolResult, ToolUse
+
+logger = logging.getLogger(__name__)
+
+# Key of the stream event sent as each tool finishes, tool results themselves never reach the agent stream
+TOOL_END: str = 'sana_tool_end'
+
+class BoundedToolExecutor(ConcurrentToolExecutor):
+    """
+    Runs the tools requested in a single model response concurrently, at most `max_concurrency`
+    at a time, so a multi-tool turn takes as long as its slowest tool. A tool that runs past its
+    timeout is abandoned and the model gets an error result for it, so the turn can go on. When
+    the turn itself is cancelled, the tools still in flight are cancelled with it.
+    """
+    def __init__(self, max_concurrency: int = 4, timeouts: dict[str, float] | None = None, default_timeout: float = 30.0) -> None:
+        self.max_concurrency = max_concurrency
+        self.timeouts = timeouts or {}
+        self.default_timeout = default_timeout
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tasks: set[asyncio.Task] = set()
+
+    def timeout(self, tool_name: str) -> float:
+        return self.timeouts.get(tool_name, self.default_timeout)
+
+    async def _execute(
+        self,
+        agent: Agent,
+        tool_uses: list[ToolUse],
+        tool_results: list[ToolResult],
+        cycle_trace: Trace,
+        cycle_span: Any,
+        invocation_state: dict[str, Any],
+    ) -> AsyncGenerator[TypedEvent, None]:
+        try:
+            async for event in super()._execute(agent, tool_uses, tool_results, cycle_trace, cycle_span, invocation_state):
+                yield event
+        finally:
+            # The base executor leaves its tool tasks running if the turn is cancelled while waiting on them
+            for task in self._tasks:
+                task.cancel()
+
+    async def _report_end(
+        self,
+        tool_use: ToolUse,
+        status: str,
+        started: float,
+        task_id: int,
+        task_queue: asyncio.Queue,
+        task_event: asyncio.Event
+    ) -> None:
+        task_queue.put_nowait((task_id, ToolStreamEvent(tool_use, {TOOL_END: {'status': status, 'duration': perf_counter() - started}})))
+        await task_event.wait()
+        task_event.clear()
+
+    async def _task(
+        self,
+        agent: Agent,
+        tool_use: ToolUse,
+        tool_results: list[ToolResult],
+        cycle_trace: Trace,
+        cycle_span: Any,
+        invocation_state: dict[str, Any],
+        task_id: int,
+        task_queue: asyncio.Queue,
+        task_event: asyncio.Event,
+        stop_event: object,
+    ) -> None:
+        timeout: float = self.timeout(tool_use['name'])
+        self._tasks.add(task := asyncio.current_task())
+
+        try:
+            async with self._semaphore:
+                started: float = perf_counter()
+                async with asyncio.timeout(timeout) as deadline:
+                    events = ToolExecutor._stream_with_trace(
+                        agent, tool_use, tool_results, cycle_trace, cycle_span, invocation_state
+                    )
+                    async for event in events:
+                        if isinstance(event, ToolResultEvent):
+                            # The tool is done, waiting on the agent stream does not count against it
+                            deadline.reschedule(None)
+                            await self._report_end(tool_use, event.tool_result['status'], started, task_id, task_queue, task_event)
+                        task_queue.put_nowait((task_id, event))
+                        await task_event.wait()
+                        task_event.clear()
+
+        except TimeoutError as e:
+            logger.warning(f'Tool {tool_use["name"]} timed out after {timeout} seconds')
+            result: ToolResult = {
+                'toolUseId': tool_use['toolUseId'],
+                'status': 'error',
+                'content': [{'text': f'The tool did not respond within {timeout:.0f} seconds, it may be retried later.'}]
+            }
+
+            # The timed out tool never reached its own after hooks, so its telemetry would be left open
+            agent.hooks.invoke_callbacks(AfterToolCallEvent(
+                agent=agent,
+                selected_tool=None,
+                tool_use=tool_use,
+                invocation_state=invocation_state,
+                result=result,
+                exception=e
+            ))
+
+            tool_results.append(result)
+            await self._report_end(tool_use, 'timeout', started, task_id, task_queue, task_event)
+            task_queue.put_nowait((task_id, ToolResultEvent(result)))
+
+        except asyncio.CancelledError:
+            # Same for a tool cancelled with its turn, the interrupted turn is closed in the history by the agent
+            agent.hooks.invoke_callbacks(AfterToolCallEvent(
+                agent=agent,
+                selected_tool=None,
+                tool_use=tool_use,
+                invocation_state=invocation_state,
+                result={'toolUseId': tool_use['toolUseId'], 'status': 'error', 'content': []},
+                cancel_message='The turn was cancelled'
+            ))
+            raise
+
+        finally:
+            self._tasks.discard(task)
+            task_queue.put_nowait((task_id, stop_event))
@@ -0,0 +1,39 @@
+from time import perf_counter
+from typing import Any
+
+from opentelemetry.trace import Span, Status, StatusCode
+
+from strands.hooks import HookProvider, HookRegistry, BeforeToolCallEvent, AfterToolCallEvent
+
+from sana.core.telemetry import tool_duration, tracer
+
+class ToolTelemetryHooks(HookProvider):
+    def __init__(self) -> None:
+        self._tool_calls: dict[str, tuple[Span, float]] = {}
+
+    def register_hooks(self, registry: HookRegistry, **kwargs: Any) -> None:
+        registry.add_callback(BeforeToolCallEvent, self.on_tool_start)
+        registry.add_callback(AfterToolCallEvent, self.on_tool_end)
+
+    def on_tool_start(self, event: BeforeToolCallEvent) -> None:
+        tool_name: str = event.tool_use['name']
+        span = tracer.start_span(f'sana.tool {tool_name}', attributes={'tool.name': tool_name})
+        self._tool_calls[event.tool_use['toolUseId']] = (span, perf_counter())
+
+    def on_tool_end(self, event: AfterToolCallEvent) -> None:
+        if not (tool_call := self._tool_calls.pop(event.tool_use['toolUseId'], None)):
+            return
+
+        span, start = tool_call
+        status: str = 'error' if event.exception or event.result.get('status') == 'error' else 'success'
+        if isinstance(event.exception, TimeoutError):
+            status = 'timeout'
+        elif event.cancel_message:
+            status = 'cancelled'
+
+        if event.exception:
+            span.record_exception(event.exception)
+        span.set_status(Status(StatusCode.OK if status == 'success' else StatusCode.ERROR))
+        span.end()
+
+        tool_duration.record(perf_counter() - start, {'tool.name': event.tool_use['name'], 'tool.status': status})
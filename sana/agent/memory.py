@@ -0,0 +1,184 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, lru_cache
+from time import perf_counter, sleep
+from typing import Any, Literal
+import copy
+import logging
+import threading
+
+from strands import Agent
+from strands.hooks import AfterInvocationEvent, HookRegistry
+from strands.session import SessionManager
+from strands.types.content import Message
+
+from sana.core.config import settings
+from sana.core.telemetry import memory_flush_duration, memory_retrieval_duration, memory_write_failures, timed
+
+logger = logging.getLogger(__name__)
+
+# Summaries are ranked against a fixed query, there is no user message yet when the agent is built
+SUMMARY_QUERY: str = 'Summary of previous conversations with the user'
+
+@cache
+def _memory_data_plane() -> Any:
+    # MemoryClient.retrieve_memories logs and swallows client errors, which would cache a failed retrieval
+    import boto3
+    return boto3.client('bedrock-agentcore', region_name=settings.AWS_REGION)
+
+def _record_text(record: dict) -> str:
+    content: Any = record.get('content', {})
+    return content.get('text', '').strip() if isinstance(content, dict) else ''
+
+@lru_cache(maxsize=settings.AGENT_CACHE_SIZE)
+def retrieve_memory_context(actor_id: str, session_id: str) -> str | None:
+    """
+    Retrieves the summaries of the actor's previous sessions once per session, as a compact
+    section for the system prompt. Errors propagate instead of being cached, so a failed
+    retrieval is retried on the next agent built for the session, while an actor without
+    previous sessions is only looked up once.
+    """
+    namespace: str = settings.AWS_BEDROCK_AGENTCORE_MEMORY_NAMESPACE.format(actorId=actor_id)
+
+    with timed('sana.memory.retrieve', memory_retrieval_duration, namespace=namespace.replace(actor_id, '{actorId}')):
+        response: dict = _memory_data_plane().retrieve_memory_records(
+            memoryId=settings.AWS_BEDROCK_AGENTCORE_MEMORY_ID,
+            namespace=namespace,
+            searchCriteria={'searchQuery': SUMMARY_QUERY, 'topK': settings.AWS_BEDROCK_AGENTCORE_MEMORY_TOP_K}
+        )
+
+    records: list[dict] = response.get('memoryRecordSummaries', [])
+    summaries: list[str] = [text for record in records if (text := _record_text(record))]
+    if not summaries:
+        return None
+
+    # Share the character budget between the summaries, most relevant first
+    limit: int = settings.AWS_BEDROCK_AGENTCORE_MEMORY_CONTEXT_CHARS // len(summaries)
+    lines: list[str] = [summary if len(summary) <= limit else f'{summary[:limit]}...' for summary in summaries]
+
+    logger.info(f'Retrieved {len(summaries)} previous session summaries for session {session_id}')
+    return 'Here are summaries of previous sessions with the user:\n' + '\n'.join(f'- {line}' for line in lines)
+
+Write = tuple[Literal['append', 'redact'], Message] | tuple[Literal['sync'], None]
+
+# Memory writes run on their own threads, so slow flushes never hold up agent initialization
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='sana-memory')
+
+_managers: dict[str, 'WriteBehindSessionManager'] = {}
+_managers_lock = threading.Lock()
+
+class WriteBehindSessionManager(SessionManager):
+    """
+    Wraps a session manager so that message and agent state writes are buffered instead of
+    persisted as they happen. Buffered writes are flushed in order on a background thread at
+    the end of each turn, or earlier once a batch fills up, and retried with backoff. Agent
+    state syncs are coalesced into one per flush.
+    """
+    def __init__(self, session_manager: SessionManager, session_id: str, batch_size: int = 8, retries: int = 3) -> None:
+        self.session_manager = session_manager
+        self.session_id = session_id
+        self.batch_size = batch_size
+        self.retries = retries
+
+        self._agent: Agent | None = None
+        self._pending: list[Write] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+        # A previous agent for the session may still be writing, restore only after it is done
+        with _managers_lock:
+            previous: WriteBehindSessionManager | None = _managers.get(session_id)
+            _managers[session_id] = self
+        if previous:
+            previous.flush()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def register_hooks(self, registry: HookRegistry, **kwargs: Any) -> None:
+        super().register_hooks(registry, **kwargs)
+        registry.add_callback(AfterInvocationEvent, lambda event: self.schedule_flush())
+
+    def initialize(self, agent: Agent, **kwargs: Any) -> None:
+        # The history has to be restored before the first turn
+        self._agent = agent
+        self.session_manager.initialize(agent, **kwargs)
+
+    def append_message(self, message: Message, agent: Agent, **kwargs: Any) -> None:
+        self._buffer(('append', copy.deepcopy(message)))
+
+    def redact_latest_message(self, redact_message: Message, agent: Agent, **kwargs: Any) -> None:
+        self._buffer(('redact', copy.deepcopy(redact_message)))
+
+    def sync_agent(self, agent: Agent, **kwargs: Any) -> None:
+        with self._lock:
+            if ('sync', None) not in self._pending:
+                self._pending.append(('sync', None))
+
+    def _buffer(self, write: Write) -> None:
+        with self._lock:
+            self._pending.append(write)
+            full: bool = len(self._pending) >= self.batch_size
+
+        if full:
+            self.schedule_flush()
+
+    def schedule_flush(self) -> None:
+        _executor.submit(self.flush)
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            with self._lock:
+                batch: list[Write] = self._pending
+                self._pending = []
+
+            if not batch or not self._agent:
+                return
+
+            start: float = perf_counter()
+            for index, write in enumerate(batch):
+                if not self._write(write):
+                    # Keep the failed write and everything after it in order for the next flush
+                    with self._lock:
+                        self._pending[:0] = batch[index:]
+                    memory_write_failures.add(1, {'write.type': write[0]})
+                    break
+
+            memory_flush_duration.record(perf_counter() - start, {'batch.size': len(batch)})
+
+        # Only sessions with writes in flight need to be found by the next agent or on shutdown
+        with _managers_lock, self._lock:
+            if not self._pending and _managers.get(self.session_id) is self:
+                del _managers[self.session_id]
+
+    def _write(self, write: Write) -> bool:
+        kind, message = write
+
+        for attempt in range(self.retries + 1):
+            try:
+                match kind:
+                    case 'append':
+                        self.session_manager.append_message(message, self._agent)
+                    case 'redact':
+                        self.session_manager.redact_latest_message(message, self._agent)
+                    case 'sync':
+                        self.session_manager.sync_agent(self._agent)
+                return True
+            except Exception as e:
+                logger.warning(f'Memory {kind} write failed for session {self.session_id} (attempt {attempt + 1}): {e}')
+                if attempt < self.retries:
+                    sleep(0.2 * 2 ** attempt)
+
+        logger.error(f'Giving up on memory {kind} write for session {self.session_id} until the next flush')
+        return False
+
+def flush_pending_writes() -> None:
+    with _managers_lock:
+        managers: list[WriteBehindSessionManager] = list(_managers.values())
+
+    for manager in managers:
+        manager.flush()
+        if manager.pending:
+            logger.error(f'Dropping {manager.pending} memory writes for session {manager.session_id} on shutdown')
+
+    _executor.shutdown(wait=True)
@@ -0,0 +1,155 @@
+from collections.abc import AsyncGenerator, AsyncIterable
+from time import perf_counter
+from typing import Any, Literal
+import logging
+
+from strands.models import BedrockModel, Model
+from strands.types.content import Messages
+from strands.types.streaming import StreamEvent
+from strands.types.tools import ToolChoice, ToolSpec
+
+from sana.core.telemetry import model_cost, model_duration
+
+from sana.agent.tools.crisis import detect_risk
+
+logger = logging.getLogger(__name__)
+
+Route = Literal['primary', 'fast']
+
+# USD per million input, output, cache read and cache write tokens
+MODEL_PRICES: dict[str, tuple[float, float, float, float]] = {
+    'claude-sonnet-4': (3.0, 15.0, 0.3, 3.75),
+    'claude-haiku-4-5': (1.0, 5.0, 0.1, 1.25)
+}
+
+# Helpline lookups handle possible crises, so following up on them always takes the primary model
+PRIMARY_TOOLS: frozenset[str] = frozenset((
+    'search_helplines',
+    'get_helpline_catalogues',
+    'throughline-rest-api___getCountries',
+    'throughline-rest-api___getTopics',
+    'throughline-rest-api___getHelplines'
+))
+
+class SanaBedrockModel(BedrockModel):
+    """
+    Bedrock model that appends the per-actor context to the system prompt after its cache
+    point, so the cached prefix of tool specs and system prompt is identical for every actor.
+    """
+    def __init__(self, *, user_context: str | None = None, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.user_context = user_context
+
+    def format_request(
+        self,
+        messages: Messages,
+        tool_specs: list[ToolSpec] | None = None,
+        system_prompt: str | None = None,
+        tool_choice: ToolChoice | None = None,
+    ) -> dict[str, Any]:
+        request: dict[str, Any] = super().format_request(messages, tool_specs, system_prompt, tool_choice)
+
+        if self.user_context:
+            request['system'].append({'text': self.user_context})
+
+        return request
+
+def estimate_cost(model_id: str, usage: dict[str, int]) -> float | None:
+    if not (prices := next((p for name, p in MODEL_PRICES.items() if name in model_id), None)):
+        return None
+
+    input_price, output_price, cache_read_price, cache_write_price = prices
+    return (
+        usage.get('inputTokens', 0) * input_price
+        + usage.get('outputTokens', 0) * output_price
+        + usage.get('cacheReadInputTokens', 0) * cache_read_price
+        + usage.get('cacheWriteInputTokens', 0) * cache_write_price
+    ) / 1_000_000
+
+def select_route(messages: Messages, max_fast_chars: int) -> Route:
+    """
+    Picks the model for the next call from the conversation so far. Opening turns, long or
+    risky user messages, failed tools and helpline lookups go to the primary model. Short
+    screening answers and presenting successful tool output go to the fast model.
+    """
+    if not messages or messages[-1]['role'] != 'user':
+        return 'primary'
+
+    content: list = messages[-1]['content']
+
+    if tool_results := [block['toolResult'] for block in content if 'toolResult' in block]:
+        if any(result.get('status') == 'error' for result in tool_results):
+            return 'primary'
+
+        previous: list = messages[-2]['content'] if len(messages) > 1 else []
+        tool_names: set[str] = {block['toolUse']['name'] for block in previous if 'toolUse' in block}
+        return 'primary' if tool_names & PRIMARY_TOOLS else 'fast'
+
+    user_turns: int = sum(
+        1 for message in messages
+        if message['role'] == 'user' and any('text' in block for block in message['content'])
+    )
+    if user_turns <= 1:
+        return 'primary'
+
+    text: str = ' '.join(block['text'] for block in content if 'text' in block).lower()
+    if len(text) > max_fast_chars or detect_risk(text):
+        return 'primary'
+
+    return 'fast'
+
+class RoutedModel(Model):
+    """
+    Routes every model call to the primary or the fast model. Both see the same messages, so
+    the agent keeps a single conversation history whichever model answers. Without a fast
+    model every call goes to the primary one, still reporting its latency and cost.
+    """
+    def __init__(self, primary: Model, fast: Model | None = None, max_fast_chars: int = 200) -> None:
+        self.primary = primary
+        self.fast = fast
+        self.max_fast_chars = max_fast_chars
+
+    @property
+    def config(self) -> Any:
+        return self.primary.get_config()
+
+    def update_config(self, **model_config: Any) -> None:
+        self.primary.update_config(**model_config)
+
+    def set_user_context(self, user_context: str) -> None:
+        for model in (self.primary, self.fast):
+            if isinstance(model, SanaBedrockModel):
+                model.user_context = user_context
+
+    def get_config(self) -> Any:
+        return self.primary.get_config()
+
+    def structured_output(self, output_model: Any, prompt: Messages, system_prompt: str | None = None, **kwargs: Any) -> AsyncGenerator:
+        return self.primary.structured_output(output_model, prompt, system_prompt=system_prompt, **kwargs)
+
+    async def stream(
+        self,
+        messages: Messages,
+        tool_specs: list[ToolSpec] | None = None,
+        system_prompt: str | None = None,
+        *,
+        tool_choice: ToolChoice | None = None,
+        **kwargs: Any
+    ) -> AsyncIterable[StreamEvent]:
+        route: Route = select_route(messages, self.max_fast_chars) if self.fast else 'primary'
+        model: Model = self.fast if route == 'fast' else self.primary
+        model_id: str = model.get_config().get('model_id', 'unknown')
+        attributes: dict = {'model.route': route, 'model.id': model_id}
+
+        start: float = perf_counter()
+        usage: dict[str, int] = {}
+        try:
+            async for event in model.stream(messages, tool_specs, system_prompt, tool_choice=tool_choice, **kwargs):
+                if 'metadata' in event:
+                    usage = event['metadata'].get('usage', {})
+                yield event
+        finally:
+            model_duration.record(perf_counter() - start, attributes)
+            if usage and (cost := estimate_cost(model_id, usage)) is not None:
+                model_cost.add(cost, attributes)
+            logger.debug(f'Model call routed to {route} ({model_id}) in {perf_counter() - start:.2f}s')
@@ -2,10 +2,28 @@ tool_map: dict = {
     'throughline-rest-api___getCountries': 'Retrieving available helpline countries...',
     'throughline-rest-api___getTopics': 'Retrieving available helpline topics...',
     'throughline-rest-api___getHelplines': 'Retrieving relevant helplines...',
+    'search_helplines': 'Retrieving relevant helplines...',
+    'get_helpline_catalogues': 'Retrieving available helpline countries and topics...',
     'resource-function___search-resources': 'Searching for mental health resources...',
     'search_therapists': 'Searching for therapists...',
     'current_time': 'Retrieving current date...',
     'create_calendar_event': 'Scheduling your appointment...',
     'get_busy_timeslots': 'Retrieving busy time slots...',
+    'get_availability': 'Checking your availability...',
+    'find_free_slots': 'Looking for free time slots...',
     'create_markdown_table': 'Formatting data into a table...',
-}
\ No newline at end of file
+}
+# Seconds each tool may run before the model gets a timeout error instead of its result,
+# tools that are not listed use TOOL_TIMEOUT
+tool_timeouts: dict[str, float] = {
+    'search_helplines': 15.0,
+    'get_helpline_catalogues': 15.0,
+    'resource-function___search-resources': 20.0,
+    'search_therapists': 180.0,
+    'current_time': 5.0,
+    'create_calendar_event': 20.0,
+    'get_busy_timeslots': 20.0,
+    'get_availability': 20.0,
+    'find_free_slots': 10.0,
+    'create_markdown_table': 5.0,
+}
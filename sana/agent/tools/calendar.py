@@ -1,34 +1,209 @@
 from typing import Any
+from datetime import datetime, time, timedelta
+from functools import cache
+from zoneinfo import ZoneInfo
+import asyncio
+import json
+
 from strands.tools import tool
 
+from google.auth.exceptions import RefreshError
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest, build_http
+
+from pydantic import BaseModel
 
 from sana.core.auth import get_google_token, GOOGLE_SCOPES
 from sana.core.context import SanaContext
 
+Interval = tuple[datetime, datetime]
+
+SLOT_ALIGNMENT_MINUTES: int = 15
+
+class TimeWindow(BaseModel):
+    start: str
+    end: str
+
+@cache
+def get_calendar_service() -> Any:
+    # Build the service from the discovery document bundled with the client library,
+    # credentials are attached per request so a single service is shared by every user
+    document: dict = json.loads(get_static_doc('calendar', 'v3'))
+    return build_from_document(document, http=build_http())
+
+def parse_time(value: str, timezone: str = 'UTC') -> datetime:
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=ZoneInfo(timezone))
+    return parsed
+
+def merge_intervals(intervals: list[Interval]) -> list[Interval]:
+    merged: list[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def subtract_intervals(window: Interval, busy: list[Interval]) -> list[Interval]:
+    # Busy intervals must be merged and sorted
+    window_start, window_end = window
+    free: list[Interval] = []
+    cursor: datetime = window_start
+
+    for busy_start, busy_end in busy:
+        if busy_end <= cursor:
+            continue
+        if busy_start >= window_end:
+            break
+        if busy_start > cursor:
+            free.append((cursor, busy_start))
+        cursor = busy_end
+
+    if cursor < window_end:
+        free.append((cursor, window_end))
+
+    return free
+
+def working_hours(
+    window: Interval,
+    timezone: str,
+    start_hour: int,
+    end_hour: int,
+    include_weekends: bool = False
+) -> list[Interval]:
+    tz = ZoneInfo(timezone)
+    window_start, window_end = window
+    day = window_start.astimezone(tz).date()
+    last_day = window_end.astimezone(tz).date()
+
+    intervals: list[Interval] = []
+    while day <= last_day:
+        if include_weekends or day.weekday() < 5:
+            # Same-zone arithmetic is wall-clock based, so DST changes are respected
+            midnight = datetime.combine(day, time(0), tzinfo=tz)
+            day_start = max(midnight + timedelta(hours=start_hour), window_start)
+            day_end = min(midnight + timedelta(hours=end_hour), window_end)
+            if day_start < day_end:
+                intervals.append((day_start, day_end))
+        day += timedelta(days=1)
+
+    return intervals
+
+def align_time(value: datetime) -> datetime:
+    # Round up to the next wall-clock slot boundary (e.g. 10:07 -> 10:15)
+    truncated = value.replace(minute=value.minute - value.minute % SLOT_ALIGNMENT_MINUTES, second=0, microsecond=0)
+    return value if truncated == value else truncated + timedelta(minutes=SLOT_ALIGNMENT_MINUTES)
+
+def candidate_slots(free: list[Interval], duration: timedelta, limit: int) -> list[Interval]:
+    slots: list[Interval] = []
+    for free_start, free_end in free:
+        slot_start = align_time(free_start)
+        while slot_start + duration <= free_end:
+            slots.append((slot_start, slot_start + duration))
+            if len(slots) >= limit:
+                return slots
+            slot_start += duration
+    return slots
+
+def format_intervals(intervals: list[Interval], timezone: str = 'UTC') -> list[dict]:
+    tz = ZoneInfo(timezone)
+    return [
+        {'start': start.astimezone(tz).isoformat(), 'end': end.astimezone(tz).isoformat()}
+        for start, end in intervals
+    ]
+
 class GoogleCalendarTools():
-    def __init__(self) -> None:
+    def __init__(self, session_id: str, timezone: str = 'UTC') -> None:
+        self.session_id = session_id
+        self.timezone = timezone
         self.credentials: Credentials | None = None
         self.calendar: Any = None
 
     @property
     def tools(self) -> list:
-        return [self.create_calendar_event, self.get_busy_timeslots]
-    
-    def _authenticate(self) -> None:
-        if not (access_token := SanaContext.get_google_token()):
+        return [
+            self.create_calendar_event,
+            self.get_busy_timeslots,
+            self.get_availability,
+            self.find_free_slots
+        ]
+
+    def _authenticate(self) -> str | None:
+        if not (access_token := SanaContext.get_google_token(self.session_id)):
             try:
                 access_token: str = get_google_token()
                 if not access_token:
                     raise Exception('get_google_token could not retrieve a token')
-                SanaContext.set_google_token(access_token)
+                SanaContext.set_google_token(self.session_id, access_token)
             except Exception as e:
                 return f'Could not authenticate with Google: {e}'
 
+        if self.credentials and self.credentials.token == access_token:
+            return None
+
         self.credentials = Credentials(token=access_token, scopes=GOOGLE_SCOPES)
-        self.calendar = build('calendar', 'v3', credentials=self.credentials)
+        self.calendar = get_calendar_service()
+        return None
+
+    async def _ensure_authenticated(self) -> str | None:
+        # Credentials built from a token that has since been replaced are rebuilt with the new one
+        if self.calendar and self.credentials and self.credentials.token == SanaContext.get_google_token(self.session_id):
+            return None
+        return await asyncio.to_thread(self._authenticate)
+
+    async def _send(self, request: HttpRequest) -> Any:
+        # httplib2 is not thread-safe, so each request gets its own connection
+        http = AuthorizedHttp(self.credentials, http=build_http())
+        return await asyncio.to_thread(request.execute, http=http)
+
+    async def _execute(self, request: HttpRequest) -> Any:
+        try:
+            return await self._send(request)
+        except (HttpError, RefreshError) as e:
+            # Access tokens come without a refresh token, so an expired one surfaces as a failed refresh
+            if isinstance(e, HttpError) and e.resp.status != 401:
+                raise
+
+            SanaContext.clear_google_token(self.session_id)
+            if await asyncio.to_thread(self._authenticate):
+                raise
+            return await self._send(request)
+
+    async def _query_busy(
+        self,
+        calendars: list[str],
+        from_time: str,
+        to_time: str,
+        timezone: str
+    ) -> tuple[dict[str, list[Interval]], dict[str, Any]]:
+        body: dict = {
+            'timeMin': from_time,
+            'timeMax': to_time,
+            'timeZone': timezone,
+            'items': [{'id': calendar_id} for calendar_id in calendars]
+        }
+
+        freebusy = await self._execute(self.calendar.freebusy().query(body=body))
+
+        busy: dict[str, list[Interval]] = {}
+        errors: dict[str, Any] = {}
+        for calendar_id, calendar in freebusy.get('calendars', {}).items():
+            if calendar.get('errors'):
+                errors[calendar_id] = calendar['errors']
+                continue
+
+            busy[calendar_id] = [
+                (parse_time(slot['start'], timezone), parse_time(slot['end'], timezone))
+                for slot in calendar.get('busy', [])
+            ]
+
+        return busy, errors
 
     @tool
     async def create_calendar_event(
@@ -38,7 +213,7 @@ class GoogleCalendarTools():
         start_time: str,
         end_time: str,
         timezone: str = 'UTC',
-    ) -> None:
+    ) -> str:
         """
         Args:
             summary (str): The summary or title of the event.
@@ -48,9 +223,9 @@ class GoogleCalendarTools():
             timezone (str): The timezone for the event (default is 'UTC').
         """
 
-        if not self.calendar or not self.credentials:
-            self._authenticate()
-            
+        if (error := await self._ensure_authenticated()):
+            return error
+
         event = {
             'summary': summary,
             'description': description,
@@ -65,18 +240,18 @@ class GoogleCalendarTools():
         }
 
         try:
-            created_event = self.calendar.events().insert(calendarId='primary', body=event).execute()
+            created_event = await self._execute(self.calendar.events().insert(calendarId='primary', body=event))
             return f'Event created with id {created_event.get("id")} and link {created_event.get("htmlLink")}'
         except HttpError as e:
             return f'An error occurred: {e}'
-        
+
     @tool
-    def get_busy_timeslots(
+    async def get_busy_timeslots(
         self,
         from_time: str,
         to_time: str,
         timezone: str = 'UTC',
-    ) -> list[dict]:
+    ) -> list[dict] | str:
         """
         Returns a list of busy time slots in the user's primary calendar between from_time and to_time.
 
@@ -86,9 +261,9 @@ class GoogleCalendarTools():
             timezone (str): The timezone for the query (default is 'UTC').
         """
 
-        if not self.calendar or not self.credentials:
-            self._authenticate()
-            
+        if (error := await self._ensure_authenticated()):
+            return error
+
         try:
             body: dict = {
                 "timeMin": from_time,
@@ -97,7 +272,140 @@ class GoogleCalendarTools():
                 "items": [{"id": 'primary'}]
             }
 
-            freebusy = self.calendar.freebusy().query(body=body).execute()
+            freebusy = await self._execute(self.calendar.freebusy().query(body=body))
             return freebusy['calendars']['primary']['busy']
         except HttpError as e:
             return f'An error occurred: {e}'
+
+    @tool
+    async def get_availability(
+        self,
+        windows: list[TimeWindow],
+        calendars: list[str] | None = None,
+        timezone: str = 'UTC',
+    ) -> dict | str:
+        """
+        Returns the free time slots across one or more of the user's calendars for one or more time windows.
+        Use this tool instead of calling get_busy_timeslots several times, all windows are checked in a single query.
+
+        Args:
+            windows (list[TimeWindow]): The time windows to check, each with a start and end time in RFC3339 format
+                                        (e.g., {'start': '2023-10-01T09:00:00Z', 'end': '2023-10-01T17:00:00Z'}).
+            calendars (list[str] | None): The calendar identifiers to check. Defaults to the user's primary calendar.
+            timezone (str): The timezone for the query and the returned slots (default is 'UTC').
+        Returns:
+            A dictionary containing:
+            - windows (list[dict]): Each requested window with its list of free slots.
+            - errors (dict): Calendars that could not be queried, if any.
+        """
+
+        if not windows:
+            return 'At least one time window is required.'
+
+        if (error := await self._ensure_authenticated()):
+            return error
+
+        # Strands validates the input and dumps it back, so the windows arrive as plain dictionaries
+        windows = [TimeWindow.model_validate(window) for window in windows]
+
+        calendars = calendars or ['primary']
+        intervals: list[Interval] = [
+            (parse_time(window.start, timezone), parse_time(window.end, timezone))
+            for window in windows
+        ]
+
+        try:
+            busy, errors = await self._query_busy(
+                calendars=calendars,
+                from_time=min(start for start, _ in intervals).isoformat(),
+                to_time=max(end for _, end in intervals).isoformat(),
+                timezone=timezone
+            )
+        except HttpError as e:
+            return f'An error occurred: {e}'
+
+        merged_busy: list[Interval] = merge_intervals([
+            interval for calendar_busy in busy.values() for interval in calendar_busy
+        ])
+
+        return {
+            'windows': [
+                {
+                    'start': window.start,
+                    'end': window.end,
+                    'free': format_intervals(subtract_intervals(interval, merged_busy), timezone)
+                }
+                for window, interval in zip(windows, intervals)
+            ],
+            'errors': errors
+        }
+
+    @tool
+    async def find_free_slots(
+        self,
+        from_time: str,
+        to_time: str,
+        duration_minutes: int = 60,
+        working_hours_start: int = 9,
+        working_hours_end: int = 18,
+        include_weekends: bool = False,
+        limit: int = 5,
+    ) -> list[dict] | str:
+        """
+        Returns the earliest free time slots of the given duration in the user's primary calendar.
+        Slots are restricted to working hours in the user's timezone.
+        Use this tool to propose appointment times or to check that the user is free at a given time,
+        instead of reasoning over the busy time slots.
+
+        Args:
+            from_time (str): The start of the search range in RFC3339 format (e.g., '2023-10-01T00:00:00Z').
+            to_time (str): The end of the search range in RFC3339 format (e.g., '2023-10-07T00:00:00Z').
+            duration_minutes (int): The duration of the appointment in minutes. Default is 60.
+            working_hours_start (int): The hour of the day when working hours start, from 0 to 23. Default is 9.
+            working_hours_end (int): The hour of the day when working hours end, from 1 to 24. Default is 18.
+            include_weekends (bool): Whether to include Saturdays and Sundays. Default is False.
+            limit (int): Maximum number of slots to return. Default is 5.
+        Returns:
+            A list of free slots sorted by start time, each containing:
+            - start (str): The start time of the slot in the user's timezone.
+            - end (str): The end time of the slot in the user's timezone.
+        """
+
+        if duration_minutes <= 0 or limit <= 0:
+            return 'The duration and limit must be positive.'
+
+        if not 0 <= working_hours_start < working_hours_end <= 24:
+            return 'Working hours must be between 0 and 24, with the start before the end.'
+
+        if (error := await self._ensure_authenticated()):
+            return error
+
+        window: Interval = (parse_time(from_time, self.timezone), parse_time(to_time, self.timezone))
+
+        try:
+            busy, errors = await self._query_busy(
+                calendars=['primary'],
+                from_time=window[0].isoformat(),
+                to_time=window[1].isoformat(),
+                timezone=self.timezone
+            )
+        except HttpError as e:
+            return f'An error occurred: {e}'
+
+        if errors:
+            return f'An error occurred: {errors}'
+
+        merged_busy: list[Interval] = merge_intervals(busy.get('primary', []))
+
+        free: list[Interval] = []
+        for interval in working_hours(
+            window,
+            timezone=self.timezone,
+            start_hour=working_hours_start,
+            end_hour=working_hours_end,
+            include_weekends=include_weekends
+        ):
+            free.extend(subtract_intervals(interval, merged_busy))
+
+        slots = candidate_slots(free, duration=timedelta(minutes=duration_minutes), limit=limit)
+        return format_intervals(slots, self.timezone)
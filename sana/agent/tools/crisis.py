@@ -0,0 +1,146 @@
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any
+import asyncio
+import logging
+import re
+
+from sana.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Whole words or phrases only, so that "substance abuse resources" or "an emergency room question"
+# are not mistaken for a crisis. Abuse and emergencies only count when they happen to the user.
+RISK_PHRASES: tuple[str, ...] = (
+    r'suicid\w*', r'kill(?:ing)? myself', r'end(?:ing)? (?:my life|it all)', r'self[- ]?harm\w*',
+    r'hurt(?:ing)? myself', r'overdos\w*', r'(?:want|wanted|going) to die', r'better off dead',
+    r'no reason to live', r'(?:abus\w*|hit\w*|hurt\w*|beat\w*) me', r'being (?:abused|hurt|beaten)',
+    r'(?:this|it) is an emergency', r"i'?m having an emergency"
+)
+RISK_PATTERN: re.Pattern = re.compile(rf'\b(?:{"|".join(RISK_PHRASES)})\b', re.IGNORECASE)
+
+# Topic used to pick the crisis helplines of each country from ThroughLine
+CRISIS_TOPIC: str = 'suicidal thoughts'
+
+# Helpline directory run by ThroughLine, covering the countries the API does not
+FALLBACK_DIRECTORY: str = 'https://findahelpline.com'
+
+def detect_risk(text: str) -> bool:
+    return bool(RISK_PATTERN.search(text.replace('\u2019', "'")))
+
+# ThroughLine helpline fields, in the order they are offered, and how each one is introduced
+CONTACT_FIELDS: tuple[tuple[str, str], ...] = (
+    ('phoneNumber', 'call'),
+    ('smsNumber', 'text'),
+    ('webChatUrl', 'chat online at'),
+    ('whatsappUrl', 'message on WhatsApp at'),
+    ('website', 'visit')
+)
+
+@dataclass
+class Helpline:
+    name: str
+    # Contact method, from CONTACT_FIELDS, to number or link
+    contacts: dict[str, str]
+
+    @property
+    def contact(self) -> str:
+        methods: list[str] = [f'{verb} {self.contacts[key]}' for key, verb in CONTACT_FIELDS if key in self.contacts]
+        return ' or '.join(methods[:2])
+
+@dataclass
+class CrisisContacts:
+    emergency_number: str
+    helplines: list[Helpline] = field(default_factory=list)
+
+    @property
+    def methods(self) -> set[str]:
+        return {key for helpline in self.helplines for key in helpline.contacts}
+
+    def to_markdown(self) -> str:
+        lines: list[str] = [f'> If you are in immediate danger, please call **{self.emergency_number}** now.']
+        lines.extend(f'> You can also reach **{helpline.name}** at any time: {helpline.contact}' for helpline in self.helplines)
+        lines.append(f'> For more helplines near you, visit [{FALLBACK_DIRECTORY.removeprefix("https://")}]({FALLBACK_DIRECTORY}).')
+        return '\n'.join(lines)
+
+# Baseline contacts so that the fast path works before, or without, the first ThroughLine refresh
+CRISIS_CONTACTS: dict[str, CrisisContacts] = {
+    'US': CrisisContacts('911', [Helpline('988 Suicide & Crisis Lifeline', {'phoneNumber': '988', 'smsNumber': '988'})]),
+    'CA': CrisisContacts('911', [Helpline('9-8-8 Suicide Crisis Helpline', {'phoneNumber': '988', 'smsNumber': '988'})]),
+    'GB': CrisisContacts('999', [Helpline('Samaritans', {'phoneNumber': '116 123'})]),
+    'IE': CrisisContacts('112', [Helpline('Samaritans', {'phoneNumber': '116 123'})]),
+    'AU': CrisisContacts('000', [Helpline('Lifeline', {'phoneNumber': '13 11 14'})]),
+    'NZ': CrisisContacts('111', [Helpline('Need to talk?', {'phoneNumber': '1737', 'smsNumber': '1737'})])
+}
+DEFAULT_CONTACTS: CrisisContacts = CrisisContacts('your local emergency number')
+
+def _helpline(helpline: dict) -> Helpline | None:
+    contacts: dict[str, str] = {key: str(helpline[key]) for key, _ in CONTACT_FIELDS if helpline.get(key)}
+    return Helpline(helpline['name'], contacts) if helpline.get('name') and contacts else None
+
+def _emergency_number(*sources: Any) -> str | None:
+    # The number is on the catalogue country, and again on the country nested in each helpline
+    return next((str(source['emergencyNumber']) for source in sources if isinstance(source, dict) and source.get('emergencyNumber')), None)
+
+class CrisisTable:
+    """
+    Per-country crisis contacts, preloaded with a static baseline and refreshed in the
+    background with the ThroughLine helplines for each supported country. Lookups never
+    wait on the refresh.
+    """
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+
+        self.contacts: dict[str, CrisisContacts] = dict(CRISIS_CONTACTS)
+        self.refreshed_at: float | None = None
+
+        self._refresh_task: asyncio.Task | None = None
+
+    @property
+    def stale(self) -> bool:
+        return self.refreshed_at is None or monotonic() - self.refreshed_at > self.ttl
+
+    def get(self, country: str) -> CrisisContacts:
+        if settings.AWS_BEDROCK_AGENTCORE_GATEWAY_URL and self.stale:
+            self.schedule_refresh()
+
+        return self.contacts.get(country.upper(), DEFAULT_CONTACTS)
+
+    def schedule_refresh(self) -> None:
+        if not (self._refresh_task and not self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self.refresh())
+
+    async def refresh(self) -> None:
+        from sana.agent.tools.helplines import catalogues, search_helplines
+
+        try:
+            cache = await catalogues.get()
+            countries: dict[str, dict] = {str(country['code']).upper(): country for country in cache.countries if country.get('code')}
+
+            for code, country in countries.items():
+                result: dict = await search_helplines(country_code=code, topic=CRISIS_TOPIC, limit=2)
+                payload: Any = result['helplines']
+                helplines: list[dict] = [
+                    helpline for helpline in (payload.get('helplines', []) if isinstance(payload, dict) else payload) if isinstance(helpline, dict)
+                ]
+
+                current: CrisisContacts = self.contacts.get(code, DEFAULT_CONTACTS)
+                contacts: CrisisContacts = CrisisContacts(
+                    _emergency_number(country, *(helpline.get('country') for helpline in helplines)) or current.emergency_number,
+                    [contact for helpline in helplines if (contact := _helpline(helpline))]
+                )
+
+                # A refresh must never leave a country with fewer ways to reach someone than its baseline,
+                # such as a website in place of a crisis line that takes calls and texts
+                baseline: CrisisContacts = CRISIS_CONTACTS.get(code, DEFAULT_CONTACTS)
+                if not contacts.helplines or not contacts.methods >= baseline.methods:
+                    contacts.helplines = current.helplines
+                self.contacts[code] = contacts
+
+            self.refreshed_at = monotonic()
+            logger.info(f'Refreshed the crisis contacts of {len(countries)} countries')
+        except Exception as e:
+            # The previous contacts, or the static baseline, keep being served and the next lookup retries
+            logger.warning(f'Failed to refresh the crisis contacts: {e}')
+
+crisis_table = CrisisTable(ttl=settings.CRISIS_CONTACTS_TTL)
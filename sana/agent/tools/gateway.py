@@ -0,0 +1,153 @@
+from threading import Lock
+from typing import Any
+import asyncio
+import json
+import logging
+import uuid
+
+from strands.tools.mcp import MCPAgentTool, MCPClient
+from strands.types.exceptions import MCPClientInitializationError
+from strands.types.tools import AgentTool, ToolGenerator, ToolResult, ToolSpec, ToolUse
+from strands.types._events import ToolResultEvent
+
+from mcp.client.streamable_http import streamablehttp_client
+
+from sana.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Prefix of the error result MCPClient returns when the call itself raised, such as on a dropped
+# connection or a rejected token, rather than the tool reporting an error
+CALL_FAILED_PREFIX: str = 'Tool execution failed:'
+
+_lock = Lock()
+_client: MCPClient | None = None
+_client_token: str | None = None
+_tools: list | None = None
+
+class GatewayTool(AgentTool):
+    """
+    AgentCore Gateway tool that goes through the shared connection current at call time, so
+    the agents built before a reconnect keep working after it.
+    """
+    def __init__(self, tool: MCPAgentTool) -> None:
+        super().__init__()
+        self.tool = tool
+
+    @property
+    def tool_name(self) -> str:
+        return self.tool.tool_name
+
+    @property
+    def tool_spec(self) -> ToolSpec:
+        return self.tool.tool_spec
+
+    @property
+    def tool_type(self) -> str:
+        return self.tool.tool_type
+
+    async def stream(self, tool_use: ToolUse, invocation_state: dict[str, Any], **kwargs: Any) -> ToolGenerator:
+        yield ToolResultEvent(await _call_tool(tool_use['toolUseId'], self.tool_name, tool_use['input']))
+
+def _connect(gateway_token: str) -> MCPClient:
+    # Must be called with the lock held
+    global _client, _client_token
+
+    if _client:
+        _client.stop(None, None, None)
+        _client, _client_token = None, None
+
+    try:
+        client = MCPClient(
+            lambda: streamablehttp_client(
+                settings.AWS_BEDROCK_AGENTCORE_GATEWAY_URL,
+                headers={'Authorization': gateway_token}
+            )
+        )
+
+        client.start()
+    except Exception as e:
+        raise RuntimeError(f'failed to initialize MCPClient: {e}')
+
+    _client, _client_token = client, gateway_token
+    return client
+
+def _reconnect(failed: MCPClient | None) -> MCPClient:
+    from sana.core.auth import get_gateway_token
+    from sana.core.context import SanaContext
+
+    with _lock:
+        # Another call may have reconnected already
+        if _client and _client is not failed:
+            return _client
+
+        # The token may be what expired, so the connection is opened with a fresh one
+        logger.warning('Reconnecting to the AgentCore Gateway')
+        gateway_token: str = get_gateway_token()
+        SanaContext.set_gateway_token(gateway_token)
+        return _connect(gateway_token)
+
+def _call_failed(result: ToolResult) -> bool:
+    return result['status'] == 'error' and any(
+        item.get('text', '').startswith(CALL_FAILED_PREFIX) for item in result.get('content', [])
+    )
+
+async def _call_tool(tool_use_id: str, name: str, arguments: dict) -> ToolResult:
+    client: MCPClient | None = _client
+
+    for attempt in range(2):
+        if client is None:
+            client = await asyncio.to_thread(_reconnect, None)
+
+        try:
+            result: ToolResult = await client.call_tool_async(tool_use_id, name, arguments)
+        except MCPClientInitializationError as e:
+            # The connection thread is gone
+            result = {'toolUseId': tool_use_id, 'status': 'error', 'content': [{'text': f'{CALL_FAILED_PREFIX} {e}'}]}
+
+        if attempt or not _call_failed(result):
+            return result
+
+        logger.warning(f'Gateway tool {name} failed on the connection: {result["content"]}')
+        client = await asyncio.to_thread(_reconnect, client)
+
+    return result
+
+def get_gateway_tools(gateway_token: str) -> list:
+    """
+    Returns the AgentCore Gateway MCP tools, sharing a single connection and
+    tool catalogue between every agent that uses the same gateway token.
+    """
+    global _tools
+
+    with _lock:
+        if _tools is not None and _client_token == gateway_token:
+            return _tools
+
+        if _client:
+            logger.info('Gateway token changed, reconnecting to the AgentCore Gateway')
+
+        client: MCPClient = _connect(gateway_token)
+        _tools = [GatewayTool(tool) for tool in client.list_tools_sync()]
+
+        logger.info(f'Loaded {len(_tools)} tools from the AgentCore Gateway')
+        return _tools
+
+async def call_gateway_tool(name: str, arguments: dict | None = None) -> Any:
+    """
+    Calls an AgentCore Gateway tool directly, over the shared connection, and returns its
+    decoded JSON result.
+    """
+    if not _client:
+        raise RuntimeError('The AgentCore Gateway connection is not initialized')
+
+    result: ToolResult = await _call_tool(f'sana-{uuid.uuid4()}', name, arguments or {})
+    text: str = ''.join(item['text'] for item in result.get('content', []) if 'text' in item)
+
+    if result.get('status') == 'error':
+        raise RuntimeError(f'Gateway tool {name} failed: {text}')
+
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
@@ -0,0 +1,145 @@
+from time import monotonic
+from typing import Any, Literal
+import asyncio
+import hashlib
+import json
+import logging
+import re
+
+from strands.tools import tool
+
+from sana.core.config import settings
+from sana.agent.tools.gateway import call_gateway_tool
+
+logger = logging.getLogger(__name__)
+
+COUNTRIES_TOOL: str = 'throughline-rest-api___getCountries'
+TOPICS_TOOL: str = 'throughline-rest-api___getTopics'
+HELPLINES_TOOL: str = 'throughline-rest-api___getHelplines'
+THROUGHLINE_TOOLS: frozenset[str] = frozenset((COUNTRIES_TOOL, TOPICS_TOOL, HELPLINES_TOOL))
+
+# The ThroughLine API falls back to the US for countries it does not support
+DEFAULT_COUNTRY: str = 'US'
+
+def _items(payload: Any, key: str) -> list[dict]:
+    items: Any = payload.get(key, []) if isinstance(payload, dict) else payload
+    return [item for item in items if isinstance(item, dict)] if isinstance(items, list) else []
+
+def _words(text: str) -> set[str]:
+    # Word prefixes are enough to match 'suicide' with 'suicidal' or 'abusive' with 'abuse'
+    return {word[:4] for word in re.findall(r'[a-z0-9]+', text.lower())}
+
+class CatalogueCache:
+    """
+    Process-wide cache of the ThroughLine country and topic catalogues. Stale catalogues keep
+    being served while a background refresh runs, and a content hash stands in for the ETag
+    the gateway does not forward, so unchanged catalogues are not swapped.
+    """
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+
+        self.countries: list[dict] = []
+        self.topics: list[dict] = []
+        self.etag: str | None = None
+        self.fetched_at: float | None = None
+
+        self._lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task | None = None
+
+    @property
+    def stale(self) -> bool:
+        return self.fetched_at is None or monotonic() - self.fetched_at > self.ttl
+
+    async def get(self) -> 'CatalogueCache':
+        if self.fetched_at is None:
+            await self.refresh()
+        elif self.stale and not (self._refresh_task and not self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self.refresh())
+        return self
+
+    async def refresh(self) -> None:
+        async with self._lock:
+            if not self.stale:
+                return
+
+            try:
+                countries, topics = await asyncio.gather(call_gateway_tool(COUNTRIES_TOOL), call_gateway_tool(TOPICS_TOOL))
+            except Exception as e:
+                # Keep serving the previous catalogues, the first load has nothing to fall back to
+                if self.fetched_at is None:
+                    raise
+                logger.warning(f'Failed to refresh the helpline catalogues: {e}')
+                return
+
+            etag: str = hashlib.sha256(json.dumps([countries, topics], sort_keys=True).encode('utf-8')).hexdigest()
+            if etag != self.etag:
+                self.countries, self.topics, self.etag = _items(countries, 'countries'), _items(topics, 'topics'), etag
+                logger.info(f'Loaded {len(self.countries)} helpline countries and {len(self.topics)} topics')
+
+            self.fetched_at = monotonic()
+
+    def resolve_country(self, country_code: str) -> str:
+        codes: set[str] = {str(country.get('code', '')).upper() for country in self.countries}
+        return country_code.upper() if country_code.upper() in codes else DEFAULT_COUNTRY
+
+    def resolve_topic(self, topic: str) -> str | None:
+        # Topics are filtered by name, the model may pass a code or a free-text description
+        for candidate in self.topics:
+            if topic.lower() in (str(candidate.get('name', '')).lower(), str(candidate.get('code', '')).lower()):
+                return candidate['name']
+
+        words: set[str] = _words(topic)
+        name, overlap = max(
+            ((candidate['name'], len(words & _words(candidate['name']))) for candidate in self.topics if 'name' in candidate),
+            key=lambda match: match[1],
+            default=(None, 0)
+        )
+        return name if overlap else None
+
+catalogues = CatalogueCache(ttl=settings.THROUGHLINE_CATALOGUE_TTL)
+
+@tool
+async def get_helpline_catalogues() -> dict:
+    """
+    List the countries and topics supported by the helpline search.
+    There is no need to call this tool before searching for helplines, the search tool already matches the
+    country and topic against these catalogues.
+    """
+    cache: CatalogueCache = await catalogues.get()
+    return {'countries': cache.countries, 'topics': cache.topics}
+
+@tool
+async def search_helplines(
+    country_code: str,
+    topic: str | None = None,
+    specialty: Literal['Everyone', 'Deaf & HOH', 'Youth', 'Adults', 'Seniors', 'LGBTQ+'] | None = None,
+    contact_method: Literal['phone', 'chat', 'sms', 'whatsapp'] | None = None,
+    limit: int = 2
+) -> dict:
+    """
+    Search for mental health helplines tailored to the situation and demographic of the user.
+    Call this tool directly as soon as a high risk situation is detected, it is the only call needed.
+
+    Args:
+        country_code (str): Country of the user, in ISO 3166-1 alpha-2 format. Unsupported countries fall back to the US.
+        topic (str | None): Topic that best describes the situation, for example "suicidal thoughts", "self-harm" or "abuse".
+            It is matched against the supported helpline topics.
+        specialty (str | None): Demographic the helpline should specialize in.
+        contact_method (str | None): Preferred way of contacting the helpline.
+        limit (int): Maximum number of helplines to return.
+    """
+    cache: CatalogueCache = await catalogues.get()
+
+    arguments: dict = {'country_code': cache.resolve_country(country_code), 'limit': limit}
+    if topic and (topic_name := cache.resolve_topic(topic)):
+        arguments['topic'] = topic_name
+    if specialty:
+        arguments['specialty'] = specialty
+    if contact_method:
+        arguments['contact_method'] = contact_method
+
+    return {
+        'country_code': arguments['country_code'],
+        'topic': arguments.get('topic'),
+        'helplines': await call_gateway_tool(HELPLINES_TOOL, arguments)
+    }
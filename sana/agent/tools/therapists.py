@@ -7,7 +7,9 @@ from bedrock_agentcore.tools.browser_client import browser_session
 
 from pydantic import BaseModel, computed_field
 
+from sana.core.cancellation import Cancellation
 from sana.core.config import settings
+from sana.core.context import SanaContext
 
 logger = logging.getLogger(__name__)
 
@@ -95,7 +97,10 @@ def search_therapists(
         - next_available_appointment (str): Date of the next available appointment in MM-DD format.
     """
     all_therapists: list[Therapist] = []
-    with browser_session(settings.AWS_REGION) as browser:
+
+    # Stopping the remote browser is the only way to interrupt a Nova Act step once the user disconnects
+    cancellation: Cancellation = SanaContext.get_cancellation() or Cancellation()
+    with browser_session(settings.AWS_REGION) as browser, cancellation.on_cancel(browser.stop):
         ws_url, ws_headers = browser.generate_ws_headers()
         with NovaAct(
             nova_act_api_key=settings.AWS_NOVA_ACT_API_KEY,
@@ -127,6 +132,7 @@ def search_therapists(
                 )
 
                 for _ in range(limit):
+                    cancellation.raise_if_cancelled()
                     result = nova.act(
                         "Return the currently visible list of therapists. "
                         "Omit therapists whose information is not fully visible. "
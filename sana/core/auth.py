@@ -1,28 +1,50 @@
-from bedrock_agentcore.identity import requires_access_token
+from collections.abc import Callable
+from functools import cache
 
 from sana.core.config import settings
 from sana.core.context import SanaContext
+from sana.core.events import TextDelta
 
-@requires_access_token(
-    provider_name=settings.AWS_BEDROCK_AGENTCORE_GATEWAY_OAUTH_PROVIDER_NAME,
-    scopes=settings.AWS_BEDROCK_AGENTCORE_GATEWAY_OAUTH_SCOPES,
-    auth_flow='M2M'
-)
-def get_gateway_token(access_token: str) -> str:
-    return access_token
+GOOGLE_SCOPES: list[str] = ['https://www.googleapis.com/auth/calendar']
+
+# The AgentCore Identity clients are only created the first time a token is requested
+
+@cache
+def _gateway_token_provider() -> Callable[[], str]:
+    from bedrock_agentcore.identity import requires_access_token
+
+    @requires_access_token(
+        provider_name=settings.AWS_BEDROCK_AGENTCORE_GATEWAY_OAUTH_PROVIDER_NAME,
+        scopes=settings.AWS_BEDROCK_AGENTCORE_GATEWAY_OAUTH_SCOPES,
+        auth_flow='M2M'
+    )
+    def get_token(access_token: str) -> str:
+        return access_token
+
+    return get_token
+
+@cache
+def _google_token_provider() -> Callable[[], str]:
+    from bedrock_agentcore.identity import requires_access_token
+
+    @requires_access_token(
+        provider_name=settings.GOOGLE_OAUTH_PROVIDER_NAME,
+        scopes=GOOGLE_SCOPES,
+        auth_flow='USER_FEDERATION',
+        on_auth_url=on_auth_url,
+        force_authentication=True
+    )
+    def get_token(access_token: str) -> str:
+        return access_token
+
+    return get_token
+
+def get_gateway_token() -> str:
+    return _gateway_token_provider()()
 
 async def on_auth_url(url: str) -> None:
     if (queue := SanaContext.get_queue()):
-        await queue.put(f'\n\n:blue-badge[You must allow us to access your Google account using [this link]({url}).]\n\n')
-
-GOOGLE_SCOPES: list[str] = ['https://www.googleapis.com/auth/calendar']
+        await queue.put(TextDelta(f'\n\n:blue-badge[You must allow us to access your Google account using [this link]({url}).]\n\n'))
 
-@requires_access_token(
-    provider_name=settings.GOOGLE_OAUTH_PROVIDER_NAME,
-    scopes=GOOGLE_SCOPES,
-    auth_flow='USER_FEDERATION',
-    on_auth_url=on_auth_url,
-    force_authentication=True
-)
-def get_google_token(access_token: str) -> str:
-    return access_token
\ No newline at end of file
+def get_google_token() -> str:
+    return _google_token_provider()()
@@ -0,0 +1,56 @@
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class Cancellation:
+    """
+    Cancellation of a single invocation, shared with the tool threads it runs. Cancelling the
+    asyncio task cannot interrupt a blocking call inside a thread, so tools register callbacks
+    that release what they hold, such as a remote browser session.
+    """
+    def __init__(self) -> None:
+        self.cancelled: bool = False
+
+        self._callbacks: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def on_cancel(self, callback: Callable[[], None]) -> Iterator[None]:
+        with self._lock:
+            registered: bool = not self.cancelled
+            if registered:
+                self._callbacks.append(callback)
+
+        # Already cancelled, release straight away
+        if not registered:
+            self._run(callback)
+
+        try:
+            yield
+        finally:
+            with self._lock:
+                if callback in self._callbacks:
+                    self._callbacks.remove(callback)
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self.cancelled:
+                return
+            self.cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            self._run(callback)
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            raise RuntimeError('The invocation was cancelled')
+
+    def _run(self, callback: Callable[[], None]) -> None:
+        try:
+            callback()
+        except Exception as e:
+            logger.warning(f'Cancellation callback failed: {e}')
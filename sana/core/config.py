@@ -1,11 +1,22 @@
 from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from strands.telemetry import StrandsTelemetry
 
 class Settings(BaseSettings):
     # General
     ENVIRONMENT: Literal['local', 'prod'] = 'local'
+    AGENT_CACHE_SIZE: int = 32
+    WARMUP_ENABLED: bool = True
+    WARMUP_TIMEOUT: float = 30.0
+
+    ## Conversation history
+    CONVERSATION_TOKEN_BUDGET: int = 6000
+    CONVERSATION_RECENT_TURNS: int = 3
+    CONVERSATION_EXCERPT_CHARS: int = 300
+
+    ## Tool execution
+    TOOL_MAX_CONCURRENCY: int = 4
+    TOOL_TIMEOUT: float = 30.0
 
     # Amazon Web Services
     AWS_REGION: str
@@ -14,6 +25,12 @@ class Settings(BaseSettings):
     AWS_BEDROCK_MODEL_ID: str = 'global.anthropic.claude-sonnet-4-20250514-v1:0'
     AWS_BEDROCK_TEMPERATURE: float = 0.0
     AWS_BEDROCK_MAX_TOKENS: int = 2048
+    AWS_BEDROCK_PROMPT_CACHE_ENABLED: bool = True
+
+        ### Model routing
+    AWS_BEDROCK_ROUTING_ENABLED: bool = False
+    AWS_BEDROCK_FAST_MODEL_ID: str = 'global.anthropic.claude-haiku-4-5-20251001-v1:0'
+    AWS_BEDROCK_FAST_MAX_CHARS: int = 200
     
         ### Guardrails
     AWS_BEDROCK_GUARDRAILS_ID: str | None = None
@@ -22,12 +39,25 @@ class Settings(BaseSettings):
     ## AWS Bedrock AgentCore
         ### Memory
     AWS_BEDROCK_AGENTCORE_MEMORY_ID: str | None = None
+    AWS_BEDROCK_AGENTCORE_MEMORY_NAMESPACE: str = '/summaries/{actorId}/'
+    AWS_BEDROCK_AGENTCORE_MEMORY_TOP_K: int = 3
+    AWS_BEDROCK_AGENTCORE_MEMORY_CONTEXT_CHARS: int = 1500
+    AWS_BEDROCK_AGENTCORE_MEMORY_WRITE_BEHIND: bool = True
+    AWS_BEDROCK_AGENTCORE_MEMORY_BATCH_SIZE: int = 8
+    AWS_BEDROCK_AGENTCORE_MEMORY_WRITE_RETRIES: int = 3
 
         ### Gateway
     AWS_BEDROCK_AGENTCORE_GATEWAY_URL: str | None = None
     AWS_BEDROCK_AGENTCORE_GATEWAY_OAUTH_PROVIDER_NAME: str | None = None
     AWS_BEDROCK_AGENTCORE_GATEWAY_OAUTH_SCOPES: list[str] = []
     
+        ### Semantic cache
+    SEMANTIC_CACHE_ENABLED: bool = False
+    SEMANTIC_CACHE_EMBEDDING_MODEL_ID: str = 'amazon.titan-embed-text-v2:0'
+    SEMANTIC_CACHE_THRESHOLD: float = 0.9
+    SEMANTIC_CACHE_SIZE: int = 256
+    SEMANTIC_CACHE_TTL: float = 3600.0
+
     ## AWS Nova
     AWS_NOVA_ACT_API_KEY: str | None = None
     
@@ -37,11 +67,22 @@ class Settings(BaseSettings):
 
         ## Google
     GOOGLE_OAUTH_PROVIDER_NAME: str | None = None
+
+        ## ThroughLine
+    THROUGHLINE_CATALOGUE_TTL: float = 86400.0
+    CRISIS_FAST_PATH_ENABLED: bool = True
+    CRISIS_CONTACTS_TTL: float = 86400.0
     
     # Observability
         ## OpenTelemetry
     OTEL_ENABLED: bool = False
     OTEL_SERVICE_NAME: str = 'sana'
+    OTEL_EXPORTER: Literal['otlp', 'console', 'memory'] = 'otlp'
+
+        ## Event loop monitor
+    LOOP_MONITOR_ENABLED: bool = False
+    LOOP_MONITOR_INTERVAL: float = 0.1
+    LOOP_MONITOR_THRESHOLD: float = 0.25
 
     # Load .env file
     model_config = SettingsConfigDict(
@@ -50,9 +91,4 @@ class Settings(BaseSettings):
         extra='ignore'
     )
     
-settings = Settings()
-
-if settings.OTEL_ENABLED:
-    telemetry = StrandsTelemetry()
-    telemetry.setup_otlp_exporter()
-    telemetry.setup_meter(enable_otlp_exporter=True)
\ No newline at end of file
+settings = Settings()
\ No newline at end of file
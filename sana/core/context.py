@@ -1,18 +1,26 @@
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from contextvars import ContextVar
+from typing import TYPE_CHECKING
+import asyncio
 
-from sana.agent import Sana
+from sana.core.cancellation import Cancellation
+from sana.core.config import settings
 from sana.core.queue import StreamingQueue
 
+if TYPE_CHECKING:
+    from sana.agent import Sana
+
 class SanaContext:
+    # The gateway token is the agent's own M2M token, the same for every user
     _gateway_token: str | None = None
-    _google_token: str | None = None
-    _queue: StreamingQueue | None = None
-    _agent: Sana | None = None
+    _google_tokens: dict[str, str] = {}
+    _agents: OrderedDict[str, 'Sana'] = OrderedDict()
+    _agent_builds: dict[str, asyncio.Task] = {}
 
     _gateway_token_ctx: ContextVar[str | None] = ContextVar('gateway_token', default=None)
-    _google_token_ctx: ContextVar[str | None] = ContextVar('google_token', default=None)
     _queue_ctx: ContextVar[StreamingQueue | None] = ContextVar('queue', default=None)
-    _agent_ctx: ContextVar[Sana | None] = ContextVar('agent', default=None)
+    _cancellation_ctx: ContextVar[Cancellation | None] = ContextVar('cancellation', default=None)
 
     @classmethod
     def get_gateway_token(cls) -> str | None:
@@ -28,24 +36,22 @@ class SanaContext:
         cls._gateway_token = token
         cls._gateway_token_ctx.set(token)
 
+    # Google tokens belong to the user, so they are scoped to a session and evicted with its agent
     @classmethod
-    def get_google_token(cls) -> str | None:
-        if cls._google_token:
-            return cls._google_token
-        try:
-            return cls._google_token_ctx.get()
-        except LookupError:
-            return None
-        
+    def get_google_token(cls, session_id: str) -> str | None:
+        return cls._google_tokens.get(session_id)
+
+    @classmethod
+    def set_google_token(cls, session_id: str, token: str) -> None:
+        cls._google_tokens[session_id] = token
+
     @classmethod
-    def set_google_token(cls, token: str) -> None:
-        cls._google_token = token
-        cls._google_token_ctx.set(token)
+    def clear_google_token(cls, session_id: str) -> None:
+        cls._google_tokens.pop(session_id, None)
         
+    # Queues are scoped to a single invocation
     @classmethod
     def get_queue(cls) -> StreamingQueue | None:
-        if cls._queue:
-            return cls._queue
         try:
             return cls._queue_ctx.get()
         except LookupError:
@@ -53,19 +59,54 @@ class SanaContext:
         
     @classmethod
     def set_queue(cls, queue: StreamingQueue) -> None:
-        cls._queue = queue
         cls._queue_ctx.set(queue)
 
+    # Cancellations are scoped to a single invocation, and reach the tool threads through the copied context
     @classmethod
-    def get_agent(cls) -> Sana | None:
-        if cls._agent:
-            return cls._agent
+    def get_cancellation(cls) -> Cancellation | None:
         try:
-            return cls._agent_ctx.get()
+            return cls._cancellation_ctx.get()
         except LookupError:
             return None
 
     @classmethod
-    def set_agent(cls, agent: Sana) -> None:
-        cls._agent = agent
-        cls._agent_ctx.set(agent)
+    def set_cancellation(cls, cancellation: Cancellation) -> None:
+        cls._cancellation_ctx.set(cancellation)
+
+    # Agents are scoped to a session, keeping only the most recently used ones
+    @classmethod
+    def get_agent(cls, session_id: str) -> 'Sana | None':
+        if (agent := cls._agents.get(session_id)):
+            cls._agents.move_to_end(session_id)
+        return agent
+
+    @classmethod
+    def set_agent(cls, session_id: str, agent: 'Sana') -> None:
+        cls._agents[session_id] = agent
+        cls._agents.move_to_end(session_id)
+        while len(cls._agents) > settings.AGENT_CACHE_SIZE:
+            evicted_id, _ = cls._agents.popitem(last=False)
+            cls._google_tokens.pop(evicted_id, None)
+
+    @classmethod
+    async def get_or_build_agent(cls, session_id: str, build: Callable[[], Awaitable['Sana']]) -> 'Sana':
+        if (agent := cls.get_agent(session_id)):
+            return agent
+
+        # Concurrent first requests for a session wait on a single build, a second agent would drop
+        # the first one's buffered memory writes
+        if not (task := cls._agent_builds.get(session_id)):
+            task = asyncio.create_task(cls._build_agent(session_id, build))
+            cls._agent_builds[session_id] = task
+
+        # A cancelled request must not cancel the build other requests are waiting on
+        return await asyncio.shield(task)
+
+    @classmethod
+    async def _build_agent(cls, session_id: str, build: Callable[[], Awaitable['Sana']]) -> 'Sana':
+        try:
+            agent: 'Sana' = await build()
+            cls.set_agent(session_id, agent)
+            return agent
+        finally:
+            cls._agent_builds.pop(session_id, None)
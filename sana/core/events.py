@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+
+# Every event goes out as one compact JSON object per server-sent event, keyed by its type:
+#   {"t": "text", "d": "Hello"}
+#   {"t": "tool_start", "id": "tooluse_1", "n": "search_therapists", "m": "Searching for therapists..."}
+#   {"t": "tool_end", "id": "tooluse_1", "n": "search_therapists", "s": "success", "ms": 2140}
+#   {"t": "error", "m": "..."}
+#   {"t": "usage", "i": 5210, "o": 312, "cr": 4096, "cw": 0}
+#   {"t": "done", "ms": 6120, "ttft": 830}
+
+def _ms(seconds: float) -> int:
+    return round(seconds * 1000)
+
+@dataclass(slots=True)
+class TextDelta:
+    text: str
+
+    def to_dict(self) -> dict:
+        return {'t': 'text', 'd': self.text}
+
+@dataclass(slots=True)
+class ToolStart:
+    tool_use_id: str
+    name: str
+    message: str
+
+    def to_dict(self) -> dict:
+        return {'t': 'tool_start', 'id': self.tool_use_id, 'n': self.name, 'm': self.message}
+
+@dataclass(slots=True)
+class ToolEnd:
+    tool_use_id: str
+    name: str
+    status: str
+    duration: float
+
+    def to_dict(self) -> dict:
+        return {'t': 'tool_end', 'id': self.tool_use_id, 'n': self.name, 's': self.status, 'ms': _ms(self.duration)}
+
+@dataclass(slots=True)
+class Error:
+    message: str
+
+    def to_dict(self) -> dict:
+        return {'t': 'error', 'm': self.message}
+
+@dataclass(slots=True)
+class Usage:
+    input_tokens: int
+    output_tokens: int
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            't': 'usage',
+            'i': self.input_tokens,
+            'o': self.output_tokens,
+            'cr': self.cache_read_tokens,
+            'cw': self.cache_write_tokens
+        }
+
+@dataclass(slots=True)
+class Done:
+    duration: float
+    time_to_first_token: float | None = None
+
+    def to_dict(self) -> dict:
+        event: dict = {'t': 'done', 'ms': _ms(self.duration)}
+        if self.time_to_first_token is not None:
+            event['ttft'] = _ms(self.time_to_first_token)
+        return event
+
+StreamEvent = TextDelta | ToolStart | ToolEnd | Error | Usage | Done
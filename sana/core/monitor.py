@@ -0,0 +1,94 @@
+from asyncio import AbstractEventLoop, Task
+from threading import Event, Thread
+from time import monotonic
+import asyncio
+import logging
+import sys
+import threading
+import traceback
+
+from sana.core.config import settings
+from sana.core.telemetry import loop_blocked, loop_lag
+
+logger = logging.getLogger(__name__)
+
+class LoopMonitor:
+    """
+    Samples the lag of the running event loop and logs the stack of the loop thread
+    whenever a single callback blocks it for longer than the threshold.
+    """
+    def __init__(self, interval: float = 0.1, threshold: float = 0.25) -> None:
+        self.interval = interval
+        self.threshold = threshold
+
+        self._loop: AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._heartbeat: float = monotonic()
+        self._sampler: Task | None = None
+        self._watchdog: Thread | None = None
+        self._stop = Event()
+
+    @property
+    def running(self) -> bool:
+        return self._sampler is not None and not self._sampler.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = monotonic()
+        self._stop.clear()
+
+        self._sampler = self._loop.create_task(self._sample())
+        self._watchdog = Thread(target=self._watch, name='sana-loop-monitor', daemon=True)
+        self._watchdog.start()
+
+        logger.info(f'Event loop monitor started (interval={self.interval}s, threshold={self.threshold}s)')
+
+    async def stop(self) -> None:
+        self._stop.set()
+
+        if self._sampler:
+            self._sampler.cancel()
+            try:
+                await self._sampler
+            except asyncio.CancelledError:
+                pass
+            self._sampler = None
+
+        if self._watchdog:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+    async def _sample(self) -> None:
+        while True:
+            start: float = monotonic()
+            await asyncio.sleep(self.interval)
+
+            self._heartbeat = now = monotonic()
+            loop_lag.record(max(0.0, now - start - self.interval))
+
+    def _watch(self) -> None:
+        reported: float | None = None
+
+        while not self._stop.wait(self.interval):
+            heartbeat: float = self._heartbeat
+            if (blocked := monotonic() - heartbeat - self.interval) < self.threshold:
+                continue
+
+            # Report each stall once, with the stack the loop thread is stuck in
+            if reported == heartbeat:
+                continue
+            reported = heartbeat
+
+            loop_blocked.add(1)
+            if frame := sys._current_frames().get(self._loop_thread_id):
+                stack: str = ''.join(traceback.format_stack(frame))
+                logger.warning(f'Event loop blocked for at least {blocked:.3f}s, current stack:\n{stack}')
+
+monitor = LoopMonitor(
+    interval=settings.LOOP_MONITOR_INTERVAL,
+    threshold=settings.LOOP_MONITOR_THRESHOLD
+)
@@ -1,22 +1,26 @@
 import asyncio
-from typing import Any
+from time import perf_counter
 from collections.abc import AsyncIterator
 
+from sana.core.events import StreamEvent
+from sana.core.telemetry import queue_wait
+
 class StreamingQueue:
     def __init__(self) -> None:
         self.finished: bool = False
         self.queue = asyncio.Queue()
 
-    async def put(self, item: Any) -> None:
-        await self.queue.put(item)
+    async def put(self, item: StreamEvent) -> None:
+        await self.queue.put((perf_counter(), item))
 
     async def finish(self) -> None:
         self.finished = True
-        await self.queue.put(None)
+        await self.queue.put((perf_counter(), None))
 
-    async def stream(self) -> AsyncIterator[Any]:
+    async def stream(self) -> AsyncIterator[StreamEvent]:
         while True:
-            item = await self.queue.get()
+            queued_at, item = await self.queue.get()
+            queue_wait.record(perf_counter() - queued_at)
             if item is None and self.finished:
                 break
             yield item
@@ -1,8 +1,13 @@
+from typing import TYPE_CHECKING
+import asyncio
 import logging
 
 from sana.core.context import SanaContext
+from sana.core.events import Error
 from sana.core.models import Actor
-from sana.agent import Sana
+
+if TYPE_CHECKING:
+    from sana.agent import Sana
 
 logger = logging.getLogger(__name__)
 
@@ -18,20 +23,26 @@ async def agent_task(
         raise RuntimeError('No gateway token found in context')
 
     try:
-        if not (agent := SanaContext.get_agent()):
+        async def build() -> 'Sana':
             logger.info(f'Initializing agent for session: {session_id} and actor: {actor}')
 
-            agent = Sana(
+            # Imported here so the runtime can start serving before strands is loaded
+            from sana.agent import Sana
+
+            return await Sana.create(
                 session_id=session_id,
                 gateway_token=gateway_token,
                 actor=actor
             )
 
-            SanaContext.set_agent(agent)
-        async for chunk in agent.stream(message):
-            await queue.put(chunk)
+        agent = await SanaContext.get_or_build_agent(session_id, build)
+        async for event in agent.stream(message):
+            await queue.put(event)
+    except asyncio.CancelledError:
+        logger.info(f'Agent execution cancelled for session: {session_id}')
+        raise
     except Exception as e:
         logger.error(f'Agent execution failed: {e}')
-        await queue.put(f'error: {e}')
+        await queue.put(Error(str(e)))
     finally:
         await queue.finish()
\ No newline at end of file
@@ -0,0 +1,152 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any
+import logging
+
+from opentelemetry import metrics, trace
+from opentelemetry.trace import Span
+
+from sana.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer('sana')
+meter = metrics.get_meter('sana')
+
+# In-memory exporters, only set when OTEL_EXPORTER is 'memory'
+span_exporter: Any = None
+metric_reader: Any = None
+
+init_duration = meter.create_histogram(
+    'sana.agent.init.duration',
+    unit='s',
+    description='Duration of each Sana initialization phase'
+)
+time_to_first_token = meter.create_histogram(
+    'sana.stream.time_to_first_token',
+    unit='s',
+    description='Time from the start of a turn to the first streamed token'
+)
+inter_token_gap = meter.create_histogram(
+    'sana.stream.inter_token_gap',
+    unit='s',
+    description='Time between consecutive streamed tokens'
+)
+stream_duration = meter.create_histogram(
+    'sana.stream.duration',
+    unit='s',
+    description='Total duration of a streamed turn'
+)
+model_duration = meter.create_histogram(
+    'sana.model.duration',
+    unit='s',
+    description='Duration of each model call, by route and model'
+)
+model_cost = meter.create_counter(
+    'sana.model.cost',
+    unit='USD',
+    description='Estimated cost of the model calls, by route and model'
+)
+turn_tokens = meter.create_histogram(
+    'sana.stream.tokens',
+    description='Model tokens used by each streamed turn, by token type (input, output, cache_read or cache_write)'
+)
+compaction_ratio = meter.create_histogram(
+    'sana.conversation.compaction_ratio',
+    description='Estimated tokens of the conversation history after each compaction, relative to before'
+)
+memory_retrieval_duration = meter.create_histogram(
+    'sana.memory.retrieval.duration',
+    unit='s',
+    description='Duration of each long-term memory retrieval'
+)
+memory_flush_duration = meter.create_histogram(
+    'sana.memory.flush.duration',
+    unit='s',
+    description='Duration of each background flush of buffered memory writes'
+)
+memory_write_failures = meter.create_counter(
+    'sana.memory.write.failures',
+    description='Number of memory writes that failed after all retries and were kept for the next flush'
+)
+stream_cancellations = meter.create_counter(
+    'sana.stream.cancellations',
+    description='Number of turns cancelled because the client disconnected mid-stream'
+)
+crisis_fast_path = meter.create_counter(
+    'sana.crisis.fast_path',
+    description='Number of turns where crisis contacts were shown ahead of the agent response, by trigger'
+)
+tool_duration = meter.create_histogram(
+    'sana.tool.duration',
+    unit='s',
+    description='Duration of each tool call'
+)
+queue_wait = meter.create_histogram(
+    'sana.queue.wait',
+    unit='s',
+    description='Time an item waits in the streaming queue before being consumed'
+)
+cache_requests = meter.create_counter(
+    'sana.cache.requests',
+    description='Number of cacheable tool calls by cache result (hit, miss or bypass)'
+)
+cache_latency_saved = meter.create_histogram(
+    'sana.cache.latency_saved',
+    unit='s',
+    description='Original duration of the tool call served by each semantic cache hit'
+)
+cache_tokens_saved = meter.create_histogram(
+    'sana.cache.tokens_saved',
+    description='Estimated size in tokens of the tool result served by each semantic cache hit'
+)
+loop_lag = meter.create_histogram(
+    'sana.loop.lag',
+    unit='s',
+    description='Delay between when an event loop timer was due and when it fired'
+)
+loop_blocked = meter.create_counter(
+    'sana.loop.blocked',
+    description='Number of times the event loop was blocked for longer than the threshold'
+)
+
+def setup_telemetry() -> None:
+    global span_exporter, metric_reader
+
+    from strands.telemetry import StrandsTelemetry
+
+    telemetry = StrandsTelemetry()
+
+    match settings.OTEL_EXPORTER:
+        case 'otlp':
+            telemetry.setup_otlp_exporter()
+            telemetry.setup_meter(enable_otlp_exporter=True)
+        case 'console':
+            telemetry.setup_console_exporter()
+            telemetry.setup_meter(enable_console_exporter=True)
+        case 'memory':
+            from opentelemetry.sdk.metrics import MeterProvider
+            from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+            from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+            from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+            span_exporter = InMemorySpanExporter()
+            telemetry.tracer_provider.add_span_processor(SimpleSpanProcessor(span_exporter))
+
+            metric_reader = InMemoryMetricReader()
+            metrics.set_meter_provider(MeterProvider(resource=telemetry.resource, metric_readers=[metric_reader]))
+
+    logger.info(f'OpenTelemetry configured with the {settings.OTEL_EXPORTER} exporter')
+
+@contextmanager
+def timed(name: str, histogram: Any, **attributes: Any) -> Iterator[Span]:
+    start: float = perf_counter()
+    with tracer.start_as_current_span(name, attributes=attributes) as span:
+        try:
+            yield span
+        finally:
+            histogram.record(perf_counter() - start, attributes)
+
+if settings.OTEL_ENABLED:
+    setup_telemetry()
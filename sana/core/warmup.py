@@ -0,0 +1,113 @@
+import asyncio
+import importlib
+import inspect
+import logging
+
+from sana.core.config import settings
+from sana.core.context import SanaContext
+
+logger = logging.getLogger(__name__)
+
+class WarmupState:
+    def __init__(self) -> None:
+        self.phases: dict[str, str] = {}
+        self.done: bool = False
+
+    @property
+    def warm(self) -> bool:
+        return self.done and all(status == 'ready' for status in self.phases.values())
+
+    def to_dict(self) -> dict:
+        return {'done': self.done, 'warm': self.warm, 'phases': dict(self.phases)}
+
+state = WarmupState()
+
+def _import_modules() -> None:
+    modules: list[str] = ['sana.agent', 'strands_tools.current_time']
+
+    if settings.AWS_NOVA_ACT_API_KEY:
+        modules.append('sana.agent.tools.therapists')
+
+    if settings.GOOGLE_OAUTH_PROVIDER_NAME:
+        modules.append('sana.agent.tools.calendar')
+
+    for module in modules:
+        importlib.import_module(module)
+
+    # Parse the calendar discovery document once for every session
+    if settings.GOOGLE_OAUTH_PROVIDER_NAME:
+        from sana.agent.tools.calendar import get_calendar_service
+        get_calendar_service()
+
+def _load_prompts() -> None:
+    from sana.agent.agent import load_prompt
+    load_prompt('system')
+    load_prompt('user')
+
+def _connect_gateway() -> list:
+    from sana.core.auth import get_gateway_token
+    from sana.agent.tools.gateway import get_gateway_tools
+
+    if not (gateway_token := SanaContext.get_gateway_token()):
+        gateway_token = get_gateway_token()
+        SanaContext.set_gateway_token(gateway_token)
+
+    if not settings.AWS_BEDROCK_AGENTCORE_GATEWAY_URL:
+        return []
+    return get_gateway_tools(gateway_token)
+
+async def _load_gateway() -> None:
+    tools: list = await asyncio.to_thread(_connect_gateway)
+
+    # The helpline catalogues are cached on the serving event loop
+    from sana.agent.tools.helplines import THROUGHLINE_TOOLS, catalogues
+    if any(tool.tool_name in THROUGHLINE_TOOLS for tool in tools):
+        await catalogues.refresh()
+
+        # One helpline search per country can take longer than the warm-up, which does not depend on it
+        if settings.CRISIS_FAST_PATH_ENABLED:
+            from sana.agent.tools.crisis import crisis_table
+            crisis_table.schedule_refresh()
+
+async def _run_phase(name: str, loader) -> None:
+    state.phases[name] = 'warming'
+    try:
+        if inspect.iscoroutinefunction(loader):
+            await loader()
+        else:
+            await asyncio.to_thread(loader)
+        state.phases[name] = 'ready'
+    except Exception as e:
+        # The request path retries anything that failed here
+        logger.warning(f'Warm-up phase {name} failed: {e}')
+        state.phases[name] = 'failed'
+
+async def warm_up() -> WarmupState:
+    """
+    Loads the shared resources every session needs, so that the first request
+    on a fresh container does not pay for them. Runs in the background while the
+    runtime already serves, and /ready reports on its progress.
+    """
+    phases: dict = {
+        'imports': _import_modules,
+        'prompts': _load_prompts
+    }
+
+    if settings.AWS_BEDROCK_AGENTCORE_GATEWAY_OAUTH_PROVIDER_NAME:
+        phases['gateway'] = _load_gateway
+
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(_run_phase(name, loader) for name, loader in phases.items())),
+            timeout=settings.WARMUP_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        # The phases still running were cancelled, the request path retries them like failed ones
+        for name, status in state.phases.items():
+            if status == 'warming':
+                state.phases[name] = 'failed'
+        logger.warning(f'Warm-up did not finish in {settings.WARMUP_TIMEOUT}s, phases left: {state.phases}')
+
+    state.done = True
+    logger.info(f'Warm-up finished: {state.phases}')
+    return state
@@ -1,20 +1,57 @@
 from asyncio import Task, create_task
+from contextlib import asynccontextmanager
+import asyncio
 import logging
 import uuid
 
 from pydantic import validate_call
 
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
 from bedrock_agentcore import BedrockAgentCoreApp, RequestContext
 
+from sana.core.config import settings
 from sana.core.task import agent_task
 from sana.core.auth import get_gateway_token
+from sana.core.cancellation import Cancellation
 from sana.core.context import SanaContext
 from sana.core.queue import StreamingQueue
 from sana.core.models import InvokePayload
+from sana.core.monitor import monitor
+from sana.core.warmup import state as warmup_state, warm_up
 
 logger = logging.getLogger(__name__)
 
-app = BedrockAgentCoreApp()
+@asynccontextmanager
+async def lifespan(app: BedrockAgentCoreApp):
+    if settings.LOOP_MONITOR_ENABLED:
+        monitor.start()
+
+    # Load shared resources in the background, /ready reports unavailable until they are done
+    warmup_task: Task | None = create_task(warm_up()) if settings.WARMUP_ENABLED else None
+
+    yield
+
+    if warmup_task and not warmup_task.done():
+        warmup_task.cancel()
+
+    # Buffered memory writes would be lost with the container
+    if settings.AWS_BEDROCK_AGENTCORE_MEMORY_WRITE_BEHIND:
+        from sana.agent.memory import flush_pending_writes
+        await asyncio.to_thread(flush_pending_writes)
+
+    if monitor.running:
+        await monitor.stop()
+
+app = BedrockAgentCoreApp(lifespan=lifespan)
+
+# Failed warm-up phases are retried on the request path, so only a pending warm-up is unavailable
+async def ready(request: Request) -> JSONResponse:
+    status_code: int = 200 if warmup_state.done or not settings.WARMUP_ENABLED else 503
+    return JSONResponse(warmup_state.to_dict(), status_code=status_code)
+
+app.add_route('/ready', ready, methods=['GET'])
 
 @app.entrypoint
 @validate_call
@@ -22,12 +59,14 @@ async def invoke(payload: InvokePayload, context: RequestContext):
     # Initialize context if needed
     if not SanaContext.get_gateway_token():
         logger.info('Initializing gateway token context')
-        SanaContext.set_gateway_token(get_gateway_token())
+        SanaContext.set_gateway_token(await asyncio.to_thread(get_gateway_token))
         
-    if not (queue := SanaContext.get_queue()):
-        logger.info('Initializing queue context')
-        queue = StreamingQueue()
-        SanaContext.set_queue(queue)
+    # Each invocation streams through its own queue, and can be cancelled on its own
+    queue = StreamingQueue()
+    SanaContext.set_queue(queue)
+
+    cancellation = Cancellation()
+    SanaContext.set_cancellation(cancellation)
 
     # Set a default session identifier if not provided
     session_id: str = context.session_id or str(uuid.uuid4())
@@ -41,9 +80,18 @@ async def invoke(payload: InvokePayload, context: RequestContext):
     )
 
     async def stream_output():
-        async for item in queue.stream():
-            yield item
-        await task
+        try:
+            # The runtime sends each event as a compact JSON object, see sana.core.events
+            async for event in queue.stream():
+                yield event.to_dict()
+            await task
+        finally:
+            # The client went away mid-stream, stop the agent instead of running the turn to completion
+            if not task.done():
+                logger.info(f'Client disconnected, cancelling the agent task for session {session_id}')
+                task.cancel()
+                # Releasing tool resources can block, and nothing can be awaited once the stream is cancelled
+                asyncio.get_running_loop().run_in_executor(None, cancellation.cancel)
     
     return stream_output()
 
@@ -0,0 +1,95 @@
+"""
+Agent turns cut short by a client disconnect, and how the history is closed for the next turn.
+
+Usage:
+    uv run --package sana-agent python -m unittest discover tests
+"""
+from unittest import mock
+import asyncio
+import os
+import unittest
+
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+
+from strands import tool
+
+from benchmarks.fakes import FakeMemorySessionManager, FakeStreamingModel
+from sana.agent import agent as agent_module
+from sana.agent.agent import INTERRUPTED_RESPONSE, INTERRUPTED_TOOL, Sana
+from sana.core.config import settings
+from sana.core.models import Actor
+
+@tool
+async def search_resources(query: str) -> dict:
+    """
+    Hangs until the turn is cancelled.
+
+    Args:
+        query (str): Search query.
+    """
+    await asyncio.sleep(10.0)
+    return {'resources': []}
+
+class InterruptedTurnTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.session_manager = FakeMemorySessionManager(latency=0.0)
+
+        def load_tools(sana: Sana) -> None:
+            sana.tools.append(search_resources)
+
+        def load_memory(sana: Sana) -> None:
+            sana.session_manager = self.session_manager
+
+        def create_model(**config) -> FakeStreamingModel:
+            return FakeStreamingModel(time_to_first_token=0.0, tool_names=self.tool_names, **config)
+
+        self.tool_names: list[str] = []
+        for target, name, value in (
+            (Sana, '_load_tools', load_tools),
+            (Sana, '_load_memory', load_memory),
+            (agent_module, 'SanaBedrockModel', create_model),
+            (settings, 'AWS_BEDROCK_AGENTCORE_MEMORY_WRITE_BEHIND', False),
+            (settings, 'SEMANTIC_CACHE_ENABLED', False)
+        ):
+            mock.patch.object(target, name, value).start()
+        self.addCleanup(mock.patch.stopall)
+
+    async def cancel_turn(self, sana: Sana, after: float) -> None:
+        async def consume() -> None:
+            async for _ in sana.stream('I have been feeling anxious lately'):
+                pass
+
+        turn: asyncio.Task = asyncio.create_task(consume())
+        await asyncio.sleep(after)
+        turn.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await turn
+
+    async def test_pending_tool_uses_are_answered(self) -> None:
+        self.tool_names = [search_resources.tool_name]
+        sana: Sana = await Sana.create(session_id='session-1', gateway_token='token', actor=Actor())
+
+        await self.cancel_turn(sana, after=0.2)
+
+        self.assertEqual([message['role'] for message in sana.agent.messages], ['user', 'assistant', 'user', 'assistant'])
+        [tool_result] = [block['toolResult'] for block in sana.agent.messages[2]['content']]
+        self.assertEqual((tool_result['toolUseId'], tool_result['status']), ('tool-1', 'error'))
+        self.assertEqual(tool_result['content'], [{'text': INTERRUPTED_TOOL}])
+        self.assertEqual(sana.agent.messages[3]['content'], [{'text': INTERRUPTED_RESPONSE}])
+
+        # The closing messages are persisted like the rest of the turn
+        self.assertEqual(self.session_manager.messages, sana.agent.messages)
+
+    async def test_unanswered_message_gets_a_response(self) -> None:
+        sana: Sana = await Sana.create(session_id='session-1', gateway_token='token', actor=Actor())
+        sana.agent.model.primary.time_to_first_token = 10.0
+
+        await self.cancel_turn(sana, after=0.1)
+
+        self.assertEqual([message['role'] for message in sana.agent.messages], ['user', 'assistant'])
+        self.assertEqual(sana.agent.messages[1]['content'], [{'text': INTERRUPTED_RESPONSE}])
+        self.assertEqual(self.session_manager.messages, sana.agent.messages)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Semantic cache of shareable tool results.
+
+Usage:
+    uv run --package sana-agent python -m unittest discover tests
+"""
+from time import monotonic
+from typing import Any
+from unittest import mock
+import os
+import unittest
+
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+
+from strands.types.tools import AgentTool, ToolSpec, ToolUse
+from strands.types._events import ToolResultEvent
+
+from sana.agent.cache import CachedTool, CachePolicy, SemanticCache
+from sana.core.models import Actor
+
+SEARCH_TOOL: str = 'resource-function___search-resources'
+
+# Queries about the same topic point the same way, unrelated ones are orthogonal
+VECTORS: dict[str, list[float]] = {
+    'coping with anxiety': [1.0, 0.0, 0.0],
+    'how to cope with anxiety': [0.98, 0.2, 0.0],
+    'sleep problems': [0.0, 0.0, 1.0]
+}
+
+def fake_embed(text: str) -> list[float]:
+    return VECTORS[text]
+
+class FakeTool(AgentTool):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: list[dict] = []
+        self.suffix: str = ''
+
+    @property
+    def tool_name(self) -> str:
+        return SEARCH_TOOL
+
+    @property
+    def tool_spec(self) -> ToolSpec:
+        return {'name': SEARCH_TOOL, 'description': 'Searches resources', 'inputSchema': {'json': {}}}
+
+    @property
+    def tool_type(self) -> str:
+        return 'fake'
+
+    async def stream(self, tool_use: ToolUse, invocation_state: dict[str, Any], **kwargs: Any):
+        self.calls.append(tool_use['input'])
+        query: str = tool_use['input']['query']
+        yield ToolResultEvent({'toolUseId': tool_use['toolUseId'], 'status': 'success', 'content': [{'text': f'Resources for {query}{self.suffix}'}]})
+
+class SemanticCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = SemanticCache(threshold=0.9, max_size=2, ttl=60.0, embed=fake_embed)
+
+    def test_similar_query_hits(self) -> None:
+        self.cache.store(SEARCH_TOOL, '{}', 'coping with anxiety', None, [{'text': 'anxiety'}], 1.0)
+
+        entry, _ = self.cache.lookup(SEARCH_TOOL, '{}', 'how to cope with anxiety')
+        self.assertEqual(entry.content, [{'text': 'anxiety'}])
+
+        entry, vector = self.cache.lookup(SEARCH_TOOL, '{}', 'sleep problems')
+        self.assertIsNone(entry)
+        self.assertEqual(vector, VECTORS['sleep problems'])
+
+    def test_exact_input_must_match(self) -> None:
+        self.cache.store(SEARCH_TOOL, '{"limit": 3}', 'coping with anxiety', None, [{'text': 'anxiety'}], 1.0)
+
+        entry, _ = self.cache.lookup(SEARCH_TOOL, '{"limit": 5}', 'coping with anxiety')
+        self.assertIsNone(entry)
+
+    def test_expired_entries_are_dropped(self) -> None:
+        self.cache.store(SEARCH_TOOL, '{}', 'coping with anxiety', None, [{'text': 'anxiety'}], 1.0)
+
+        with mock.patch('sana.agent.cache.monotonic', return_value=monotonic() + 61.0):
+            entry, _ = self.cache.lookup(SEARCH_TOOL, '{}', 'coping with anxiety')
+
+        self.assertIsNone(entry)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        self.cache.store(SEARCH_TOOL, '{}', 'coping with anxiety', None, [{'text': 'anxiety'}], 1.0)
+        self.cache.store(SEARCH_TOOL, '{}', 'sleep problems', None, [{'text': 'sleep'}], 1.0)
+        self.cache.lookup(SEARCH_TOOL, '{}', 'coping with anxiety')
+        self.cache.store(SEARCH_TOOL, '{}', 'how to cope with anxiety', None, [{'text': 'coping'}], 1.0)
+
+        entry, _ = self.cache.lookup(SEARCH_TOOL, '{}', 'sleep problems')
+        self.assertIsNone(entry)
+        self.assertEqual(len(self.cache), 2)
+
+class CachedToolTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.tool = FakeTool()
+        self.cache = SemanticCache(threshold=0.9, max_size=8, ttl=60.0, embed=fake_embed)
+        self.actor = Actor(id='user-1234', zip_code='90011')
+        self.cached = CachedTool(self.tool, CachePolicy(semantic_field='query'), self.actor, cache=self.cache)
+
+    async def call(self, query: str) -> dict:
+        result: dict = {}
+        async for event in self.cached.stream({'toolUseId': 'test', 'name': SEARCH_TOOL, 'input': {'query': query}}, {}):
+            if isinstance(event, ToolResultEvent):
+                result = event.tool_result
+        return result
+
+    async def test_repeated_query_is_served_from_the_cache(self) -> None:
+        await self.call('coping with anxiety')
+        result: dict = await self.call('how to cope with anxiety')
+
+        self.assertEqual(len(self.tool.calls), 1)
+        self.assertEqual(result['content'], [{'text': 'Resources for coping with anxiety'}])
+
+    async def test_personal_data_bypasses_the_cache(self) -> None:
+        for query in ('therapists near 90011', 'email me at jane@example.com', 'call +1 555 123 4567'):
+            with self.subTest(query=query):
+                await self.call(query)
+                await self.call(query)
+
+        self.assertEqual(len(self.tool.calls), 6)
+        self.assertEqual(len(self.cache), 0)
+
+    async def test_result_mentioning_the_actor_is_not_stored(self) -> None:
+        # The zip code only shows up in the result, not in the query
+        self.tool.suffix = ' around 90011'
+        await self.call('sleep problems')
+
+        self.assertEqual(len(self.cache), 0)
+
+if __name__ == '__main__':
+    unittest.main()
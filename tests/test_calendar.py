@@ -0,0 +1,144 @@
+"""
+Calendar tools, called the way the agent calls them.
+
+Usage:
+    uv run --package sana-agent python -m unittest discover tests
+"""
+from datetime import datetime, timezone
+from typing import Any
+from unittest import mock
+import os
+import unittest
+
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+
+from google.auth.exceptions import RefreshError
+
+from sana.agent.tools.calendar import GoogleCalendarTools, Interval, working_hours
+from sana.core.context import SanaContext
+
+class StubCalendarTools(GoogleCalendarTools):
+    """Skips Google authentication and serves a fixed busy slot."""
+
+    def __init__(self, busy: list[Interval], timezone: str = 'UTC') -> None:
+        super().__init__(session_id='test', timezone=timezone)
+        self.busy = busy
+
+    async def _ensure_authenticated(self) -> str | None:
+        return None
+
+    async def _query_busy(self, calendars: list[str], from_time: str, to_time: str, timezone: str) -> tuple[dict, dict]:
+        return {calendar_id: self.busy for calendar_id in calendars}, {}
+
+async def stream_tool(tool: Any, tool_input: dict) -> dict:
+    # Goes through the Strands input validation, as the agent does, instead of calling the function
+    result: dict = {}
+    async for event in tool.stream({'toolUseId': 'test', 'name': tool.tool_name, 'input': tool_input}, {}):
+        result = event
+    return result['tool_result'] if 'tool_result' in result else result
+
+class GetAvailabilityTest(unittest.IsolatedAsyncioTestCase):
+    async def test_windows_through_tool_stream(self) -> None:
+        busy: list[Interval] = [(datetime.fromisoformat('2025-10-01T10:00:00+00:00'), datetime.fromisoformat('2025-10-01T11:00:00+00:00'))]
+        tools = StubCalendarTools(busy)
+
+        result: dict = await stream_tool(tools.get_availability, {
+            'windows': [
+                {'start': '2025-10-01T09:00:00+00:00', 'end': '2025-10-01T12:00:00+00:00'},
+                {'start': '2025-10-02T09:00:00+00:00', 'end': '2025-10-02T10:00:00+00:00'}
+            ]
+        })
+
+        self.assertEqual(result['status'], 'success', result['content'])
+        self.assertIn('10:00', result['content'][0]['text'])
+        self.assertIn('2025-10-02T09:00:00+00:00', result['content'][0]['text'])
+
+def utc(value: str) -> datetime:
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+class WorkingHoursTest(unittest.TestCase):
+    def test_hours_follow_the_clock_across_dst(self) -> None:
+        # New York springs forward on Sunday 2025-03-09, 9:00 moves from 14:00 to 13:00 UTC
+        intervals: list[Interval] = working_hours(
+            (utc('2025-03-07T00:00:00'), utc('2025-03-11T23:00:00')),
+            timezone='America/New_York',
+            start_hour=9,
+            end_hour=18
+        )
+
+        self.assertEqual(intervals, [
+            (utc('2025-03-07T14:00:00'), utc('2025-03-07T23:00:00')),
+            (utc('2025-03-10T13:00:00'), utc('2025-03-10T22:00:00')),
+            (utc('2025-03-11T13:00:00'), utc('2025-03-11T22:00:00'))
+        ])
+
+    def test_weekends_and_window_bounds(self) -> None:
+        intervals: list[Interval] = working_hours(
+            (utc('2025-11-01T15:00:00'), utc('2025-11-03T15:30:00')),
+            timezone='America/New_York',
+            start_hour=9,
+            end_hour=18,
+            include_weekends=True
+        )
+
+        # Saturday starts inside working hours, the clocks fall back on Sunday and the window ends on Monday
+        self.assertEqual(intervals, [
+            (utc('2025-11-01T15:00:00'), utc('2025-11-01T22:00:00')),
+            (utc('2025-11-02T14:00:00'), utc('2025-11-02T23:00:00')),
+            (utc('2025-11-03T14:00:00'), utc('2025-11-03T15:30:00'))
+        ])
+
+class FindFreeSlotsTest(unittest.IsolatedAsyncioTestCase):
+    async def test_slots_across_dst(self) -> None:
+        busy: list[Interval] = [(utc('2025-03-10T13:00:00'), utc('2025-03-10T14:10:00'))]
+        tools = StubCalendarTools(busy, timezone='America/New_York')
+
+        result: dict = await stream_tool(tools.find_free_slots, {
+            'from_time': '2025-03-07T17:00:00-05:00',
+            'to_time': '2025-03-11T00:00:00-04:00',
+            'duration_minutes': 30,
+            'limit': 3
+        })
+
+        # The busy slot ends at 10:10 local, so the first Monday slot is aligned to 10:15
+        self.assertEqual(result['status'], 'success', result['content'])
+        self.assertEqual(result['content'][0]['text'], str([
+            {'start': '2025-03-07T17:00:00-05:00', 'end': '2025-03-07T17:30:00-05:00'},
+            {'start': '2025-03-07T17:30:00-05:00', 'end': '2025-03-07T18:00:00-05:00'},
+            {'start': '2025-03-10T10:15:00-04:00', 'end': '2025-03-10T10:45:00-04:00'}
+        ]))
+
+class ExpiredTokenCalendarTools(GoogleCalendarTools):
+    """Rejects the first token it is given, as Google does once an access token expires."""
+
+    def __init__(self) -> None:
+        super().__init__(session_id='expired', timezone='UTC')
+        self.tokens: list[str] = []
+
+    async def _send(self, request: Any) -> Any:
+        self.tokens.append(self.credentials.token)
+        if len(self.tokens) == 1:
+            raise RefreshError('The credentials do not contain the necessary fields need to refresh the access token.')
+        return {'id': 'event', 'htmlLink': 'https://calendar.google.com/event'}
+
+class ExpiredTokenTest(unittest.IsolatedAsyncioTestCase):
+    def tearDown(self) -> None:
+        SanaContext.clear_google_token('expired')
+
+    async def test_expired_token_is_replaced(self) -> None:
+        tools = ExpiredTokenCalendarTools()
+
+        with mock.patch('sana.agent.tools.calendar.get_google_token', side_effect=['expired-token', 'new-token']):
+            result: dict = await stream_tool(tools.create_calendar_event, {
+                'summary': 'Therapy session',
+                'description': None,
+                'start_time': '2025-10-01T09:00:00Z',
+                'end_time': '2025-10-01T10:00:00Z'
+            })
+
+        self.assertIn('Event created', result['content'][0]['text'])
+        self.assertEqual(tools.tokens, ['expired-token', 'new-token'])
+        self.assertEqual(SanaContext.get_google_token('expired'), 'new-token')
+
+if __name__ == '__main__':
+    unittest.main()
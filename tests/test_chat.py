@@ -0,0 +1,53 @@
+"""
+Decoding of the runtime stream in the chat app.
+
+Usage:
+    uv run --package sana-app python -m unittest tests.test_chat
+"""
+import json
+import os
+import unittest
+
+os.environ.setdefault('AWS_COGNITO_DOMAIN', 'sana.auth.us-east-1.amazoncognito.com')
+os.environ.setdefault('AWS_COGNITO_APP_CLIENT_ID', 'client-id')
+
+try:
+    from app.chat import SanaChat
+except ImportError as e:
+    # The chat app is a separate workspace package, the agent environment does not install streamlit
+    raise unittest.SkipTest(f'The chat app dependencies are not installed: {e}')
+
+def sse(event: object) -> str:
+    return f'data: {json.dumps(event)}'
+
+class DecodeEventTest(unittest.TestCase):
+    def setUp(self) -> None:
+        # Decoding does not touch the session state
+        self.chat: SanaChat = SanaChat.__new__(SanaChat)
+
+    def test_runtime_events_are_decoded(self) -> None:
+        # The event protocol of sana.core.events
+        for event in (
+            {'t': 'text', 'd': 'Hello'},
+            {'t': 'tool_end', 'id': 'tooluse_1', 'n': 'search_therapists', 's': 'success', 'ms': 2140},
+            {'t': 'done', 'ms': 6120, 'ttft': 830}
+        ):
+            with self.subTest(event=event):
+                self.assertEqual(self.chat._decode_event(sse(event)), event)
+
+    def test_line_without_prefix_is_decoded(self) -> None:
+        self.assertEqual(self.chat._decode_event('{"t": "text", "d": "Hi"}'), {'t': 'text', 'd': 'Hi'})
+
+    def test_plain_string_is_text(self) -> None:
+        self.assertEqual(self.chat._decode_event(sse('Hello')), {'t': 'text', 'd': 'Hello'})
+
+    def test_runtime_error_is_an_error_event(self) -> None:
+        self.assertEqual(self.chat._decode_event(sse({'error': 'Throttled'})), {'t': 'error', 'm': 'Throttled'})
+
+    def test_malformed_lines_are_skipped(self) -> None:
+        for line in ('data: {"t": "text", "d": "Hel', ': keep-alive', 'data: 42', 'data: null', 'data: [1, 2]'):
+            with self.subTest(line=line):
+                self.assertIsNone(self.chat._decode_event(line))
+
+if __name__ == '__main__':
+    unittest.main()
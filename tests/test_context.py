@@ -0,0 +1,69 @@
+"""
+Session agent cache, as concurrent requests for the same session use it.
+
+Usage:
+    uv run --package sana-agent python -m unittest discover tests
+"""
+from typing import Any
+import asyncio
+import os
+import unittest
+
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+
+from sana.core.context import SanaContext
+
+class GetOrBuildAgentTest(unittest.IsolatedAsyncioTestCase):
+    def tearDown(self) -> None:
+        SanaContext._agents.pop('session', None)
+
+    async def test_concurrent_requests_share_one_build(self) -> None:
+        builds: list[object] = []
+
+        async def build() -> Any:
+            await asyncio.sleep(0.01)
+            builds.append(agent := object())
+            return agent
+
+        first, second = await asyncio.gather(
+            SanaContext.get_or_build_agent('session', build),
+            SanaContext.get_or_build_agent('session', build)
+        )
+
+        self.assertEqual(len(builds), 1)
+        self.assertIs(first, second)
+        self.assertIs(SanaContext.get_agent('session'), first)
+
+    async def test_failed_build_is_retried(self) -> None:
+        async def fail() -> Any:
+            raise RuntimeError('The memory API is unavailable')
+
+        with self.assertRaises(RuntimeError):
+            await SanaContext.get_or_build_agent('session', fail)
+
+        agent: object = object()
+
+        async def build() -> Any:
+            return agent
+
+        self.assertIs(await SanaContext.get_or_build_agent('session', build), agent)
+
+    async def test_cancelled_request_does_not_cancel_the_build(self) -> None:
+        started: asyncio.Event = asyncio.Event()
+        agent: object = object()
+
+        async def build() -> Any:
+            started.set()
+            await asyncio.sleep(0.01)
+            return agent
+
+        first: asyncio.Task = asyncio.create_task(SanaContext.get_or_build_agent('session', build))
+        await started.wait()
+        second: asyncio.Task = asyncio.create_task(SanaContext.get_or_build_agent('session', build))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        self.assertIs(await second, agent)
+
+if __name__ == '__main__':
+    unittest.main()
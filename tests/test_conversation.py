@@ -0,0 +1,98 @@
+"""
+Conversation history compaction to a token budget.
+
+Usage:
+    uv run --package sana-agent python -m unittest discover tests
+"""
+from types import SimpleNamespace
+import os
+import unittest
+
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+
+from strands.agent.conversation_manager import SlidingWindowConversationManager
+from strands.types.content import Messages
+
+from sana.agent.conversation import ELIDED_PREFIX, CompactingConversationManager, estimate_tokens
+
+def turn(index: int, result_chars: int = 2000, answer_chars: int = 800) -> Messages:
+    # One user turn with a tool call, its result and the assistant answer
+    return [
+        {'role': 'user', 'content': [{'text': f'Question {index}'}]},
+        {'role': 'assistant', 'content': [{'toolUse': {'toolUseId': f'tool-{index}', 'name': 'search_resources', 'input': {}}}]},
+        {'role': 'user', 'content': [{'toolResult': {'toolUseId': f'tool-{index}', 'status': 'success', 'content': [{'text': 'r' * result_chars}]}}]},
+        {'role': 'assistant', 'content': [{'text': 'a' * answer_chars}]}
+    ]
+
+def conversation(turns: int, **kwargs: int) -> Messages:
+    return [message for index in range(turns) for message in turn(index, **kwargs)]
+
+class CompactingConversationManagerTest(unittest.TestCase):
+    def test_history_within_budget_is_kept(self) -> None:
+        agent = SimpleNamespace(messages=conversation(2))
+        manager = CompactingConversationManager(token_budget=10_000)
+
+        manager.apply_management(agent)
+
+        self.assertEqual(agent.messages, conversation(2))
+
+    def test_old_tool_results_and_answers_are_elided(self) -> None:
+        agent = SimpleNamespace(messages=conversation(5))
+        manager = CompactingConversationManager(token_budget=3000, recent_turns=2, excerpt_chars=100)
+
+        manager.apply_management(agent)
+
+        self.assertEqual(len(agent.messages), 20)
+        self.assertLessEqual(estimate_tokens(agent.messages), 3000)
+
+        old_result: str = agent.messages[2]['content'][0]['toolResult']['content'][0]['text']
+        self.assertTrue(old_result.startswith(ELIDED_PREFIX))
+        self.assertEqual(agent.messages[3]['content'][0]['text'], 'a' * 100 + '...')
+
+        # The two most recent turns are replayed in full
+        self.assertEqual(agent.messages[-8:], conversation(5)[-8:])
+
+    def test_oldest_turns_are_dropped_when_eliding_is_not_enough(self) -> None:
+        agent = SimpleNamespace(messages=conversation(5))
+        manager = CompactingConversationManager(token_budget=1500, recent_turns=2, excerpt_chars=100)
+
+        manager.apply_management(agent)
+
+        # Whole turns go, so every tool use keeps its result
+        self.assertEqual(agent.messages, conversation(5)[-8:])
+        self.assertEqual(manager.removed_message_count, 12)
+
+    def test_recent_turns_are_never_dropped(self) -> None:
+        agent = SimpleNamespace(messages=conversation(3))
+        manager = CompactingConversationManager(token_budget=100, recent_turns=2)
+
+        manager.apply_management(agent)
+
+        self.assertEqual(agent.messages, conversation(3)[-8:])
+
+    def test_elided_results_are_not_elided_again(self) -> None:
+        agent = SimpleNamespace(messages=conversation(5))
+        manager = CompactingConversationManager(token_budget=3000, recent_turns=2, excerpt_chars=100)
+
+        manager.apply_management(agent)
+        elided: str = agent.messages[2]['content'][0]['toolResult']['content'][0]['text']
+        agent.messages.extend(turn(5))
+        manager.apply_management(agent)
+
+        self.assertEqual(agent.messages[2]['content'][0]['toolResult']['content'][0]['text'], elided)
+
+    def test_restore_from_sliding_window_session(self) -> None:
+        previous = SlidingWindowConversationManager(window_size=40)
+        previous.removed_message_count = 6
+
+        manager = CompactingConversationManager()
+        manager.restore_from_session(previous.get_state())
+
+        self.assertEqual(manager.removed_message_count, 6)
+
+    def test_restore_from_other_manager_fails(self) -> None:
+        with self.assertRaises(ValueError):
+            CompactingConversationManager().restore_from_session({'__name__': 'SummarizingConversationManager', 'removed_message_count': 0})
+
+if __name__ == '__main__':
+    unittest.main()
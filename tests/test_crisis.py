@@ -0,0 +1,107 @@
+"""
+Crisis fast path: risk detection and the per-country crisis contacts.
+
+Usage:
+    uv run --package sana-agent python -m unittest discover tests
+"""
+from typing import Any
+from unittest import mock
+import os
+import unittest
+
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+
+from sana.agent.tools import helplines
+from sana.agent.tools.crisis import CRISIS_CONTACTS, CrisisTable, detect_risk
+
+# Helpline search results, in the ThroughLine format
+HELPLINES: dict[str, Any] = {
+    # Website only, the 988 Lifeline takes calls and texts
+    'US': [{'name': '988 Suicide & Crisis Lifeline', 'website': 'https://988lifeline.org'}],
+    'NZ': {'helplines': [
+        {'name': '1737, Need to talk?', 'phoneNumber': '1737', 'smsNumber': '1737', 'country': {'code': 'NZ', 'emergencyNumber': '111'}}
+    ]},
+    'MX': [
+        {'name': 'Línea de la Vida', 'phoneNumber': '800 911 2000', 'webChatUrl': 'https://lalineadelavida.org.mx'},
+        {'name': 'No contact methods'}
+    ],
+    'GB': [
+        {'name': 'Samaritans', 'phoneNumber': '116 123', 'whatsappUrl': 'https://wa.me/samaritans'},
+        {'name': 'Shout', 'smsNumber': '85258'}
+    ],
+    'FR': []
+}
+COUNTRIES: list[dict] = [
+    {'code': 'US', 'emergencyNumber': '911'},
+    {'code': 'nz'},
+    {'code': 'MX', 'emergencyNumber': '911'},
+    {'code': 'GB'},
+    {'code': 'FR', 'emergencyNumber': '112'}
+]
+
+class DetectRiskTest(unittest.TestCase):
+    def test_risk_statements(self) -> None:
+        for text in (
+            'I have been having suicidal thoughts',
+            'Sometimes I think about killing myself',
+            'I just want to end it all',
+            'I want to die',
+            'I self-harm when things get bad',
+            'My partner abuses me',
+            'I am being abused at home',
+            'This is an emergency, please help',
+            'I’m having an emergency'
+        ):
+            with self.subTest(text=text):
+                self.assertTrue(detect_risk(text))
+
+    def test_generic_mentions(self) -> None:
+        for text in (
+            'Do you have substance abuse resources?',
+            'Is this an emergency room question?',
+            'I work in emergency medicine and feel burned out',
+            'My dog died last week',
+            'I want to dye my hair to feel better',
+            'How do I support a friend in an abusive relationship?'
+        ):
+            with self.subTest(text=text):
+                self.assertFalse(detect_risk(text))
+
+class CrisisTableTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        async def get_catalogues() -> Any:
+            return mock.Mock(countries=COUNTRIES)
+
+        async def search_helplines(country_code: str, topic: str, limit: int) -> dict:
+            return {'country_code': country_code, 'topic': topic, 'helplines': HELPLINES[country_code]}
+
+        self.table = CrisisTable(ttl=60.0)
+        with mock.patch.object(helplines.catalogues, 'get', get_catalogues), \
+                mock.patch.object(helplines, 'search_helplines', search_helplines):
+            await self.table.refresh()
+
+    def test_baseline_is_kept_over_fewer_contact_methods(self) -> None:
+        self.assertEqual(self.table.get('US'), CRISIS_CONTACTS['US'])
+
+    def test_contact_fields_are_read(self) -> None:
+        self.assertEqual(self.table.get('MX').to_markdown().splitlines()[:2], [
+            '> If you are in immediate danger, please call **911** now.',
+            '> You can also reach **Línea de la Vida** at any time: call 800 911 2000 or chat online at https://lalineadelavida.org.mx'
+        ])
+
+    def test_helplines_covering_the_baseline_replace_it(self) -> None:
+        contacts = self.table.get('GB')
+
+        self.assertEqual(contacts.emergency_number, '999')
+        self.assertEqual([helpline.name for helpline in contacts.helplines], ['Samaritans', 'Shout'])
+
+    def test_emergency_number_comes_from_the_catalogue(self) -> None:
+        self.assertEqual(self.table.get('nz').emergency_number, '111')
+        self.assertEqual(self.table.get('FR').emergency_number, '112')
+        self.assertEqual(self.table.get('FR').helplines, [])
+
+    def test_unknown_country_gets_the_generic_contacts(self) -> None:
+        self.assertEqual(self.table.get('BR').emergency_number, 'your local emergency number')
+
+if __name__ == '__main__':
+    unittest.main()
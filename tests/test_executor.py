@@ -0,0 +1,147 @@
+"""
+Bounded concurrent tool execution: per-tool timeouts, the concurrency limit, and cancellation
+with the turn. These run the executor under a real strands agent, so they also break when the
+private executor hooks it overrides change.
+
+Usage:
+    uv run --package sana-agent python -m unittest discover tests
+"""
+from time import perf_counter
+from collections.abc import AsyncGenerator
+from typing import Any
+import asyncio
+import os
+import unittest
+
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+
+from strands import Agent, tool
+from strands.models import Model
+from strands.types.content import Messages
+
+from sana.agent.executor import TOOL_END, BoundedToolExecutor
+
+class ToolsModel(Model):
+    """Requests every tool in `tool_names` in its first response, then answers with text."""
+
+    def __init__(self, tool_names: list[str]) -> None:
+        self.tool_names = tool_names
+
+    def update_config(self, **model_config: Any) -> None:
+        pass
+
+    def get_config(self) -> Any:
+        return {}
+
+    async def structured_output(self, output_model: Any, prompt: Messages, system_prompt: str | None = None, **kwargs: Any) -> AsyncGenerator[dict, None]:
+        raise NotImplementedError('ToolsModel does not support structured output')
+        yield {}
+
+    async def stream(self, messages: Messages, tool_specs: list | None = None, system_prompt: str | None = None, **kwargs: Any) -> AsyncGenerator[dict, None]:
+        yield {'messageStart': {'role': 'assistant'}}
+
+        if not any('toolResult' in content for content in messages[-1]['content']):
+            for index, tool_name in enumerate(self.tool_names):
+                yield {'contentBlockStart': {'start': {'toolUse': {'toolUseId': f'tool-{index}', 'name': tool_name}}}}
+                yield {'contentBlockDelta': {'delta': {'toolUse': {'input': '{}'}}}}
+                yield {'contentBlockStop': {}}
+            yield {'messageStop': {'stopReason': 'tool_use'}}
+            return
+
+        yield {'contentBlockDelta': {'delta': {'text': 'Done'}}}
+        yield {'contentBlockStop': {}}
+        yield {'messageStop': {'stopReason': 'end_turn'}}
+
+class BoundedToolExecutorTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.running: int = 0
+        self.peak: int = 0
+        self.cancelled: list[str] = []
+
+    def sleeper(self, name: str, seconds: float) -> Any:
+        @tool(name=name)
+        async def sleep() -> str:
+            """Sleeps, then returns."""
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            try:
+                await asyncio.sleep(seconds)
+            except asyncio.CancelledError:
+                self.cancelled.append(name)
+                raise
+            finally:
+                self.running -= 1
+            return name
+
+        return sleep
+
+    def agent(self, tools: list, executor: BoundedToolExecutor) -> Agent:
+        return Agent(
+            model=ToolsModel([tool.tool_name for tool in tools]),
+            tools=tools,
+            tool_executor=executor,
+            callback_handler=None
+        )
+
+    def tool_results(self, agent: Agent) -> dict[str, dict]:
+        return {
+            content['toolResult']['toolUseId']: content['toolResult']
+            for message in agent.messages for content in message['content'] if 'toolResult' in content
+        }
+
+    async def test_tools_run_concurrently(self) -> None:
+        agent: Agent = self.agent([self.sleeper('first', 0.2), self.sleeper('second', 0.2)], BoundedToolExecutor())
+
+        start: float = perf_counter()
+        await agent.invoke_async('Hi')
+
+        self.assertLess(perf_counter() - start, 0.35)
+        self.assertEqual(self.peak, 2)
+        self.assertEqual([result['status'] for result in self.tool_results(agent).values()], ['success', 'success'])
+
+    async def test_concurrency_is_bounded(self) -> None:
+        tools: list = [self.sleeper(name, 0.05) for name in ('first', 'second', 'third')]
+        await self.agent(tools, BoundedToolExecutor(max_concurrency=2)).invoke_async('Hi')
+
+        self.assertEqual(self.peak, 2)
+
+    async def test_slow_tool_times_out(self) -> None:
+        agent: Agent = self.agent(
+            [self.sleeper('fast', 0.0), self.sleeper('slow', 1.0)],
+            BoundedToolExecutor(timeouts={'slow': 0.1})
+        )
+
+        ends: dict[str, str] = {}
+        with self.assertLogs('sana.agent.executor', level='WARNING'):
+            async for event in agent.stream_async('Hi'):
+                if 'tool_stream_event' in event and TOOL_END in (data := event['tool_stream_event']['data']):
+                    ends[event['tool_stream_event']['tool_use']['name']] = data[TOOL_END]['status']
+
+        self.assertEqual(ends, {'fast': 'success', 'slow': 'timeout'})
+        self.assertEqual(self.cancelled, ['slow'])
+
+        result: dict = self.tool_results(agent)['tool-1']
+        self.assertEqual(result['status'], 'error')
+        self.assertEqual(result['content'], [{'text': 'The tool did not respond within 0 seconds, it may be retried later.'}])
+
+    async def test_cancelled_turn_cancels_its_tools(self) -> None:
+        executor = BoundedToolExecutor()
+        agent: Agent = self.agent([self.sleeper('first', 1.0), self.sleeper('second', 1.0)], executor)
+
+        async def consume() -> None:
+            async for _ in agent.stream_async('Hi'):
+                pass
+
+        turn: asyncio.Task = asyncio.create_task(consume())
+        await asyncio.sleep(0.1)
+        turn.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await turn
+        await asyncio.sleep(0)
+
+        self.assertEqual(sorted(self.cancelled), ['first', 'second'])
+        self.assertEqual(executor._tasks, set())
+
+if __name__ == '__main__':
+    unittest.main()
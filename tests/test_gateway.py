@@ -0,0 +1,114 @@
+"""
+Shared AgentCore Gateway connection, and how it recovers from a dropped connection or an
+expired token.
+
+Usage:
+    uv run --package sana-agent python -m unittest discover tests
+"""
+from typing import Any
+from unittest import mock
+import os
+import unittest
+
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+
+from mcp.types import Tool as MCPTool
+from strands.types.exceptions import MCPClientInitializationError
+
+from sana.agent.tools import gateway
+from sana.core.context import SanaContext
+
+class FakeMCPClient:
+    """Gateway connection that fails its calls once `broken`, as on an expired token."""
+
+    clients: list['FakeMCPClient'] = []
+
+    def __init__(self, transport: Any) -> None:
+        self.broken: bool = False
+        self.stopped: bool = False
+        self.calls: list[str] = []
+        FakeMCPClient.clients.append(self)
+
+    def start(self) -> None:
+        pass
+
+    def stop(self, *args: Any) -> None:
+        self.stopped = True
+
+    def list_tools_sync(self) -> list:
+        tool = MCPTool(name='resource-function___search-resources', inputSchema={'type': 'object'})
+        return [gateway.MCPAgentTool(tool, self)]
+
+    async def call_tool_async(self, tool_use_id: str, name: str, arguments: dict | None = None) -> dict:
+        if self.stopped:
+            raise MCPClientInitializationError('the client session is not running')
+
+        self.calls.append(name)
+        if self.broken:
+            return {'toolUseId': tool_use_id, 'status': 'error', 'content': [{'text': 'Tool execution failed: 401 Unauthorized'}]}
+        return {'toolUseId': tool_use_id, 'status': 'success', 'content': [{'text': '{"resources": []}'}]}
+
+class GatewayReconnectTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        FakeMCPClient.clients = []
+        mock.patch.object(gateway, 'MCPClient', FakeMCPClient).start()
+        mock.patch('sana.core.auth.get_gateway_token', return_value='new-token').start()
+        self.addCleanup(mock.patch.stopall)
+        self.addCleanup(self.disconnect)
+
+    def disconnect(self) -> None:
+        gateway._client, gateway._client_token, gateway._tools = None, None, None
+        SanaContext._gateway_token = None
+
+    async def call(self, tool: Any) -> dict:
+        result: dict = {}
+        async for event in tool.stream({'toolUseId': 'tool-1', 'name': tool.tool_name, 'input': {'query': 'anxiety'}}, {}):
+            result = event.tool_result
+        return result
+
+    async def test_tools_are_shared_between_agents(self) -> None:
+        self.assertIs(gateway.get_gateway_tools('token'), gateway.get_gateway_tools('token'))
+        self.assertEqual(len(FakeMCPClient.clients), 1)
+
+    async def test_failed_connection_is_replaced(self) -> None:
+        [tool] = gateway.get_gateway_tools('token')
+        first: FakeMCPClient = FakeMCPClient.clients[0]
+        first.broken = True
+
+        with self.assertLogs('sana.agent.tools.gateway', level='WARNING'):
+            result: dict = await self.call(tool)
+
+        self.assertEqual(result['status'], 'success')
+        self.assertTrue(first.stopped)
+        self.assertEqual(len(FakeMCPClient.clients), 2)
+        self.assertEqual(SanaContext.get_gateway_token(), 'new-token')
+
+        # Agents built before the reconnect keep using the new connection
+        self.assertEqual(await gateway.call_gateway_tool(tool.tool_name), {'resources': []})
+        self.assertEqual(FakeMCPClient.clients[1].calls, [tool.tool_name, tool.tool_name])
+
+    async def test_tool_errors_do_not_reconnect(self) -> None:
+        [tool] = gateway.get_gateway_tools('token')
+
+        async def fail(tool_use_id: str, name: str, arguments: dict | None = None) -> dict:
+            return {'toolUseId': tool_use_id, 'status': 'error', 'content': [{'text': 'Unknown topic'}]}
+
+        FakeMCPClient.clients[0].call_tool_async = fail
+        result: dict = await self.call(tool)
+
+        self.assertEqual(result['content'], [{'text': 'Unknown topic'}])
+        self.assertEqual(len(FakeMCPClient.clients), 1)
+
+    async def test_persistent_failure_is_returned(self) -> None:
+        [tool] = gateway.get_gateway_tools('token')
+        FakeMCPClient.clients[0].broken = True
+
+        with mock.patch.object(FakeMCPClient, 'start', lambda self: setattr(self, 'broken', True)), \
+                self.assertLogs('sana.agent.tools.gateway', level='WARNING'):
+            result: dict = await self.call(tool)
+
+        self.assertEqual(result['status'], 'error')
+        self.assertEqual(len(FakeMCPClient.clients), 2)
+
+if __name__ == '__main__':
+    unittest.main()
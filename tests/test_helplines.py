@@ -0,0 +1,107 @@
+"""
+ThroughLine catalogue cache and the helpline search built on it.
+
+Usage:
+    uv run --package sana-agent python -m unittest discover tests
+"""
+from time import monotonic
+from typing import Any
+from unittest import mock
+import asyncio
+import os
+import unittest
+
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+
+from sana.agent.tools import helplines
+from sana.agent.tools.helplines import COUNTRIES_TOOL, HELPLINES_TOOL, TOPICS_TOOL, CatalogueCache
+
+COUNTRIES: dict = {'countries': [{'code': 'us', 'name': 'United States'}, {'code': 'NZ', 'name': 'New Zealand'}, 'Unknown']}
+TOPICS: list = [{'code': 'suicide', 'name': 'Suicide'}, {'code': 'abuse', 'name': 'Abuse & domestic violence'}]
+
+class FakeGateway:
+    """Serves the ThroughLine tools, failing every call once `broken`."""
+
+    def __init__(self) -> None:
+        self.payloads: dict[str, Any] = {COUNTRIES_TOOL: COUNTRIES, TOPICS_TOOL: TOPICS, HELPLINES_TOOL: {'helplines': []}}
+        self.calls: list[tuple[str, dict | None]] = []
+        self.broken: bool = False
+
+    async def __call__(self, name: str, arguments: dict | None = None) -> Any:
+        self.calls.append((name, arguments))
+        if self.broken:
+            raise RuntimeError('The AgentCore Gateway connection is not initialized')
+        return self.payloads[name]
+
+class CatalogueCacheTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.gateway = FakeGateway()
+        mock.patch.object(helplines, 'call_gateway_tool', self.gateway).start()
+        self.addCleanup(mock.patch.stopall)
+
+        self.cache = CatalogueCache(ttl=60.0)
+
+    async def test_catalogues_are_parsed(self) -> None:
+        await self.cache.get()
+
+        # Both the wrapped and the bare list payloads are read, and items that are not objects skipped
+        self.assertEqual([country['code'] for country in self.cache.countries], ['us', 'NZ'])
+        self.assertEqual([topic['name'] for topic in self.cache.topics], ['Suicide', 'Abuse & domestic violence'])
+
+    async def test_fresh_catalogues_are_not_fetched_again(self) -> None:
+        await self.cache.get()
+        await self.cache.get()
+
+        self.assertEqual(len(self.gateway.calls), 2)
+
+    async def test_stale_catalogues_are_served_while_refreshing(self) -> None:
+        await self.cache.get()
+        self.gateway.payloads[TOPICS_TOOL] = [*TOPICS, {'code': 'grief', 'name': 'Grief & loss'}]
+
+        with mock.patch.object(helplines, 'monotonic', return_value=monotonic() + 61.0):
+            cache: CatalogueCache = await self.cache.get()
+            self.assertEqual(len(cache.topics), 2)
+            await self.cache._refresh_task
+
+        self.assertEqual(len(self.cache.topics), 3)
+
+    async def test_failed_refresh_keeps_the_previous_catalogues(self) -> None:
+        await self.cache.get()
+        etag: str = self.cache.etag
+        self.gateway.broken = True
+
+        with mock.patch.object(helplines, 'monotonic', return_value=monotonic() + 61.0), \
+                self.assertLogs('sana.agent.tools.helplines', level='WARNING'):
+            await self.cache.refresh()
+
+        self.assertEqual(len(self.cache.countries), 2)
+        self.assertEqual(self.cache.etag, etag)
+
+    async def test_failed_first_load_raises(self) -> None:
+        self.gateway.broken = True
+
+        with self.assertRaises(RuntimeError):
+            await self.cache.get()
+
+    async def test_countries_and_topics_are_resolved(self) -> None:
+        await self.cache.get()
+
+        self.assertEqual(self.cache.resolve_country('nz'), 'NZ')
+        self.assertEqual(self.cache.resolve_country('FR'), 'US')
+        self.assertEqual(self.cache.resolve_topic('suicide'), 'Suicide')
+        self.assertEqual(self.cache.resolve_topic('suicidal thoughts'), 'Suicide')
+        self.assertEqual(self.cache.resolve_topic('abusive partner'), 'Abuse & domestic violence')
+        self.assertIsNone(self.cache.resolve_topic('exam stress'))
+
+class SearchHelplinesTest(unittest.IsolatedAsyncioTestCase):
+    async def test_search_resolves_its_arguments(self) -> None:
+        gateway = FakeGateway()
+        with mock.patch.object(helplines, 'call_gateway_tool', gateway), \
+                mock.patch.object(helplines, 'catalogues', CatalogueCache(ttl=60.0)):
+            result: dict = await helplines.search_helplines(country_code='fr', topic='suicidal thoughts', contact_method='sms')
+
+        self.assertEqual(result, {'country_code': 'US', 'topic': 'Suicide', 'helplines': {'helplines': []}})
+        self.assertEqual(gateway.calls[-1], (HELPLINES_TOOL, {'country_code': 'US', 'limit': 2, 'topic': 'Suicide', 'contact_method': 'sms'}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Write-behind buffering of the session memory writes.
+
+Usage:
+    uv run --package sana-agent python -m unittest discover tests
+"""
+from typing import Any
+from unittest import mock
+import os
+import unittest
+
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+
+from strands.session import SessionManager
+from strands.types.content import Message
+
+from sana.agent.memory import WriteBehindSessionManager
+
+def message(text: str) -> Message:
+    return {'role': 'user', 'content': [{'text': text}]}
+
+class RecordingSessionManager(SessionManager):
+    """Records the writes it receives, failing the first `failures` of them."""
+
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.writes: list[tuple[str, Any]] = []
+        self.attempts: int = 0
+
+    def _record(self, kind: str, value: Any) -> None:
+        self.attempts += 1
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('The memory API is unavailable')
+        self.writes.append((kind, value))
+
+    def initialize(self, agent: Any, **kwargs: Any) -> None:
+        pass
+
+    def append_message(self, message: Message, agent: Any, **kwargs: Any) -> None:
+        self._record('append', message['content'][0]['text'])
+
+    def redact_latest_message(self, redact_message: Message, agent: Any, **kwargs: Any) -> None:
+        self._record('redact', redact_message['content'][0]['text'])
+
+    def sync_agent(self, agent: Any, **kwargs: Any) -> None:
+        self._record('sync', None)
+
+class WriteBehindSessionManagerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        # Flushes run inline, so the tests decide when they happen
+        patcher = mock.patch.object(WriteBehindSessionManager, 'schedule_flush', autospec=True)
+        self.schedule_flush = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.sleep = mock.patch('sana.agent.memory.sleep').start()
+        self.addCleanup(mock.patch.stopall)
+
+    def manager(self, inner: RecordingSessionManager, **kwargs: Any) -> WriteBehindSessionManager:
+        manager = WriteBehindSessionManager(inner, session_id=self.id(), **kwargs)
+        manager.initialize(agent=mock.Mock())
+        return manager
+
+    def test_writes_are_buffered_until_flushed(self) -> None:
+        inner = RecordingSessionManager()
+        manager = self.manager(inner)
+
+        manager.append_message(message('Hello'), agent=None)
+        manager.sync_agent(agent=None)
+        manager.append_message(message('How are you?'), agent=None)
+        manager.sync_agent(agent=None)
+        manager.redact_latest_message(message('[redacted]'), agent=None)
+
+        self.assertEqual(inner.writes, [])
+        self.assertEqual(manager.pending, 4)
+
+        manager.flush()
+
+        # Agent state syncs are coalesced into one per flush
+        self.assertEqual(inner.writes, [('append', 'Hello'), ('sync', None), ('append', 'How are you?'), ('redact', '[redacted]')])
+        self.assertEqual(manager.pending, 0)
+
+    def test_full_batch_schedules_a_flush(self) -> None:
+        manager = self.manager(RecordingSessionManager(), batch_size=2)
+
+        manager.append_message(message('Hello'), agent=None)
+        self.schedule_flush.assert_not_called()
+
+        manager.append_message(message('How are you?'), agent=None)
+        self.schedule_flush.assert_called_once_with(manager)
+
+    def test_failed_write_is_retried_with_backoff(self) -> None:
+        inner = RecordingSessionManager(failures=2)
+        manager = self.manager(inner, retries=3)
+
+        manager.append_message(message('Hello'), agent=None)
+        with self.assertLogs('sana.agent.memory', level='WARNING'):
+            manager.flush()
+
+        self.assertEqual(inner.writes, [('append', 'Hello')])
+        self.assertEqual(inner.attempts, 3)
+        self.assertEqual([call.args[0] for call in self.sleep.call_args_list], [0.2, 0.4])
+
+    def test_failed_writes_are_kept_in_order_for_the_next_flush(self) -> None:
+        inner = RecordingSessionManager(failures=2)
+        manager = self.manager(inner, retries=1)
+
+        manager.append_message(message('Hello'), agent=None)
+        manager.append_message(message('How are you?'), agent=None)
+        with self.assertLogs('sana.agent.memory', level='ERROR'):
+            manager.flush()
+
+        self.assertEqual(inner.writes, [])
+        self.assertEqual(manager.pending, 2)
+
+        manager.append_message(message('Are you there?'), agent=None)
+        manager.flush()
+
+        self.assertEqual(inner.writes, [('append', 'Hello'), ('append', 'How are you?'), ('append', 'Are you there?')])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Model routing between the primary and the fast model.
+
+Usage:
+    uv run --package sana-agent python -m unittest discover tests
+"""
+import os
+import unittest
+
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+
+from strands.types.content import Message, Messages
+
+from sana.agent.model import estimate_cost, select_route
+
+def user(text: str) -> Message:
+    return {'role': 'user', 'content': [{'text': text}]}
+
+def assistant(text: str) -> Message:
+    return {'role': 'assistant', 'content': [{'text': text}]}
+
+def tool_use(name: str) -> Message:
+    return {'role': 'assistant', 'content': [{'toolUse': {'toolUseId': 'tool-1', 'name': name, 'input': {}}}]}
+
+def tool_result(status: str = 'success') -> Message:
+    return {'role': 'user', 'content': [{'toolResult': {'toolUseId': 'tool-1', 'status': status, 'content': [{'text': 'Done'}]}}]}
+
+# A screening conversation that is past its opening turn
+OPENING: Messages = [user('Hi, I have been feeling low lately'), assistant('How often have you felt this way?')]
+
+class SelectRouteTest(unittest.TestCase):
+    def test_opening_turn_takes_the_primary_model(self) -> None:
+        self.assertEqual(select_route([user('Hi')], max_fast_chars=200), 'primary')
+
+    def test_short_answer_takes_the_fast_model(self) -> None:
+        self.assertEqual(select_route([*OPENING, user('Most days')], max_fast_chars=200), 'fast')
+
+    def test_long_answer_takes_the_primary_model(self) -> None:
+        self.assertEqual(select_route([*OPENING, user('Most days ' * 30)], max_fast_chars=200), 'primary')
+
+    def test_risky_answer_takes_the_primary_model(self) -> None:
+        self.assertEqual(select_route([*OPENING, user('Sometimes I want to die')], max_fast_chars=200), 'primary')
+
+    def test_generic_mention_takes_the_fast_model(self) -> None:
+        self.assertEqual(select_route([*OPENING, user('Any substance abuse resources?')], max_fast_chars=200), 'fast')
+
+    def test_successful_tool_result_takes_the_fast_model(self) -> None:
+        messages: Messages = [*OPENING, user('Any resources?'), tool_use('resource-function___search-resources'), tool_result()]
+        self.assertEqual(select_route(messages, max_fast_chars=200), 'fast')
+
+    def test_failed_tool_result_takes_the_primary_model(self) -> None:
+        messages: Messages = [*OPENING, user('Any resources?'), tool_use('resource-function___search-resources'), tool_result('error')]
+        self.assertEqual(select_route(messages, max_fast_chars=200), 'primary')
+
+    def test_helpline_result_takes_the_primary_model(self) -> None:
+        messages: Messages = [*OPENING, user('Who can I call?'), tool_use('search_helplines'), tool_result()]
+        self.assertEqual(select_route(messages, max_fast_chars=200), 'primary')
+
+    def test_assistant_message_takes_the_primary_model(self) -> None:
+        self.assertEqual(select_route(OPENING, max_fast_chars=200), 'primary')
+
+class EstimateCostTest(unittest.TestCase):
+    def test_cost_of_known_model(self) -> None:
+        usage: dict[str, int] = {'inputTokens': 1_000_000, 'outputTokens': 100_000, 'cacheReadInputTokens': 1_000_000}
+        self.assertAlmostEqual(estimate_cost('us.anthropic.claude-haiku-4-5-20251001-v1:0', usage), 1.0 + 0.5 + 0.1)
+
+    def test_cost_of_unknown_model(self) -> None:
+        self.assertIsNone(estimate_cost('amazon.nova-lite-v1:0', {'inputTokens': 1000}))
+
+if __name__ == '__main__':
+    unittest.main()
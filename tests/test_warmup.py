@@ -0,0 +1,64 @@
+"""
+Background warm-up of the shared resources.
+
+Usage:
+    uv run --package sana-agent python -m unittest discover tests
+"""
+from types import SimpleNamespace
+from unittest import mock
+import asyncio
+import os
+import unittest
+
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+
+from sana.agent.tools.crisis import crisis_table
+from sana.agent.tools.helplines import COUNTRIES_TOOL, catalogues
+from sana.core import warmup
+from sana.core.config import settings
+
+class WarmUpTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        warmup.state.phases.clear()
+        warmup.state.done = False
+
+        for name, value in (
+            ('AWS_BEDROCK_AGENTCORE_GATEWAY_OAUTH_PROVIDER_NAME', 'gateway'),
+            ('CRISIS_FAST_PATH_ENABLED', True),
+            ('WARMUP_TIMEOUT', 0.2)
+        ):
+            mock.patch.object(settings, name, value).start()
+
+        # The gateway connects straight away, and exposes the ThroughLine tools
+        mock.patch.object(warmup, '_import_modules').start()
+        mock.patch.object(warmup, '_connect_gateway', return_value=[SimpleNamespace(tool_name=COUNTRIES_TOOL)]).start()
+        mock.patch.object(catalogues, 'refresh').start()
+        self.addCleanup(mock.patch.stopall)
+
+    async def test_slow_crisis_refresh_does_not_fail_the_gateway(self) -> None:
+        refreshed: asyncio.Event = asyncio.Event()
+
+        async def slow_refresh() -> None:
+            await asyncio.sleep(0.4)
+            refreshed.set()
+
+        with mock.patch.object(crisis_table, 'refresh', slow_refresh):
+            state: warmup.WarmupState = await warmup.warm_up()
+            self.assertEqual(state.phases, {'imports': 'ready', 'prompts': 'ready', 'gateway': 'ready'})
+
+            # The crisis contacts keep refreshing after the warm-up is done
+            await asyncio.wait_for(refreshed.wait(), timeout=1.0)
+
+    async def test_slow_phase_is_marked_failed(self) -> None:
+        async def hang() -> None:
+            await asyncio.sleep(1.0)
+
+        with mock.patch.object(warmup, '_load_prompts', hang), self.assertLogs('sana.core.warmup', level='WARNING'):
+            state: warmup.WarmupState = await warmup.warm_up()
+
+        self.assertTrue(state.done)
+        self.assertFalse(state.warm)
+        self.assertEqual(state.phases['prompts'], 'failed')
+
+if __name__ == '__main__':
+    unittest.main()